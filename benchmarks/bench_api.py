@@ -0,0 +1,81 @@
+"""
+Yerel not servisi (src.serve) benchmark'ı; tamamen çevrimdışı, sahte OBS sunucusuna karşı.
+--tools kadar araç aynı anda aynı öğrencinin notlarını --requests kez ister. Tek fetch'in
+paylaşılması (single-flight) ve TTL önbelleği sayesinde OBS'ye giden login ve fetch sayısı,
+gecikme dağılımı ve servisin /metrics çıktısı raporlanır. --ttl 0 ile sadece birleştirmenin etkisi görülür.
+
+Kullanım:
+    python benchmarks/bench_api.py [--tools 20] [--requests 10] [--users 2] [--ttl 60] [--latency 0.05]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+for path in (project_root, current_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from mock_obs_server import MockOBSServer
+from src.services.api_server import GradeService, GradesAPIServer
+from src.services.obs_client import OBSClient
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", type=int, default=20, help="Aynı anda istek atan araç sayısı")
+    parser.add_argument("--requests", type=int, default=10, help="Araç başına istek sayısı")
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--ttl", type=float, default=60)
+    parser.add_argument("--courses", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    logins = [0]
+    lock = threading.Lock()
+    usernames = [f"user{i}" for i in range(args.users)]
+
+    with MockOBSServer(courses=args.courses, latency=args.latency) as obs:
+        def connect(username: str) -> OBSClient:
+            with lock: logins[0] += 1
+            client = obs.point_client(OBSClient())
+            if not client.login(username, "pw", lambda _captcha: "1234"): raise Exception(f"{username} login olamadı")
+            return client
+
+        with GradesAPIServer(GradeService(connect, lambda: usernames, ttl=args.ttl)) as api:
+            def tool(i: int):
+                timings = []
+                for n in range(args.requests):
+                    url = f"{api.origin}/users/{usernames[(i + n) % args.users]}/grades"
+                    start = time.perf_counter()
+                    with urllib.request.urlopen(url) as r:
+                        json.loads(r.read())
+                    timings.append((time.perf_counter() - start) * 1000)
+                return timings
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.tools) as pool:
+                timings = [t for tool_timings in pool.map(tool, range(args.tools)) for t in tool_timings]
+            elapsed = time.perf_counter() - start
+
+            with urllib.request.urlopen(f"{api.origin}/metrics") as r:
+                metrics = json.loads(r.read())
+
+    total = args.tools * args.requests
+    timings.sort()
+    print(f"{args.tools} araç x {args.requests} istek = {total} istek, {args.users} öğrenci, ttl={args.ttl:g} sn\n")
+    print(f"süre: {elapsed:.2f} sn ({total / elapsed:.0f} istek/sn)")
+    print(f"gecikme: p50 {statistics.median(timings):.1f} ms, p95 {timings[int(0.95 * len(timings))]:.1f} ms, en kötü {timings[-1]:.1f} ms")
+    print(f"OBS'ye: {logins[0]} login, {metrics['counters']['upstream_fetches']} fetch "
+          f"(servissiz: {total} login + {total} fetch)")
+    print(f"önbellek: hit {metrics['counters']['hits']}, paylaşılan {metrics['counters']['coalesced']}, "
+          f"miss {metrics['counters']['misses']} -> hit_rate {metrics['hit_rate']}, OBS'ye gitmeyen {metrics['upstream_saved_rate']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Çok hesaplı fetch benchmark'ı: thread'li OBSClient ile tek event loop'taki AsyncOBSClient karşılaştırması.
+Sahte OBS sunucusuna N hesap aynı anda giriş yapıp notlarını (istenirse tüm dönemleri) çeker;
+toplam süre, ders/sn ve süreç başına açılan thread sayısı raporlanır. httpx gerekir.
+
+Kullanım:
+    python benchmarks/bench_async.py [--accounts 10 50] [--courses 10] [--latency 0.05] [--all-terms]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+for path in (project_root, current_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from mock_obs_server import MockOBSServer
+from src.services.obs_client import OBSClient
+from src.services.async_obs_client import AsyncOBSClient, make_shared_transport
+from src.services.transport import TransportConfig
+
+# İki client'ın kendi eşzamanlılığı karşılaştırılıyor; host zamanlayıcısının sınırları bench_scheduler.py'de
+UNLIMITED = TransportConfig(rate_limit=0, max_in_flight=0)
+
+def run_threaded(server: MockOBSServer, accounts: int, all_terms: bool):
+    """Her hesap bir thread'de, kendi OBSClient'ı (ve kendi istatistik thread havuzu) ile."""
+    peak_threads = [threading.active_count()]
+
+    def one(i: int) -> int:
+        client = server.point_client(OBSClient(transport=UNLIMITED))
+        client.login(f"user{i}", "pw", lambda _captcha: "1234")
+        peak_threads[0] = max(peak_threads[0], threading.active_count())
+        if all_terms:
+            count = sum(len(grades) for _, grades in client.fetch_all_terms())
+        else:
+            count = len(client.fetch_grades())
+        client.close()
+        return count
+
+    with ThreadPoolExecutor(max_workers=accounts) as pool:
+        courses = sum(pool.map(one, range(accounts)))
+    return courses, peak_threads[0]
+
+async def run_async(server: MockOBSServer, accounts: int, all_terms: bool):
+    """Tüm hesaplar tek event loop'ta; bağlantı havuzu ortak, cookie jar'lar ayrı."""
+    shared = make_shared_transport(max_connections=accounts * AsyncOBSClient.DEFAULT_MAX_CONCURRENCY)
+
+    async def captcha(_image: bytes) -> str:
+        return "1234"
+
+    async def one(i: int) -> int:
+        client = server.point_client(AsyncOBSClient(transport=UNLIMITED, shared_transport=shared))
+        await client.login(f"user{i}", "pw", captcha)
+        if all_terms:
+            return sum([len(grades) async for _, grades in client.fetch_all_terms()])
+        # Aynı indeks iki kez gelir (önce '?' sonra ortalamalı), ders sayısı benzersiz indekslerdir
+        return len({idx async for idx, _ in client.fetch_grades()})
+
+    try:
+        courses = sum(await asyncio.gather(*(one(i) for i in range(accounts))))
+    finally:
+        await shared.aclose()
+    return courses, threading.active_count()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--courses", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--all-terms", action="store_true")
+    args = parser.parse_args()
+
+    print(f"ders={args.courses}, gecikme={args.latency * 1000:.0f} ms\n")
+    print(f"{'hesap':>5} {'mod':>7} {'süre':>8} {'ders/sn':>8} {'thread':>7}")
+    for accounts in args.accounts:
+        with MockOBSServer(courses=args.courses, latency=args.latency) as server:
+            for mode in ("thread", "async"):
+                start = time.perf_counter()
+                if mode == "thread":
+                    courses, threads = run_threaded(server, accounts, args.all_terms)
+                else:
+                    courses, threads = asyncio.run(run_async(server, accounts, args.all_terms))
+                elapsed = time.perf_counter() - start
+                print(f"{accounts:>5} {mode:>7} {elapsed:>7.2f}s {courses / elapsed:>8.1f} {threads:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Uçtan uca fetch benchmark'ı (ağ gerekmez).
+Sahte OBS sunucusuna karşı login + fetch_grades akışını 5/20/100 derslik senaryolarda koşturur;
+ders/sn cinsinden throughput ile p50/p95 gecikmeleri raporlar. İstatistik paralelliğinde veya
+parse hızında bir gerileme olursa buradaki sayılarda görünür.
+
+Kullanım:
+    python benchmarks/bench_fetch.py [--latency 0.03] [--runs 5] [--courses 5 20 100] [--workers 1 4]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+for path in (project_root, current_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from mock_obs_server import MockOBSServer
+from src.services.obs_client import OBSClient
+from src.services.transport import TransportConfig
+
+# İstemcinin kendi paralelliği ölçülüyor; host zamanlayıcısının sınırları bench_scheduler.py'de
+UNLIMITED = TransportConfig(rate_limit=0, max_in_flight=0)
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run_once(server: MockOBSServer, workers: int):
+    """(login süresi, fetch süresi, ders sayısı) döner."""
+    client = server.point_client(OBSClient(max_workers=workers, transport=UNLIMITED))
+    start = time.perf_counter()
+    if not client.login("bench", "bench", lambda _captcha: "1234"):
+        raise RuntimeError("Sahte sunucuya giriş yapılamadı")
+    logged_in = time.perf_counter()
+    grades = client.fetch_grades()
+    done = time.perf_counter()
+    return logged_in - start, done - logged_in, len(grades)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--workers", type=int, nargs="+", default=[OBSClient.DEFAULT_MAX_WORKERS])
+    parser.add_argument("--latency", type=float, default=0.03, help="Sahte sunucuda istek başına gecikme (sn)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--serialize-sessions", action="store_true",
+                        help="Sunucu aynı oturumun isteklerini sıraya soksun (ASP.NET Session State gibi)")
+    parser.add_argument("--json", metavar="DOSYA", help="Sonuçları JSON olarak da kaydet")
+    args = parser.parse_args()
+
+    results = []
+    print(f"gecikme={args.latency * 1000:.0f} ms, koşu={args.runs}\n")
+    print(f"{'ders':>5} {'worker':>6} {'login p50':>10} {'fetch p50':>10} {'fetch p95':>10} {'toplam p95':>11} {'ders/sn':>8}")
+
+    for courses in args.courses:
+        for workers in args.workers:
+            with MockOBSServer(courses=courses, latency=args.latency,
+                               serialize_sessions=args.serialize_sessions) as server:
+                run_once(server, workers)  # Isınma turu
+                samples = [run_once(server, workers) for _ in range(args.runs)]
+
+            logins = [s[0] for s in samples]
+            fetches = [s[1] for s in samples]
+            totals = [s[0] + s[1] for s in samples]
+            row = {
+                "courses": courses,
+                "workers": workers,
+                "login_p50_ms": percentile(logins, 50) * 1000,
+                "fetch_p50_ms": percentile(fetches, 50) * 1000,
+                "fetch_p95_ms": percentile(fetches, 95) * 1000,
+                "total_p95_ms": percentile(totals, 95) * 1000,
+                "courses_per_sec": courses / statistics.mean(fetches),
+            }
+            results.append(row)
+            print(f"{courses:>5} {workers:>6} {row['login_p50_ms']:>8.0f}ms {row['fetch_p50_ms']:>8.0f}ms "
+                  f"{row['fetch_p95_ms']:>8.0f}ms {row['total_p95_ms']:>9.0f}ms {row['courses_per_sec']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"latency": args.latency, "runs": args.runs, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Not geçmişi (SQLite) benchmark'ı: çok sayıda kontrolün kayıt maliyeti ve sorgu süreleri.
+Sahte hesaplar için --polls kez not çekilmiş gibi kayıt yapılır; her kontrolde derslerin
+sadece --change-rate kadarı değişir. Değişmeyen kontrollerin neredeyse bedava olduğu,
+"ilk görünme" ve zaman serisi sorgularının binlerce kayıtta hızlı kaldığı ölçülür.
+
+Kullanım:
+    python benchmarks/bench_history.py [--users 20] [--courses 10] [--polls 500] [--change-rate 0.02]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models import CourseGrade, ExamStats
+from src.services.history import GradeHistory
+
+def make_grades(courses: int, version: list) -> list:
+    """version[i] arttıkça i. dersin final ortalaması değişir."""
+    return [CourseGrade(
+        code=f"DRS{i:03}", name=f"Ders {i}", term_id="20251", letter_grade="--",
+        midterm=ExamStats(str(40 + i), "55,10"),
+        final=ExamStats("60" if version[i] else "-", f"{50 + version[i] * 0.1:.2f}".replace(".", ",") if version[i] else "?"),
+        makeup=ExamStats()
+    ) for i in range(courses)]
+
+def timed(fn, runs: int = 20) -> float:
+    """Medyan süre (ms)."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--courses", type=int, default=10)
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--change-rate", type=float, default=0.02, help="Kontrol başına değişen ders oranı")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    history = GradeHistory(tempfile.mkdtemp(prefix="obs-history-bench-"))
+    versions = {u: [0] * args.courses for u in range(args.users)}
+    unchanged_ms, changed_ms = [], []
+
+    clock = time.time() - args.polls * 600
+    for _ in range(args.polls):
+        clock += 600
+        for user, version in versions.items():
+            for i in range(args.courses):
+                if rng.random() < args.change_rate: version[i] += 1
+            grades = make_grades(args.courses, version)
+            start = time.perf_counter()
+            inserted = history.record(f"user{user}", grades, fetched_at=clock)
+            (changed_ms if inserted else unchanged_ms).append((time.perf_counter() - start) * 1000)
+
+    total = sum(history.count(f"user{u}") for u in range(args.users))
+    polls = args.users * args.polls * args.courses
+    print(f"{args.users} hesap x {args.courses} ders x {args.polls} kontrol = {polls} ders çekimi -> {total} kayıt "
+          f"({os.path.getsize(history.path) / 1024:.0f} KiB)\n")
+    print(f"değişmeyen kontrol kaydı : p50 {statistics.median(unchanged_ms) * 1000:.0f} µs ({len(unchanged_ms)} adet)")
+    if changed_ms:
+        print(f"değişen kontrol kaydı    : p50 {statistics.median(changed_ms) * 1000:.0f} µs ({len(changed_ms)} adet)")
+
+    print(f"first_seen (Final ort.)  : {timed(lambda: history.first_seen('user0', 'DRS001', 'Final')):.3f} ms")
+    print(f"series (Final ort.)      : {timed(lambda: history.series('user0', 'DRS001', 'Final')):.3f} ms")
+    print(f"ilk geçmiş sayfası (20)  : {timed(lambda: next(history.iter_pages('user0'), None)):.3f} ms")
+    print(f"tüm sayfalar (user0)     : {timed(lambda: sum(len(p.rows) for p in history.iter_pages('user0')), runs=5):.3f} ms")
+    history.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+HTML parse mikro benchmark'ı.
+Kayıtlı OBS sayfaları (benchmarks/fixtures) üzerinde eski yöntem (tam html.parser ağacı)
+ile PageParser backend'lerini parse süresi ve tepe bellek kullanımı açısından karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_parsing.py [--iterations 50]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from bs4 import BeautifulSoup
+from src.services.html_parser import PageParser
+from src.services.obs_client import OBSClient
+
+FIXTURE_DIR = os.path.join(current_dir, "fixtures")
+
+# Sayfa -> OBSClient'ın o sayfadan ihtiyaç duyduğu id'ler
+PAGES = {
+    "login.aspx": OBSClient.LOGIN_PAGE_IDS,
+    "not_listesi_op.aspx": OBSClient.GRADES_PAGE_IDS,
+    "Ders_Istatistik.aspx": OBSClient.STATS_PAGE_IDS,
+}
+
+def legacy_parse(html: bytes, ids):
+    """Eski yöntem: tüm sayfa html.parser ile ağaca çevrilir, hidden input'lar ağaçtan toplanır."""
+    soup = BeautifulSoup(html, "html.parser")
+    hidden = {i.get("name"): i.get("value", "") for i in soup.find_all("input", type="hidden") if i.get("name")}
+    return soup, hidden
+
+def parser_variant(backend: str, strained: bool):
+    parser = PageParser(backend)
+    def run(html: bytes, ids):
+        return parser.parse(html, ids if strained else ()), parser.hidden_inputs(html)
+    return run
+
+def variants():
+    result = [("html.parser (tam ağaç, eski)", legacy_parse),
+              ("html.parser + strainer", parser_variant("html.parser", True))]
+    try:
+        import lxml  # noqa: F401
+        result += [("lxml (tam ağaç)", parser_variant("lxml", False)),
+                   ("lxml + strainer", parser_variant("lxml", True))]
+    except ImportError:
+        print("! lxml kurulu değil, sadece html.parser ölçülüyor.\n")
+    return result
+
+def measure(func, html: bytes, ids, iterations: int):
+    """(ortalama ms, tepe bellek KiB) döner."""
+    func(html, ids)  # Isınma turu
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(html, ids)
+    avg_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    tracemalloc.start()
+    func(html, ids)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return avg_ms, peak / 1024
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    for page, ids in PAGES.items():
+        with open(os.path.join(FIXTURE_DIR, page + ".html"), "rb") as f:
+            html = f.read()
+
+        print(f"{page} ({len(html) / 1024:.0f} KiB)")
+        baseline_ms = None
+        for name, func in variants():
+            avg_ms, peak_kib = measure(func, html, ids, args.iterations)
+            baseline_ms = baseline_ms or avg_ms
+            print(f"  {name:<32} {avg_ms:8.2f} ms  {peak_kib:9.0f} KiB  x{baseline_ms / avg_ms:.1f}")
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Kayıtlı oturumlar üzerinde parse regresyonu ve throughput benchmark'ı (ağ gerekmez).
+`python -m src.main --record oturum.jsonl.gz` ile alınmış arşivleri ReplayAdapter ile oynatır,
+login + fetch akışını tam hızda tekrar koşturur. Hata veren (ör. OBS markup'ı değişti) ve
+ortalaması '?' kalan dersleri arşiv bazında raporlar.
+
+Arşiv verilmezse sahte OBS sunucusundan bir tane kaydedilip o kullanılır.
+
+Kullanım:
+    python benchmarks/bench_replay.py [arsiv1.jsonl.gz ...] [--runs 5] [--all-terms] [--courses 20]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+for path in (project_root, current_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from src.services.obs_client import OBSClient
+from src.services.transport import TransportConfig
+
+def record_sample(courses: int, all_terms: bool) -> str:
+    """Sahte sunucuya karşı bir oturum kaydeder, arşiv yolunu döner."""
+    from mock_obs_server import MockOBSServer
+
+    path = os.path.join(tempfile.mkdtemp(prefix="obs-bench-"), "mock_session.jsonl.gz")
+    with MockOBSServer(courses=courses, latency=0) as server:
+        client = server.point_client(OBSClient(transport=TransportConfig(record_path=path, rate_limit=0, max_in_flight=0)))
+        client.login("bench", "bench", lambda _captcha: "1234")
+        if all_terms:
+            list(client.fetch_all_terms())
+        else:
+            client.fetch_grades()
+        client.close()
+    return path
+
+def replay_once(archive: str, all_terms: bool, workers: int):
+    """(süre sn, ders sayısı, ortalaması '?' kalan ders sayısı) döner; parse hatası exception olarak çıkar."""
+    start = time.perf_counter()
+    client = OBSClient(max_workers=workers, transport=TransportConfig(replay_path=archive))
+    client.login("replay", "replay", lambda _captcha: "")
+    if all_terms:
+        grades = [g for _, term_grades in client.fetch_all_terms() for g in term_grades]
+    else:
+        grades = client.fetch_grades()
+    elapsed = time.perf_counter() - start
+    client.close()
+    missing = sum(1 for g in grades if "?" in (g.midterm.class_avg, g.final.class_avg, g.makeup.class_avg))
+    return elapsed, len(grades), missing
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archives", nargs="*", help="Arşiv dosyaları veya glob kalıpları")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--all-terms", action="store_true", help="Arşivler --all-terms ile kaydedildiyse")
+    parser.add_argument("--workers", type=int, default=OBSClient.DEFAULT_MAX_WORKERS)
+    parser.add_argument("--courses", type=int, default=20, help="Arşiv verilmezse kaydedilecek ders sayısı")
+    args = parser.parse_args()
+
+    archives = sorted({p for pattern in args.archives for p in glob.glob(pattern)})
+    if not archives:
+        archives = [record_sample(args.courses, args.all_terms)]
+        print(f"Arşiv verilmedi, sahte sunucudan kaydedildi: {archives[0]}\n")
+
+    timings, total_courses, failures = [], 0, 0
+    for archive in archives:
+        try:
+            replay_once(archive, args.all_terms, args.workers)  # Isınma turu
+            runs = [replay_once(archive, args.all_terms, args.workers) for _ in range(args.runs)]
+        except Exception as e:
+            failures += 1
+            print(f"HATA  {archive}: {e}")
+            continue
+
+        elapsed = [r[0] for r in runs]
+        courses, missing = runs[-1][1], runs[-1][2]
+        timings.extend(elapsed)
+        total_courses += courses * len(runs)
+        flag = "UYARI" if missing else "ok"
+        print(f"{flag:5} {archive}: {courses} ders, '?' ortalama: {missing}, "
+              f"p50 {statistics.median(elapsed) * 1000:.1f} ms")
+
+    if timings:
+        total = sum(timings)
+        print(f"\n{len(archives) - failures}/{len(archives)} arşiv başarılı, "
+              f"{len(timings) / total:.1f} oturum/sn, {total_courses / total:.0f} ders/sn")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
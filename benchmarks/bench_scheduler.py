@@ -0,0 +1,105 @@
+"""
+İstek zamanlayıcısı (scheduler.py) benchmark'ı; tamamen çevrimdışı, sahte OBS sunucusuna karşı.
+--accounts kadar hesap aynı anda login olup notlarını çeker. Sunucu aynı anda en fazla --capacity
+isteği kabul eder, fazlasına 503 döner (yoğun saatlerdeki OBS gibi). Üç durum karşılaştırılır:
+  sınırsız         : hız/eşzamanlılık sınırı yok, tekrar deneme yok (eski '?' davranışı)
+  sınırsız+tekrar  : sınır yok, sadece tekrar deneme
+  zamanlayıcı      : host başına token bucket + eşzamanlılık sınırı + öncelik + adaptif yavaşlama
+Raporlanan: toplam süre, not tablosunun görünme süresi (p50/p95), ortalaması alınamayan ders ve
+başarısız login sayısı, sunucunun döndüğü 503 sayısı, tekrar denemeler ve zamanlayıcının son durumu.
+
+Kullanım:
+    python benchmarks/bench_scheduler.py [--accounts 12] [--courses 10] [--capacity 8] [--rate 50] [--in-flight 16]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+for path in (project_root, current_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from mock_obs_server import MockOBSServer
+from src.services.obs_client import OBSClient
+from src.services.scheduler import RequestScheduler
+from src.services.transport import TransportConfig
+
+def run_account(server: MockOBSServer, scheduler: RequestScheduler, transport: TransportConfig, i: int):
+    """(tablo süresi, toplam süre, ders sayısı, ortalaması alınamayan ders sayısı); login olmazsa None."""
+    client = server.point_client(OBSClient(transport=transport, scheduler=scheduler))
+    start = time.perf_counter()
+    try:
+        if not client.login(f"user{i}", "pw", lambda _captcha: "1234"): return None
+        table_at, grades = None, {}
+        for idx, grade in client.iter_grades():
+            if table_at is None: table_at = time.perf_counter() - start
+            grades[idx] = grade
+    except Exception:
+        return None
+    finally:
+        client.close()
+    failed = sum(1 for g in grades.values() if g.stats_error)
+    return table_at, time.perf_counter() - start, len(grades), failed
+
+def scenario(name: str, transport: TransportConfig, args) -> dict:
+    scheduler = RequestScheduler()
+    with MockOBSServer(courses=args.courses, latency=args.latency, capacity=args.capacity) as server:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.accounts) as pool:
+            results = list(pool.map(lambda i: run_account(server, scheduler, transport, i), range(args.accounts)))
+        elapsed = time.perf_counter() - start
+        obs = server.obs
+
+    done = [r for r in results if r]
+    tables = sorted(r[0] for r in done if r[0] is not None)
+    hosts = scheduler.snapshot()
+    return {
+        "name": name,
+        "elapsed": elapsed,
+        "table_p50": statistics.median(tables) * 1000 if tables else float("nan"),
+        "table_p95": tables[int(0.95 * (len(tables) - 1))] * 1000 if tables else float("nan"),
+        "courses": sum(r[2] for r in done),
+        "failed": sum(r[3] for r in done),
+        "login_failed": len(results) - len(done),
+        "rejected": obs.rejected,
+        "peak": obs.peak_in_flight,
+        "host": hosts[0] if hosts else {}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=12)
+    parser.add_argument("--courses", type=int, default=10)
+    parser.add_argument("--capacity", type=int, default=8, help="Sunucunun aynı anda kabul ettiği istek")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate", type=float, default=50, help="Zamanlayıcı: istek/sn (OBS için varsayılan 10)")
+    parser.add_argument("--in-flight", type=int, default=16,
+                        help="Zamanlayıcı: eşzamanlılık; kapasiteden büyükse adaptif yavaşlama devreye girer (OBS için varsayılan 8)")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("sınırsız", TransportConfig(rate_limit=0, max_in_flight=0, retries=0)),
+        ("sınırsız+tekrar", TransportConfig(rate_limit=0, max_in_flight=0)),
+        ("zamanlayıcı", TransportConfig(rate_limit=args.rate, burst=max(1, int(args.rate)), max_in_flight=args.in_flight)),
+    ]
+    print(f"{args.accounts} hesap x {args.courses} ders, sunucu kapasitesi {args.capacity}, "
+          f"gecikme {args.latency * 1000:.0f} ms\n")
+    print(f"{'durum':<16} {'süre':>6} {'tablo p50':>10} {'tablo p95':>10} {'? kalan':>8} {'login hata':>10} "
+          f"{'503':>5} {'tekrar':>6} {'tepe':>5}")
+    for name, transport in scenarios:
+        r = scenario(name, transport, args)
+        host = r["host"]
+        print(f"{r['name']:<16} {r['elapsed']:>5.1f}s {r['table_p50']:>8.0f}ms {r['table_p95']:>8.0f}ms "
+              f"{r['failed']:>3}/{r['courses']:<4} {r['login_failed']:>10} {r['rejected']:>5} "
+              f"{host.get('retries', 0):>6} {r['peak']:>5}")
+        if name == "zamanlayıcı" and host:
+            print(f"{'':<16} son durum: {host['rate']} istek/sn, eşzamanlılık {host['limit']}/{host['max_in_flight']}, "
+                  f"{host['slowdowns']} yavaşlama, toplam bekleme {host['wait_ms'] / 1000:.1f} sn")
+
+if __name__ == "__main__":
+    main()
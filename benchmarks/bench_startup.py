@@ -0,0 +1,86 @@
+"""
+Açılış süresi benchmark'ı (`python -X importtime` tabanlı).
+Her ölçüm temiz bir Python sürecinde yapılır:
+  - src.main'in import süresi ve en pahalı alt modüller,
+  - banner'a kadar geçen süre (import + AuthManager + profil listesi),
+  - açılışta artık yüklenmeyen ağır modüllerin (requests, bs4, keyring, rich.progress) maliyeti.
+
+Kullanım:
+    python benchmarks/bench_startup.py [--runs 7] [--top 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+
+# Açılış yolunda olmaması gereken modüller (ilk ihtiyaç anında yüklenirler)
+DEFERRED_MODULES = ("requests", "bs4", "keyring", "rich.progress", "src.services.obs_client")
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# Banner'ın görüneceği ana kadar main() içinde yapılan iş
+TO_BANNER_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import src.main
+from src.services.auth_manager import AuthManager
+from src.ui.display import DisplayManager
+ui = DisplayManager()
+AuthManager().get_registered_users()
+print((time.perf_counter() - t0) * 1000)
+"""
+
+def run_python(args, env_extra=None) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.update(env_extra or {})
+    return subprocess.run([sys.executable] + args, cwd=project_root, env=env,
+                          capture_output=True, text=True, check=True)
+
+def import_profile(statement: str):
+    """-X importtime çıktısını {modül: (self_us, cumulative_us)} olarak döner (sadece en üst seviye)."""
+    out = run_python(["-X", "importtime", "-c", statement]).stderr
+    modules = {}
+    for line in out.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            modules[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return modules
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # 1. src.main import süresi (medyan)
+    profiles = [import_profile("import src.main") for _ in range(args.runs)]
+    main_ms = statistics.median(p["src.main"][1] for p in profiles) / 1000
+    print(f"import src.main (medyan, {args.runs} koşu): {main_ms:.1f} ms")
+
+    loaded = set(profiles[-1])
+    leaked = [m for m in DEFERRED_MODULES if m in loaded]
+    print("Açılışta yüklenen ertelenmiş modül: " + (", ".join(leaked) if leaked else "yok ✓"))
+
+    print(f"\nEn pahalı {args.top} modül (kümülatif, son koşu):")
+    ranked = sorted(profiles[-1].items(), key=lambda kv: kv[1][1], reverse=True)
+    for name, (self_us, cum_us) in ranked[:args.top]:
+        print(f"  {cum_us / 1000:8.1f} ms  {name}")
+
+    # 2. Banner'a kadar geçen süre
+    to_banner = [float(run_python(["-c", TO_BANNER_SNIPPET]).stdout.strip()) for _ in range(args.runs)]
+    print(f"\nBanner'a kadar (import + profil listesi, medyan): {statistics.median(to_banner):.1f} ms")
+
+    # 3. Ertelenen modüllerin maliyeti (eskiden açılışta ödeniyordu)
+    eager = [import_profile("import " + ", ".join(DEFERRED_MODULES)) for _ in range(args.runs)]
+    deferred_ms = statistics.median(
+        sum(p[m][1] for m in DEFERRED_MODULES if m in p) for p in eager
+    ) / 1000
+    print(f"Ertelenen modüllerin toplam import maliyeti (medyan): {deferred_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Yerel not servisinin (GradeService / SingleFlightCache) ağsız kontrolü; sahte OBS sunucusu da gerekmez.
+ClientFactory yerine OBS'ye hiç gitmeyen, çağrıları sayan bir stub verilir ve şunlar doğrulanır:
+  - aynı anda gelen --lookups kadar istek OBS'ye tek fetch ile cevaplanır (miss + coalesced)
+  - TTL içindeki istek önbellekten gelir (hit)
+  - hata önbelleğe alınmaz: bekleyenler aynı hatayı alır, sonraki istek OBS'ye yeniden gider
+  - OBS hatasında yeniden bağlanılmaz (tek fetch); sadece oturum düşmüşse bir kez yeniden login olunur
+Bir kontrol tutmazsa AssertionError ile çıkar.
+
+Kullanım:
+    python benchmarks/check_api_offline.py [--lookups 20] [--latency 0.2]
+"""
+import argparse
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.services.api_server import GradeService, SingleFlightCache
+from src.services.obs_pages import SessionExpired
+
+class StubClient:
+    """
+    fetch_grades'i sayan ve --latency kadar bekleyen sahte OBSClient; fail açıkken hata fırlatır,
+    expired açıkken bir kez SessionExpired (yeniden bağlanınca oturum tazelenmiş sayılır).
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.fetches = 0
+        self.fail = False
+        self.expired = False
+        self._lock = threading.Lock()
+
+    def fetch_grades(self):
+        with self._lock: self.fetches += 1
+        threading.Event().wait(self.latency)
+        if self.fail: raise Exception("sahte OBS hatası")
+        if self.expired:
+            self.expired = False
+            raise SessionExpired("sahte oturum düştü")
+        return []
+
+    def close(self):
+        pass
+
+def concurrently(n: int, call):
+    """n thread'i aynı anda başlatır; her biri için (sonuç, hata) döner."""
+    barrier = threading.Barrier(n)
+
+    def one(_i):
+        barrier.wait()
+        try:
+            return call(), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return list(pool.map(one, range(n)))
+
+def check_cache(args):
+    loads = [0]
+
+    def loader():
+        loads[0] += 1
+        threading.Event().wait(args.latency)
+        return "notlar"
+
+    cache = SingleFlightCache(ttl=60)
+    results = concurrently(args.lookups, lambda: cache.get("k", loader))
+    sources = sorted(source for (_value, source), _error in results)
+    assert loads[0] == 1, f"SingleFlightCache: {args.lookups} istek için {loads[0]} yükleme"
+    assert sources.count("miss") == 1 and sources.count("coalesced") == args.lookups - 1, sources
+    assert cache.get("k", loader) == ("notlar", "hit")
+    print(f"SingleFlightCache: {args.lookups} eşzamanlı istek -> 1 yükleme, {args.lookups - 1} paylaşılan, sonra hit")
+
+def check_service(args):
+    stub = StubClient(args.latency)
+    connects = [0]
+
+    def connect(_username: str) -> StubClient:
+        connects[0] += 1
+        return stub
+
+    service = GradeService(connect, lambda: ["user0"], ttl=60)
+    results = concurrently(args.lookups, lambda: service.grades("user0"))
+    assert all(error is None for _result, error in results), [e for _r, e in results if e]
+    assert stub.fetches == 1 and connects[0] == 1, f"{args.lookups} istek için {connects[0]} login, {stub.fetches} fetch"
+    counters = service.metrics.snapshot()["counters"]
+    assert counters["misses"] == 1 and counters["coalesced"] == args.lookups - 1, counters
+    assert service.grades("user0")[1] == "hit" and stub.fetches == 1
+    print(f"GradeService: {args.lookups} eşzamanlı istek -> 1 login, 1 fetch, sonra hit")
+
+    service.cache.invalidate()
+    stub.fail = True
+    before = stub.fetches
+    results = concurrently(args.lookups, lambda: service.grades("user0"))
+    assert all(error is not None for _result, error in results), "hata bekleyenlere iletilmedi"
+    # OBS hatası (oturum düşmesi değil) yeniden bağlanmadan döner: tek istek grubu için tek fetch
+    failed_fetches = stub.fetches - before
+    assert failed_fetches == 1 and connects[0] == 1, f"hatalı yükleme {failed_fetches} fetch, {connects[0]} login yaptı"
+
+    stub.fail = False
+    _payload, source = service.grades("user0")
+    assert source == "miss" and stub.fetches == before + failed_fetches + 1, "hata önbelleğe alınmış"
+    print(f"GradeService: hata {args.lookups} bekleyene iletildi, önbelleğe alınmadı (sonraki istek OBS'ye gitti)")
+
+    service.cache.invalidate()
+    stub.expired = True
+    before = stub.fetches
+    _payload, source = service.grades("user0")
+    assert source == "miss" and connects[0] == 2 and stub.fetches == before + 2, "oturum düşünce yeniden bağlanılmadı"
+    print("GradeService: oturum düşünce bir kez yeniden login olup tekrar denendi")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=20, help="Aynı anda gelen istek sayısı")
+    parser.add_argument("--latency", type=float, default=0.2, help="Sahte fetch süresi (sn)")
+    args = parser.parse_args()
+
+    check_cache(args)
+    check_service(args)
+    print("tamam")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Yerel sahte OBS sunucusu.
+obs.ozal.edu.tr'ye gitmeden OBSClient'ı uçtan uca çalıştırmak için login.aspx, not_listesi_op.aspx
+(UpdatePanel AJAX delta cevapları dahil) ve Ders_Istatistik.aspx sayfalarını taklit eder.
+Gecikme, ders sayısı ve aşırı yük davranışı (kapasite, rastgele 503) ayarlanabilir.
+
+Tek başına çalıştırmak için:
+    python benchmarks/mock_obs_server.py --courses 20 --latency 0.05
+"""
+import argparse
+import base64
+import random
+import threading
+import time
+import uuid
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+STD_PATH = "/oibs/std/"
+SESSION_COOKIE = "ASP.NET_SessionId"
+
+# 1x1 PNG (captcha yerine)
+CAPTCHA_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+@lru_cache(maxsize=None)
+def _viewstate(size: int, seed: int) -> str:
+    rnd = random.Random(seed)
+    return base64.b64encode(bytes(rnd.getrandbits(8) for _ in range(size))).decode()
+
+def _page(title: str, body: str, viewstate_size: int) -> str:
+    """ASP.NET WebForms iskeleti: ViewState, __doPostBack ve layout tabloları."""
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8" /><title>{title}</title>
+<script type="text/javascript">function prolizPopup(url, w, h) {{ window.open(url); }}</script>
+</head><body>
+<form method="post" action="./{title}" id="form1">
+<div class="aspNetHidden">
+<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />
+<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="" />
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{_viewstate(viewstate_size, len(title))}" />
+<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="A4C3D4F1" />
+<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="{_viewstate(viewstate_size // 20, 7)}" />
+</div>
+<table class="layout" width="100%"><tr><td class="content">
+{body}
+</td></tr></table>
+</form></body></html>"""
+
+class MockOBS:
+    """Sunucunun durumu: oturumlar, dersler ve dönemler."""
+
+    def __init__(self, courses: int = 8, terms: Tuple[str, ...] = ("20242", "20251"),
+                 latency: float = 0.0, jitter: float = 0.0, viewstate_size: int = 60_000,
+                 serialize_sessions: bool = False, capacity: int = 0, error_rate: float = 0.0):
+        self.course_count = courses
+        self.terms = terms
+        self.latency = latency
+        self.jitter = jitter
+        self.viewstate_size = viewstate_size
+        # Gerçek ASP.NET, yazılabilir Session State kullanan sayfalarda aynı oturumun isteklerini sıraya sokar
+        self.serialize_sessions = serialize_sessions
+        # Aşırı yük: aynı anda capacity'den fazla istek gelirse fazlası 503 alır (0: sınırsız);
+        # ayrıca her istek error_rate olasılıkla 503 döner
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rejected = 0
+        self.sessions: Dict[str, threading.Lock] = {}
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    # --- SAYFA ÜRETİCİLERİ ---
+
+    def course(self, idx: int, term: str) -> Tuple[str, str, str, str]:
+        rnd = random.Random(f"{term}-{idx}")
+        vize, final = rnd.randint(20, 100), rnd.choice([rnd.randint(20, 100), "--"])
+        letter = "--" if final == "--" else rnd.choice(["AA", "BA", "BB", "CB", "CC", "DC", "DD", "FF"])
+        return f"DRS{idx + 101}", f"Ders {idx + 1}", f"Vize : {vize}<br/>Final : {final}", letter
+
+    def login_page(self) -> str:
+        body = """<table>
+<tr><td><input name="txtParamT01" type="text" id="txtParamT01" /></td></tr>
+<tr><td><input name="txtParamT02" type="password" id="txtParamT02" /></td></tr>
+<tr><td><img id="imgCaptchaImg" src="captcha/CaptchaImg.aspx?rnd=0.1" /><input name="txtSecCode" id="txtSecCode" /></td></tr>
+</table>"""
+        return _page("login.aspx", body, 4_000)
+
+    def grades_page(self, term: Optional[str] = None) -> str:
+        term = term or self.terms[-1]
+        selected = 'selected="selected" '
+        options = "\n".join(
+            f'<option {selected if t == term else ""}value="{t}">{t}</option>' for t in self.terms
+        )
+        rows = ['<tr><th>#</th><th>Kod</th><th>Ad</th><th>Şube</th><th>Sınavlar</th><th>Ort</th><th>Harf</th><th>Durum</th><th></th></tr>']
+        for i in range(self.course_count):
+            code, name, exams, letter = self.course(i, term)
+            rows.append(
+                f"<tr><td>{i + 1}</td><td>{code}</td><td>{name}</td><td>1</td><td>{exams}</td><td>--</td>"
+                f"<td>{letter}</td><td>-</td><td><a id=\"grd_not_listesi_btnIstatistik_{i}\" "
+                f"href=\"javascript:__doPostBack('grd_not_listesi$ctl{i + 2:02d}$btnIstatistik','')\">İstatistik</a></td></tr>"
+            )
+        body = f"""<div id="UpdatePanel1">
+<select name="cmbDonemler" id="cmbDonemler">{options}</select>
+<table id="grd_not_listesi">{"".join(rows)}</table>
+</div>"""
+        return _page("not_listesi_op.aspx", body, self.viewstate_size)
+
+    def stats_delta(self, target: str, term: str) -> str:
+        """UpdatePanel AJAX cevabı (|uzunluk|tip|id|içerik| formatında), içinde popup URL'i."""
+        idx = int(target.split("$ctl")[1][:2]) - 2
+        code = self.course(idx, term)[0]
+        script = f"prolizPopup('Ders_Istatistik.aspx?dersKodu={code}&donem={term}',800,600);"
+        return f"1|#||4|{len(script)}|scriptBlock|ScriptContentNoTags|{script}|"
+
+    def stats_page(self, code: str, term: str) -> str:
+        rnd = random.Random(f"stats-{code}-{term}")
+        def block(title: str) -> str:
+            avg = f"{rnd.uniform(30, 80):.2f}".replace(".", ",")
+            return (f"<tr><td colspan='2'>{title}</td></tr>"
+                    f"<tr><td>Sınava giren öğrenci sayısı</td><td>{rnd.randint(40, 150)}</td></tr>"
+                    f"<tr><td>Sınıf not ortalaması</td><td>{avg}</td></tr>")
+        body = f"""<table id="grdIstSnv">{block("Ara Sınav")}{block("Yarıyıl Sonu Sınavı")}
+<tr><td colspan='2'>Bütünleme Sınavı</td></tr><tr><td>Sınıf not ortalaması</td><td>--</td></tr></table>"""
+        return _page("Ders_Istatistik.aspx", body, 8_000)
+
+    # --- YARDIMCILAR ---
+
+    def new_session(self) -> str:
+        sid = uuid.uuid4().hex
+        with self._lock:
+            self.sessions[sid] = threading.Lock()
+        return sid
+
+    def begin_request(self, sid: Optional[str]) -> Optional[threading.Lock]:
+        """İsteği sayar; oturumlar sıraya sokuluyorsa o oturumun kilidini döner."""
+        with self._lock:
+            self.request_count += 1
+            if self.serialize_sessions and sid:
+                return self.sessions.get(sid)
+            return None
+
+    def admit(self) -> bool:
+        """İsteği kabul edilenlere ekler; kapasite doluysa veya rastgele hata denk gelirse False (503)."""
+        with self._lock:
+            overloaded = self.capacity and self.in_flight >= self.capacity
+            if overloaded or (self.error_rate and random.random() < self.error_rate):
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            return True
+
+    def finish(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def sleep(self):
+        if self.latency:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+def make_handler(obs: MockOBS):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+
+        def log_message(self, *args):
+            pass
+
+        # --- Cevap yardımcıları ---
+        def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8",
+                  headers: Optional[Dict[str, str]] = None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _redirect(self, location: str, headers: Optional[Dict[str, str]] = None):
+            h = {"Location": location}
+            h.update(headers or {})
+            self._send(302, headers=h)
+
+        def _session_id(self) -> Optional[str]:
+            for part in self.headers.get("Cookie", "").split(";"):
+                name, _, value = part.strip().partition("=")
+                if name == SESSION_COOKIE and value in obs.sessions:
+                    return value
+            return None
+
+        def _form(self) -> Dict[str, str]:
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length).decode("utf-8") if length else ""
+            return {k: v[0] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+
+        def _handle(self, method: str):
+            url = urlparse(self.path)
+            page = url.path[len(STD_PATH):] if url.path.startswith(STD_PATH) else url.path
+            form = self._form() if method == "POST" else {}
+            sid = self._session_id()
+            lock = obs.begin_request(sid)
+
+            if not obs.admit():
+                return self._send(503, b"Service Unavailable")
+            if lock: lock.acquire()
+            try:
+                obs.sleep()
+                self._route(method, page, url, form, sid)
+            finally:
+                if lock: lock.release()
+                obs.finish()
+
+        def _route(self, method: str, page: str, url, form: Dict[str, str], sid: Optional[str]):
+            if page == "login.aspx":
+                if method == "GET":
+                    return self._send(200, obs.login_page().encode())
+                if form.get("txtParamT01") and form.get("txtSecCode"):
+                    new_sid = obs.new_session()
+                    return self._redirect(STD_PATH + "index.aspx",
+                                          {"Set-Cookie": f"{SESSION_COOKIE}={new_sid}; path=/; HttpOnly"})
+                return self._send(200, obs.login_page().encode())
+
+            if page.startswith("captcha/"):
+                return self._send(200, CAPTCHA_PNG, "image/png")
+
+            if sid is None:
+                return self._redirect(STD_PATH + "login.aspx")
+
+            if page == "index.aspx":
+                return self._send(200, b"<html><body>OBS</body></html>")
+
+            if page == "not_listesi_op.aspx":
+                if method == "GET":
+                    return self._send(200, obs.grades_page().encode())
+                term = form.get("cmbDonemler") or obs.terms[-1]
+                if self.headers.get("X-MicrosoftAjax") == "Delta=true":
+                    delta = obs.stats_delta(form.get("__EVENTTARGET", ""), term)
+                    return self._send(200, delta.encode(), "text/plain; charset=utf-8")
+                return self._send(200, obs.grades_page(term).encode())
+
+            if page == "Ders_Istatistik.aspx":
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                return self._send(200, obs.stats_page(query.get("dersKodu", ""), query.get("donem", "")).encode())
+
+            return self._send(404, b"not found")
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+    return Handler
+
+class MockOBSServer:
+    """Sahte OBS'yi arka planda bir thread'de çalıştırır. `with MockOBSServer(...) as server:`"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options):
+        self.obs = MockOBS(**options)
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.obs))
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def origin(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def point_client(self, client):
+        """OBSClient'ın URL sabitlerini bu sunucuya yönlendirir (sadece o nesne için)."""
+        client.BASE_URL = self.origin + STD_PATH
+        client.LOGIN_URL = self.origin + STD_PATH + "login.aspx"
+        client.GRADES_URL = self.origin + STD_PATH + "not_listesi_op.aspx"
+        client.STATS_BASE_URL = self.origin
+        return client
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--courses", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="İstek başına gecikme (sn)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--serialize-sessions", action="store_true",
+                        help="Aynı oturumun isteklerini ASP.NET gibi sıraya sok")
+    parser.add_argument("--capacity", type=int, default=0, help="Aynı anda kabul edilen en fazla istek (fazlası 503)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Rastgele 503 dönme olasılığı")
+    args = parser.parse_args()
+
+    server = MockOBSServer(port=args.port, courses=args.courses, latency=args.latency,
+                           jitter=args.jitter, serialize_sessions=args.serialize_sessions,
+                           capacity=args.capacity, error_rate=args.error_rate)
+    print(f"Sahte OBS: {server.origin}{STD_PATH}login.aspx (Ctrl+C ile çık)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
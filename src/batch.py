@@ -0,0 +1,241 @@
+import sys
+import os
+import json
+import queue
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+# main.py ile aynı: nereden çalıştırılırsa çalıştırılsın 'src' modülü bulunsun
+current_dir = os.path.dirname(os.path.abspath(__file__)) # src/
+project_root = os.path.dirname(current_dir)            # OBSGradePuller/
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.services.auth_manager import AuthManager
+from src.services.captcha import CaptchaSolver, SolverError, image_format, load_solver, try_solver
+from src.services.client_pool import OBSClientPool
+from src.services.obs_client import OBSClient
+from src.services.grade_cache import GradeCache
+from src.services.history import GradeHistory
+from src.services.stats_index import StatsUrlIndex
+from src.services.exporter import EXPORT_FORMATS, GradeExporter, make_exporter
+from src.services.schools import SchoolRegistry
+
+class JsonLinesWriter:
+    """Thread'lerden gelen kayıtları satır satır JSON olarak yazar (satırlar birbirine karışmaz)."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, username: str, status: str, **fields):
+        record = {
+            "user": username,
+            "status": status,
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        }
+        record.update(fields)
+        with self._lock:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+class BatchRunner:
+    """
+    Kayıtlı tüm hesapları menüsüz, paralel olarak çalıştırır.
+    Kayıtlı oturumu geçerli olan hesaplar hemen işlenir; captcha gerektirenlerin şifresi, login
+    sayfası ve captcha'sı worker'da hazırlanıp kuyruğa alınır ve ana thread'de tek tek sorulur,
+    böylece diğer hesapları bekletmezler. Çözücü (solver) verilirse captcha önce ona sorulur.
+    """
+
+    def __init__(self, auth: AuthManager, writer: JsonLinesWriter, workers: int = 4,
+                 stats_workers: int = OBSClient.DEFAULT_MAX_WORKERS, interactive: bool = True,
+                 exporter: Optional[GradeExporter] = None, all_terms: bool = False,
+                 solver: Optional[CaptchaSolver] = None):
+        self.auth = auth
+        self.writer = writer
+        # Verilirse notlar ders ders buraya yazılır, writer sadece hesap durumlarını raporlar
+        self.exporter = exporter
+        self.all_terms = all_terms
+        self.workers = max(1, workers)
+        self.stats_workers = stats_workers
+        self.interactive = interactive
+        self.solver = solver
+        self.cache = GradeCache(auth.app_dir)
+        # Her hesabın çekimi not geçmişine eklenir (değişmeyen dersler yeni kayıt oluşturmaz)
+        self.history = GradeHistory(auth.app_dir)
+        self.schools = SchoolRegistry.load(auth.app_dir)
+        # Aynı okuldaki hesaplar host başına tek bağlantı havuzunu paylaşır
+        self.clients = OBSClientPool(max_workers=stats_workers, max_connections=self.workers * stats_workers)
+        self._captcha_queue: "queue.Queue[tuple]" = queue.Queue()
+
+    def run(self, usernames):
+        try:
+            self._run(usernames)
+        finally:
+            self.clients.close()
+            self.history.close()
+
+    def _run(self, usernames):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            jobs = [pool.submit(self._run_with_saved_session, u) for u in usernames]
+
+            while True:
+                try:
+                    username, client, password, captcha = self._captcha_queue.get(timeout=0.2)
+                except queue.Empty:
+                    # Kuyruğa ekleme iş bitmeden yapıldığı için bu kontrol yarışsızdır
+                    if all(j.done() for j in jobs) and self._captcha_queue.empty(): break
+                    continue
+
+                if self._login_with_captcha(username, client, password, captcha):
+                    jobs.append(pool.submit(self._fetch_and_emit, username, client))
+
+    def _run_with_saved_session(self, username: str):
+        """Her hesap kendi OBSClient'ında (ayrı cookie jar) çalışır."""
+        try:
+            school = self.schools.get(self.auth.get_school(username))
+            client = self.clients.client(school, stats_index=StatsUrlIndex(self.auth.app_dir, username))
+            saved_session = self.auth.get_session(username)
+            if saved_session and client.restore_session(saved_session):
+                self._fetch_and_emit(username, client)
+                return
+
+            if not self.interactive and not self.solver:
+                self.writer.emit(username, "captcha_required")
+                return
+
+            password = self.auth.get_password(username)
+            if not password:
+                self.writer.emit(username, "error", error="Kayıtlı şifre okunamadı")
+                return
+
+            # Captcha sırası gelmeden login sayfası ve resmi burada iner; soru anında ağ beklenmez
+            captcha = client.prepare_login()
+            code = try_solver(captcha, self.solver) if captcha else ""
+            if code is not None:
+                if client.submit_login(username, password, code):
+                    self._fetch_and_emit(username, client)
+                    return
+                if not self.interactive:
+                    self.writer.emit(username, "error", error="Giriş başarısız (şifre veya captcha hatalı)")
+                    return
+                captcha = client.prepare_login() # Çözücü yanıldı, insana yeni captcha sorulur
+
+            if not self.interactive:
+                self.writer.emit(username, "captcha_required")
+                return
+            self._captcha_queue.put((username, client, password, captcha))
+        except Exception as e:
+            self.writer.emit(username, "error", error=str(e))
+
+    def _ask_captcha(self, username: str, image: bytes) -> str:
+        """Resmi benzersiz adlı geçici dosyaya yazar, kodu stdin'den okur (hesaplar birbirinin dosyasını ezmez)."""
+        fd, path = tempfile.mkstemp(prefix=f"obs-captcha-{username}-", suffix="." + image_format(image))
+        with os.fdopen(fd, "wb") as f:
+            f.write(image)
+        try:
+            # stdout JSON satırlarına ayrıldığı için sorular stderr'e yazılır
+            sys.stderr.write(f"[{username}] Captcha resmi: {path}\n")
+            sys.stderr.write(f"[{username}] İşlem sonucu: ")
+            sys.stderr.flush()
+            return sys.stdin.readline().strip()
+        finally:
+            os.remove(path)
+
+    def _login_with_captcha(self, username: str, client: OBSClient, password: str, captcha: Optional[bytes]) -> bool:
+        try:
+            code = self._ask_captcha(username, captcha) if captcha else ""
+            if client.submit_login(username, password, code):
+                return True
+            self.writer.emit(username, "error", error="Giriş başarısız (şifre veya captcha hatalı)")
+        except Exception as e:
+            self.writer.emit(username, "error", error=str(e))
+        return False
+
+    def _remember(self, username: str, grades):
+        merged = self.cache.store(username, grades)
+        self.history.record(username, merged)
+        return merged
+
+    def _fetch_and_emit(self, username: str, client: OBSClient):
+        try:
+            if self.all_terms:
+                # Dönemler bittikçe yazılır; tüm transkript bellekte toplanmaz
+                batches = ((term_id, self._remember(username, grades))
+                           for term_id, grades in client.fetch_all_terms())
+            else:
+                grades = self._remember(username, client.fetch_grades())
+                batches = [(grades[0].term_id if grades else None, grades)]
+
+            for term_id, grades in batches:
+                if self.exporter:
+                    self.exporter.write(grades, username=username)
+                    self.writer.emit(username, "ok", term_id=term_id, courses=len(grades))
+                else:
+                    self.writer.emit(username, "ok", term_id=term_id, grades=[g.to_dict() for g in grades])
+            self.auth.save_session(username, client.export_session())
+        except Exception as e:
+            self.writer.emit(username, "error", error=str(e))
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Kayıtlı tüm hesapların notlarını menüsüz çeker ve JSON satırları olarak yazar."
+    )
+    parser.add_argument("--users", nargs="+", help="Sadece bu hesaplar (varsayılan: kayıtlı tüm hesaplar)")
+    parser.add_argument("--workers", type=int, default=4, help="Aynı anda işlenecek hesap sayısı")
+    parser.add_argument("--stats-workers", type=int, default=OBSClient.DEFAULT_MAX_WORKERS,
+                        help="Hesap başına paralel istatistik isteği sayısı")
+    parser.add_argument("--no-captcha", action="store_true",
+                        help="Captcha sormadan geç; oturumu geçersiz hesaplar 'captcha_required' olarak yazılır")
+    parser.add_argument("--captcha-solver", metavar="MODUL:FONKSIYON",
+                        help="Captcha'yı önce bu fonksiyona çözdür (varsayılan: $OBS_CAPTCHA_SOLVER); --no-captcha ile de çalışır")
+    parser.add_argument("--all-terms", action="store_true", help="Sadece son dönemi değil, tüm dönemleri çek")
+    parser.add_argument("--format", choices=EXPORT_FORMATS,
+                        help="Notları ders başına bir kayıt olarak bu formatta yaz; hesap durumları stderr'e gider")
+    parser.add_argument("-o", "--output", help="Çıktı dosyası (varsayılan: stdout)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    auth = AuthManager()
+    usernames = args.users or auth.get_registered_users()
+    if not usernames:
+        sys.stderr.write("Kayıtlı kullanıcı yok.\n")
+        return 1
+    # Çıktı dosyası açılmadan (export baştan yazılır) önce yüklenir
+    try:
+        solver = load_solver(args.captcha_solver)
+    except SolverError as e:
+        sys.stderr.write(f"{e}\n")
+        return 2
+
+    if args.format:
+        # Export dosyası her seferinde baştan yazılır (JSON dizisi / CSV başlığı tek olmalı)
+        out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        exporter = make_exporter(args.format, out)
+        writer = JsonLinesWriter(sys.stderr)
+    else:
+        out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+        exporter = None
+        writer = JsonLinesWriter(out)
+
+    try:
+        runner = BatchRunner(auth, writer, workers=args.workers, stats_workers=args.stats_workers,
+                             interactive=not args.no_captcha, exporter=exporter, all_terms=args.all_terms,
+                             solver=solver)
+        runner.run(usernames)
+    finally:
+        if exporter: exporter.close()
+        if out is not sys.stdout: out.close()
+    return 0
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        sys.stderr.write("\nİşlem iptal edildi.\n")
+        sys.exit(130)
@@ -1,6 +1,8 @@
 import sys
 import os
 import time
+import argparse
+import tempfile
 
 # Bu kod, main.py nereden çalıştırılırsa çalıştırılsın 'src' modülünün bulunmasını sağlar.
 current_dir = os.path.dirname(os.path.abspath(__file__)) # src/
@@ -8,24 +10,200 @@ project_root = os.path.dirname(current_dir)            # OBSGradePuller/
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
 
-# Kendi modüllerimizi import ediyoruz
+# Kendi modüllerimizi import ediyoruz.
+# Ağır modüller (requests, bs4, keyring, rich.progress) banner'dan sonra, ilk ihtiyaç anında yüklenir.
 from src.services.auth_manager import AuthManager
-from src.services.obs_client import OBSClient
+from src.services.grade_cache import GradeCache
+from src.services.profiler import Profiler
+from src.services.schools import School, SchoolRegistry
 from src.ui.display import DisplayManager
 
-def main():
+if TYPE_CHECKING:
+    from src.services.obs_client import OBSClient
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="OBS Grade Puller")
+    parser.add_argument("--school", metavar="ID",
+                        help="Yeni girişte okul (schools.json'daki id); verilmezse birden çok okul varsa sorulur")
+    parser.add_argument("--offline", action="store_true",
+                        help="OBS'ye bağlanmadan önbellekteki notları göster")
+    parser.add_argument("--all-terms", action="store_true",
+                        help="cmbDonemler'deki tüm dönemlerin notlarını çek (transkript görünümü)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Notları belirli aralıklarla yeniden çek ve değişiklikleri bildir (--all-terms ile kullanılmaz)")
+    parser.add_argument("--interval", type=float, default=600,
+                        help="Watch modunda iki kontrol arası saniye (varsayılan: 600)")
+    parser.add_argument("--notify", choices=["stdout", "desktop", "webhook"], default="stdout",
+                        help="Watch modunda değişikliklerin bildirileceği yer")
+    parser.add_argument("--webhook-url", help="--notify webhook için hedef URL")
+    parser.add_argument("--project", action="store_true",
+                        help="Notlardan sonra hedef harfler için gereken final/büt notlarını ve dönem ortalamalarını göster")
+    parser.add_argument("--weights", metavar="DOSYA",
+                        help="--project için ders bazlı vize/final ağırlıkları (JSON, varsayılan: %%40/%%60)")
+    parser.add_argument("--history", nargs="?", const="", metavar="DERS_KODU",
+                        help="OBS'ye bağlanmadan kayıtlı not geçmişini göster (ders kodu verilirse sadece o ders)")
+    parser.add_argument("--record", metavar="DOSYA",
+                        help="Tüm OBS istek/cevaplarını gzip'li arşive kaydet (şifre ve ViewState yazılmaz; not sayfaları yazılır)")
+    parser.add_argument("--replay", metavar="DOSYA",
+                        help="OBS'ye bağlanmadan --record ile kaydedilmiş arşivi oynat (hata ayıklama)")
+    parser.add_argument("--captcha-view", choices=["auto", "inline", "viewer"], default="auto",
+                        help="Captcha'yı terminalde çiz (Pillow gerekir) veya resim görüntüleyicide aç (varsayılan: auto)")
+    parser.add_argument("--captcha-solver", metavar="MODUL:FONKSIYON",
+                        help="Captcha'yı önce bu fonksiyona çözdür, ör. yerel OCR eklentisi (varsayılan: $OBS_CAPTCHA_SOLVER)")
+    parser.add_argument("--profile", action="store_true",
+                        help="HTTP istekleri ve parse adımlarının süre/byte özetini göster")
+    parser.add_argument("--profile-out", metavar="DOSYA",
+                        help="Profil kayıtlarını JSON trace olarak dosyaya yaz (--profile'ı da açar)")
+    args = parser.parse_args()
+    # Login'den önce yakalansın; watch modu başladıktan sonra değil
+    if args.notify == "webhook" and not args.webhook_url: parser.error("--notify webhook için --webhook-url gerekli")
+    return args
+
+def ask_next_action(ui: DisplayManager, args):
+    """Akışın sonunda kullanıcıya devam etmek isteyip istemediğini sorar."""
+    ui.console.print("\n")
+    if ui.ask_choice("Ne yapmak istersin?", ["Kullanıcı Değiştir", "Çıkış"]) == "Kullanıcı Değiştir":
+        main(args) # Rekürsif çağrı ile başa dön
+    else:
+        ui.show_message("İyi çalışmalar!", "yellow")
+
+def report_profile(ui: DisplayManager, profiler: Profiler, args):
+    """Profil özetini basar, istenirse JSON trace'i dosyaya yazar."""
+    ui.render_profile(profiler.summary(), profiler.elapsed_ms())
+    if args.profile_out:
+        profiler.export_json(args.profile_out, all_terms=args.all_terms, argv=sys.argv[1:])
+        ui.show_message(f"Profil kaydedildi: {args.profile_out}", "green")
+
+def choose_school(ui: DisplayManager, schools: SchoolRegistry, args) -> School:
+    """Yeni giriş için okul: --school verildiyse o, tek okul varsa o, yoksa menüden seçilir."""
+    if args.school: return schools.get(args.school)
+    if len(schools) == 1: return schools.get()
+    return schools.by_name(ui.ask_choice("Okul Seçimi", schools.names()))
+
+def show_projection(ui: DisplayManager, cache: GradeCache, username: str, args):
+    """Önbellekteki tüm dönemler üzerinden gereken notları ve dönem/genel ortalamayı gösterir."""
+    from src.models import GradeColumns
+    from src.services.projection import ProjectionEngine, load_weights
+
+    try:
+        engine = ProjectionEngine(*load_weights(args.weights)) if args.weights else ProjectionEngine()
+    except (OSError, ValueError) as e:
+        ui.show_message(f"Ağırlık dosyası okunamadı ({args.weights}): {e}", "red")
+        return
+    columns = GradeColumns(g for term in cache.terms(username) for g in cache.get_grades(username, term))
+    ui.render_projection(engine.project_columns(columns), columns.term_gpa(), columns.cumulative_gpa().get(None))
+
+def remember(cache: GradeCache, history, username: str, grades):
+    """Çekilen notları önbelleğe ve (varsa) not geçmişine yazar; ortalamaları tamamlanmış listeyi döner."""
+    merged = cache.store(username, grades)
+    if history: history.record(username, merged)
+    return merged
+
+def show_captcha(ui: DisplayManager, image: bytes, mode: str) -> Optional[str]:
+    """
+    Captcha'yı kullanıcıya gösterir. Terminalde çizilemezse benzersiz adlı geçici dosyaya yazıp
+    görüntüleyicide açar (beklemeden); silinmesi için dosya yolunu döner.
+    """
+    if mode != "viewer" and ui.render_captcha(image): return None
+    if mode == "inline":
+        ui.show_message("Captcha terminalde çizilemedi (Pillow kurulu mu?), görüntüleyici deneniyor.", "yellow")
+
+    import platform, subprocess
+    from src.services.captcha import image_format
+    fd, path = tempfile.mkstemp(prefix="obs-captcha-", suffix="." + image_format(image))
+    with os.fdopen(fd, "wb") as f:
+        f.write(image)
+    try:
+        if platform.system() == "Windows": os.startfile(path)
+        else:
+            opener = "open" if platform.system() == "Darwin" else "xdg-open"
+            subprocess.Popen((opener, path), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        ui.console.print(f"[yellow]Captcha açıldı ({path})...[/yellow]")
+    except Exception:
+        # Headless sunucu: görüntüleyici yok, dosya yine de elle açılabilir
+        ui.show_message(f"Captcha görüntüleyicide açılamadı, dosyaya bakın: {path}", "yellow")
+    return path
+
+def ask_captcha_code(ui: DisplayManager, image: bytes, mode: str) -> str:
+    """Captcha'yı gösterip kodu sorar; geçici dosya açıldıysa sonra siler."""
+    path = show_captcha(ui, image, mode)
+    code = ui.ask_input("İşlem sonucu")
+    if path:
+        try: os.remove(path)
+        except OSError: pass # Windows'ta görüntüleyici dosyayı kilitli tutuyor olabilir
+    return code
+
+def show_history(ui: DisplayManager, app_dir: str, username: str, course_code: str):
+    """Not geçmişini yeniden eskiye, sayfa sayfa gösterir."""
+    from src.services.history import EXAM_COLUMNS, GradeHistory
+
+    history = GradeHistory(app_dir)
+    first_seen = {}
+    if course_code:
+        for exam in EXAM_COLUMNS:
+            seen = history.first_seen(username, course_code, exam)
+            if seen: first_seen[exam] = seen[0]
+    title = f"Not Geçmişi - {username}" + (f" / {course_code}" if course_code else "")
+    ui.render_history(history.iter_pages(username, course_code=course_code or None), title, first_seen)
+    history.close()
+
+def run_watch(ui: DisplayManager, client: "OBSClient", cache: GradeCache, username: str, initial, args,
+              history=None, reconnect=None):
+    """Notları periyodik olarak çeker; değişiklik olunca seçilen bildirimciyi tetikler. Oturum düşerse reconnect çağrılır."""
+    from src.services.watcher import GradeWatcher, make_notifier
+
+    notify = ui.render_changes if args.notify == "stdout" else make_notifier(args.notify, args.webhook_url)
+    watcher = GradeWatcher(
+        client, notify, interval=args.interval,
+        on_snapshot=lambda grades: remember(cache, history, username, grades),
+        on_error=lambda e, delay: ui.show_message(f"Kontrol başarısız ({e}), {delay:.0f} sn sonra tekrar denenecek.", "red"),
+        reconnect=reconnect
+    )
+    ui.show_message(f"👀 İzleme modu: her ~{args.interval:.0f} sn'de kontrol ediliyor (Çıkmak için Ctrl+C)", "cyan")
+    try:
+        watcher.run(initial=initial)
+    except KeyboardInterrupt:
+        ui.show_message("İzleme durduruldu.", "yellow")
+
+def main(args=None):
+    if args is None:
+        args = parse_args()
+    if not args.replay: return run(args)
+
+    # Kayıttan oynatırken gerçek önbellek ve geçmiş kirletilmesin diye geçici bir klasör kullanılır
+    import shutil
+    replay_dir = tempfile.mkdtemp(prefix="obs-replay-")
+    try:
+        return run(args, replay_dir)
+    finally:
+        shutil.rmtree(replay_dir, ignore_errors=True) # Windows'ta kilitli kalan dosya çıkışı engellemesin
+
+def run(args, replay_dir: Optional[str] = None):
+    """Tek kullanıcı için giriş, çekim ve gösterim akışı; replay_dir verilirse önbellek ve geçmiş oraya yazılır."""
     # 1. YÖNETİCİLERİ BAŞLAT
     ui = DisplayManager()
     auth = AuthManager()
-    client = OBSClient()
+    profiler = Profiler() if (args.profile or args.profile_out) else None
+    data_dir = replay_dir or auth.app_dir
+    cache = GradeCache(data_dir)
+    try:
+        schools = SchoolRegistry.load(auth.app_dir)
+    except Exception as e:
+        ui.show_message(f"Hata: {e}", "red") # Kullanıcının schools.json'ı bozuk olabilir
+        return
     
     ui.print_banner()
 
     # 2. KULLANICI SEÇİMİ VE GİRİŞ (AUTH FLOW)
     current_user = None
     current_pass = None
+    school = None
+    # Kayıtlı kullanıcının şifresi keyring'den arka planda okunur; login sayfası ve captcha
+    # bu sırada indirilir, böylece captcha sorusu keyring'i beklemeden gelir
+    password_job: Optional[Future] = None
 
     registered_users = auth.get_registered_users()
     
@@ -45,107 +223,204 @@ def main():
         elif choice == "Kullanıcı Sil":
             user_to_delete = ui.ask_choice("Silinecek Kullanıcı", registered_users)
             auth.delete_user(user_to_delete)
+            cache.forget(user_to_delete)
+            from src.services.history import GradeHistory
+            GradeHistory(auth.app_dir).forget(user_to_delete)
             ui.show_message(f"{user_to_delete} silindi.", "red")
             # Silince tekrar başa dönmek en temizi (recursive main çağrısı yerine loop kullanılabilir ama basit olsun)
-            return main()
+            return main(args)
+
+        elif args.offline or args.history is not None:
+            # Çevrimdışı modda (ve geçmiş görüntülerken) şifreye ihtiyaç yok
+            current_user = choice
 
         else:
             # Kayıtlı kullanıcı seçildi
             current_user = choice
-            current_pass = auth.get_password(current_user)
-            if not current_pass:
-                ui.show_message("Hata: Kayıtlı şifre okunamadı!", "red")
-                current_user = None # Yeni girişe zorla
+            try:
+                school = schools.get(auth.get_school(current_user))
+            except Exception as e:
+                ui.show_message(f"Hata: {e}", "red") # Okul kullanıcının schools.json'ından silinmiş olabilir
+                return
+            keyring_pool = ThreadPoolExecutor(max_workers=1)
+            password_job = keyring_pool.submit(auth.get_password, current_user)
+            keyring_pool.shutdown(wait=False) # İş arka planda biter, havuz başka iş almaz
 
     # Eğer kullanıcı seçilmediyse veya yeni giriş ise
     save_credentials = False
     if not current_user:
         ui.show_message("Lütfen OBS bilgilerinle giriş yap", "cyan")
         current_user = ui.ask_input("Öğrenci No")
-        current_pass = ui.ask_input("Şifre", password=True)
-        save_credentials = True # Başarılı olursa soracağız
+        if not args.offline and args.history is None:
+            try:
+                school = choose_school(ui, schools, args)
+            except Exception as e:
+                ui.show_message(f"Hata: {e}", "red") # --school listede yok
+                return
+            current_pass = ui.ask_input("Şifre", password=True)
+            save_credentials = True # Başarılı olursa soracağız
+
+    # 2.4 GEÇMİŞ: OBS'ye gitmeden kayıtlı geçmişi göster
+    if args.history is not None:
+        show_history(ui, data_dir, current_user, args.history)
+        return ask_next_action(ui, args)
+
+    # 2.5 ÖNBELLEK: Kayıtlı veri varsa hemen göster, tazeyse OBS'ye hiç gitme
+    cached_grades = cache.get_grades(current_user)
+    if cached_grades:
+        cached_terms = cache.terms(current_user) if args.all_terms else [cached_grades[0].term_id]
+        for term in cached_terms:
+            ui.render_grades(cache.get_grades(current_user, term), f"{term} - önbellek")
+        # Tüm dönemler veya izleme istendiyse OBS'ye her halükarda gidilir
+        if args.offline or (not args.all_terms and not args.watch and not cache.is_stale(current_user)):
+            if args.project: show_projection(ui, cache, current_user, args)
+            return ask_next_action(ui, args)
+        ui.show_message("Önbellekteki veriler eski, güncelleniyor...", "cyan")
+    elif args.offline:
+        ui.show_message("Bu kullanıcı için önbellekte kayıtlı not yok.", "yellow")
+        return ask_next_action(ui, args)
 
     # 3. OBS LOGIN İŞLEMİ
-    login_success = False
-    
-    # Login Loading Animasyonu
-    with ui.console.status("[bold green]OBS Sistemine Bağlanılıyor...", spinner="dots") as status:
+    from src.services.captcha import SolverError, load_solver, solve
+    from src.services.obs_client import OBSClient
+    from src.services.stats_index import StatsUrlIndex
+    from src.services.transport import TransportConfig
+    client = OBSClient(
+        profiler=profiler,
+        # Oynatmada URL indeksi kullanılmaz: arşivde olmayan doğrudan istekler indeksi bozmasın
+        stats_index=None if args.replay else StatsUrlIndex(auth.app_dir, current_user),
+        transport=TransportConfig(record_path=args.record, replay_path=args.replay),
+        school=school
+    )
+    history = None
+    try:
+        login_success = False
         try:
-            def captcha_handler(path):
-                # Resmi işletim sisteminde aç
-                import os, subprocess, platform
-                if platform.system() == "Windows": os.startfile(path)
-                elif platform.system() == "Darwin": subprocess.call(("open", path))
-                else: subprocess.call(("xdg-open", path))
-                
-                ui.console.print(f"[yellow]Captcha açıldı ({path})...[/yellow]")
-                
-                # --- KRİTİK HAMLE: Animasyonu durdur ---
+            solver = load_solver(args.captcha_solver)
+        except SolverError as e:
+            ui.show_message(f"Captcha çözücü yüklenemedi ({e}), captcha sorulacak.", "yellow")
+            solver = None
+
+        # Login Loading Animasyonu
+        with ui.console.status("[bold green]OBS Sistemine Bağlanılıyor...", spinner="dots") as status:
+            try:
+                def ask_captcha(image: bytes) -> str:
+                    # Soru sorulurken animasyon durdurulur, yoksa input satırını bozar
+                    status.stop()
+                    code = ask_captcha_code(ui, image, args.captcha_view)
+                    status.start()
+                    return code
+
+                # Önce kayıtlı oturumu dene; captcha'lı girişe sadece oturum geçersizse düş
+                saved_session = None if save_credentials else auth.get_session(current_user)
+                if saved_session and client.restore_session(saved_session):
+                    login_success = True
+                else:
+                    captcha = client.prepare_login()
+                    if password_job: current_pass = password_job.result()
+                    if not current_pass:
+                        status.stop()
+                        ui.show_message("Hata: Kayıtlı şifre okunamadı!", "red")
+                        current_pass = ui.ask_input("Şifre", password=True)
+                        save_credentials = True # Başarılı olursa yeniden kaydetmeyi soracağız
+                        status.start()
+                    captcha_code = solve(captcha, solver, ask_captcha) if captcha else ""
+                    login_success = client.submit_login(current_user, current_pass, captcha_code)
+
+            except Exception as e:
+                # Hata mesajı basmadan önce status'ü durdurmak gerekebilir ama
+                # with bloğu çıkışta otomatik kapatır. Yine de garanti olsun:
                 status.stop()
-                
-                # Şimdi temiz temiz input alabiliriz
-                code = ui.ask_input("İşlem sonucu: ")
-                
-                # Input bitti, animasyonu tekrar başlat
-                status.start()
-                # ---------------------------------------
-                
-                return code
-
-            login_success = client.login(current_user, current_pass, captcha_handler)
-            
-        except Exception as e:
-            # Hata mesajı basmadan önce status'ü durdurmak gerekebilir ama
-            # with bloğu çıkışta otomatik kapatır. Yine de garanti olsun:
-            status.stop()
-            ui.show_message(f"Bağlantı Hatası: {str(e)}", "red")
+                ui.show_message(f"Bağlantı Hatası: {str(e)}", "red")
+                return
+
+        if not login_success:
+            ui.show_message("❌ Giriş Başarısız! Kullanıcı adı, şifre veya captcha hatalı.", "red")
+            # Hatalı girişse ve kayıtlıysa, belki silmek istersin? (Opsiyonel)
             return
 
-    if not login_success:
-        ui.show_message("❌ Giriş Başarısız! Kullanıcı adı, şifre veya captcha hatalı.", "red")
-        # Hatalı girişse ve kayıtlıysa, belki silmek istersin? (Opsiyonel)
-        return
+        ui.show_message(f"✅ Giriş Başarılı: {current_user}", "green")
 
-    ui.show_message(f"✅ Giriş Başarılı: {current_user}", "green")
+        # 4. ŞİFRE KAYDETME SORUSU (Sadece yeni girişse)
+        if save_credentials and not args.replay:
+            if ui.ask_choice("Bilgileri güvenli kasaya (Keyring) kaydedeyim mi?", ["Evet", "Hayır"]) == "Evet":
+                auth.save_user(current_user, current_pass, school.id)
+                ui.show_message("Bilgiler kaydedildi!", "green")
 
-    # 4. ŞİFRE KAYDETME SORUSU (Sadece yeni girişse)
-    if save_credentials:
-        if ui.ask_choice("Bilgileri güvenli kasaya (Keyring) kaydedeyim mi?", ["Evet", "Hayır"]) == "Evet":
-            auth.save_user(current_user, current_pass)
-            ui.show_message("Bilgiler kaydedildi!", "green")
+        # 5. VERİ ÇEKME VE GÖSTERME
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        from src.services.history import GradeHistory
+        # Her çekim not geçmişine eklenir (değişmeyen dersler yeni kayıt oluşturmaz)
+        history = GradeHistory(data_dir)
+        try:
+            # Rich Progress Bar ile veri çekme animasyonu
+            grades = []
+            stats_filter = lambda course: cache.is_average_stale(current_user, course.term_id, course.code)
 
-    # 5. VERİ ÇEKME VE GÖSTERME
-    try:
-        # Rich Progress Bar ile veri çekme animasyonu
-        grades = []
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True
-        ) as progress:
-            task = progress.add_task("[green]Ders notları ve ortalamalar çekiliyor...", total=None)
-            
-            # OBSClient bizim için her şeyi (Notlar + AJAX Ortalamaları) hallediyor
-            grades = client.fetch_grades()
-            
-            progress.update(task, completed=100)
+            if args.all_terms:
+                # Her dönem bittiği anda tablosu basılır, hepsini beklemeye gerek yok
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=ui.console,
+                    transient=True
+                ) as progress:
+                    task = progress.add_task("[green]Tüm dönemlerin notları çekiliyor...", total=None)
+                    for term_id, term_grades in client.fetch_all_terms(stats_filter=stats_filter):
+                        ui.render_grades(remember(cache, history, current_user, term_grades), term_id)
+                    progress.update(task, completed=100)
 
-        # Tabloyu çiz
-        # Dönem bilgisini grades listesindeki ilk elemandan alabiliriz (hepsi aynı dönemdir)
-        term_id = grades[0].term_id if grades else "Bilinmiyor"
-        ui.render_grades(grades, term_id)
+            else:
+                # Tablo ilk ders parse edilir edilmez çizilir; ortalamalar geldikçe satırlar yenilenir.
+                # Sadece önbellekte eskimiş ortalamalar yeniden çekilir.
+                fetched = {}
+                with ui.live_grades() as show:
+                    for idx, course in client.iter_grades(stats_filter=stats_filter):
+                        fetched[idx] = course
+                        show(idx, course)
 
-    except Exception as e:
-        ui.show_message(f"Veri Çekme Hatası: {str(e)}", "red")
-        import traceback
-        traceback.print_exc() # Detaylı hata (Geliştirme aşamasında açık kalsın)
+                    # Çekilmeyen ortalamalar önbellekten tamamlanır, tablo son haliyle kalır
+                    grades = remember(cache, history, current_user, [fetched[idx] for idx in sorted(fetched)])
+                    for idx, course in enumerate(grades):
+                        show(idx, course)
+
+        except Exception as e:
+            ui.show_message(f"Veri Çekme Hatası: {str(e)}", "red")
+            import traceback
+            traceback.print_exc() # Detaylı hata (Geliştirme aşamasında açık kalsın)
+
+        if args.project:
+            show_projection(ui, cache, current_user, args)
+
+        # 5.5 İZLEME MODU: Ctrl+C'ye kadar notları kontrol et
+        if args.watch and not args.all_terms:
+            def relogin() -> bool:
+                # Önce keyring'deki oturum (başka bir çalıştırma yenilemiş olabilir), olmazsa şifre + captcha
+                ui.show_message("OBS oturumu düşmüş, yeniden giriş yapılıyor...", "yellow")
+                saved_session = None if args.replay else auth.get_session(current_user)
+                if saved_session and client.restore_session(saved_session): return True
+                password = current_pass or auth.get_password(current_user)
+                if not password: return False
+                captcha = client.prepare_login()
+                code = solve(captcha, solver, lambda image: ask_captcha_code(ui, image, args.captcha_view)) if captcha else ""
+                return client.submit_login(current_user, password, code)
+
+            run_watch(ui, client, cache, current_user, grades, args, history, reconnect=relogin)
+
+        # Oturum cookie'lerini sakla ki bir sonraki açılışta captcha sorulmasın (sadece kayıtlı kullanıcılar)
+        if current_user in auth.get_registered_users() and not args.replay:
+            auth.save_session(current_user, client.export_session())
+    finally:
+        # Giriş veya çekim başarısız olsa da profil özeti basılır; en çok o çalıştırmalarda gerekir
+        if profiler:
+            report_profile(ui, profiler, args)
+        if history is not None: history.close()
+        client.close()
+        if args.record:
+            ui.show_message(f"İstekler kaydedildi: {args.record}", "green")
 
     # 6. ÇIKIŞ
-    ui.console.print("\n")
-    if ui.ask_choice("Ne yapmak istersin?", ["Kullanıcı Değiştir", "Çıkış"]) == "Kullanıcı Değiştir":
-        main() # Rekürsif çağrı ile başa dön
-    else:
-        ui.show_message("İyi çalışmalar!", "yellow")
+    ask_next_action(ui, args)
 
 if __name__ == "__main__":
     try:
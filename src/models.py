@@ -1,15 +1,78 @@
+import re
+import math
+from array import array
 from dataclasses import dataclass
-from typing import Optional
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# OBS sayıları virgüllü yazar: "80", "44,90"; "-", "--", "?" gibi değerler sayı değildir
+_NUMBER_RE = re.compile(r"^\d+(?:[.,]\d+)?$")
+
+def parse_number(text: str) -> Optional[float]:
+    """OBS'deki not/ortalama metnini sayıya çevirir; sayı değilse None döner."""
+    text = (text or "").strip()
+    if not _NUMBER_RE.match(text): return None
+    return float(text.replace(",", "."))
+
+class ScoreStatus(Enum):
+    """Bir not/ortalama hücresinin durumu."""
+    NOT_ENTERED = "not_entered"   # "-", "--": sınav yok veya not girilmemiş
+    PENDING = "pending"           # "?": ortalama henüz çekilmedi
+    FAILED = "failed"             # "?": ortalama çekilemedi (sebebi ExamStats.error'da)
+    VALUE = "value"               # Sayısal değer var
+
+def score_status(text: str, value: Optional[float]) -> ScoreStatus:
+    if value is not None: return ScoreStatus.VALUE
+    if text == "?": return ScoreStatus.PENDING
+    return ScoreStatus.NOT_ENTERED
 
-@dataclass
 class ExamStats:
-    """Tek bir sınavın notu ve sınıf ortalaması."""
-    score: str = "-"       # Öğrencinin notu (Örn: 80)
-    class_avg: str = "?"   # Sınıf ortalaması (Örn: 44,90)
+    """
+    Tek bir sınavın notu ve sınıf ortalaması.
+    Ham metin (OBS'de göründüğü gibi) ile parse edilmiş sayı ve durum birlikte, oluşturulurken bir kez
+    hesaplanır. Değerler birbiriyle tutarlı kalsın diye nesne değiştirilemez; yeni değer için yeni nesne.
+    error: ortalama çekilemediyse sebebi (Örn: "HTTP 503, 3 deneme"). Geçici bir durum olduğu için
+    karşılaştırmaya girmez; değişiklik tespiti ve geçmiş onu görmez.
+    """
+    __slots__ = ("score", "class_avg", "score_value", "avg_value", "score_status", "avg_status", "error")
+
+    def __init__(self, score: str = "-", class_avg: str = "?", error: Optional[str] = None):
+        set_ = object.__setattr__
+        set_(self, "score", score)          # Öğrencinin notu (Örn: 80)
+        set_(self, "class_avg", class_avg)  # Sınıf ortalaması (Örn: 44,90)
+        set_(self, "score_value", parse_number(score))
+        set_(self, "avg_value", parse_number(class_avg))
+        set_(self, "score_status", score_status(score, self.score_value))
+        set_(self, "avg_status", score_status(class_avg, self.avg_value))
+        set_(self, "error", error)
+        if error and self.avg_status is ScoreStatus.PENDING: set_(self, "avg_status", ScoreStatus.FAILED)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ExamStats değiştirilemez; yeni bir ExamStats oluşturun")
+
+    def __eq__(self, other):
+        if not isinstance(other, ExamStats): return NotImplemented
+        return self.score == other.score and self.class_avg == other.class_avg
+
+    def __hash__(self):
+        return hash((self.score, self.class_avg))
+
+    def __repr__(self):
+        error = f", error={self.error!r}" if self.error else ""
+        return f"ExamStats(score={self.score!r}, class_avg={self.class_avg!r}{error})"
+
+    def __reduce__(self):
+        return (ExamStats, (self.score, self.class_avg, self.error))
+
+    def to_dict(self) -> Dict[str, str]:
+        data = {"score": self.score, "class_avg": self.class_avg}
+        if self.error: data["error"] = self.error
+        return data
 
 @dataclass
 class CourseGrade:
     """Bir dersin tüm not bilgileri."""
+    __slots__ = ("code", "name", "midterm", "final", "makeup", "letter_grade", "term_id")
     code: str              # Ders Kodu (BİLM201)
     name: str              # Ders Adı (Sayısal Tasarım)
     midterm: ExamStats     # Vize
@@ -18,8 +81,132 @@ class CourseGrade:
     letter_grade: str      # Harf Notu (AA, BA, --)
     term_id: str           # Dönem ID (20251)
 
+    def to_dict(self) -> Dict:
+        """JSON'a yazılabilir hali (sınavlar ham metinleriyle)."""
+        return {
+            "code": self.code,
+            "name": self.name,
+            "midterm": self.midterm.to_dict(),
+            "final": self.final.to_dict(),
+            "makeup": self.makeup.to_dict(),
+            "letter_grade": self.letter_grade,
+            "term_id": self.term_id
+        }
+
+    @property
+    def stats_error(self) -> Optional[str]:
+        """İstatistik sayfası çekilemediyse sebebi (üç sınav aynı sayfadan gelir)."""
+        return self.midterm.error or self.final.error or self.makeup.error
+
+# Harf notu katsayıları (4'lük sistem); listede olmayanlar (--, YT, G...) ortalamaya girmez
+LETTER_POINTS = {
+    "AA": 4.0, "BA": 3.5, "BB": 3.0, "CB": 2.5, "CC": 2.0,
+    "DC": 1.5, "DD": 1.0, "FD": 0.5, "FF": 0.0, "DZ": 0.0
+}
+
+class GradeColumns:
+    """
+    Çok sayıda CourseGrade'in sütun bazlı (array('d')) kopyası.
+    Sayılar bir kez çıkarılır; eksik değerler NaN'dır, NaN ile her karşılaştırma False döner.
+    Yüzlerce dönem x hesap bellekte tutulurken hücre hücre metin parse etmeye gerek kalmaz.
+    """
+    EXAMS = ("midterm", "final", "makeup")
+
+    def __init__(self, grades: Iterable[CourseGrade] = (), username: Optional[str] = None):
+        self.usernames: List[Optional[str]] = []
+        self.term_ids: List[str] = []
+        self.codes: List[str] = []
+        self.names: List[str] = []
+        self.letter_points = array("d")
+        self.scores = {exam: array("d") for exam in self.EXAMS}
+        self.averages = {exam: array("d") for exam in self.EXAMS}
+        self.extend(grades, username)
+
+    def extend(self, grades: Iterable[CourseGrade], username: Optional[str] = None):
+        nan = math.nan
+        for g in grades:
+            self.usernames.append(username)
+            self.term_ids.append(g.term_id)
+            self.codes.append(g.code)
+            self.names.append(g.name)
+            self.letter_points.append(LETTER_POINTS.get(g.letter_grade, nan))
+            for exam in self.EXAMS:
+                stats = getattr(g, exam)
+                self.scores[exam].append(nan if stats.score_value is None else stats.score_value)
+                self.averages[exam].append(nan if stats.avg_value is None else stats.avg_value)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "GradeColumns":
+        """Toplu export kayıtlarından (exporter.grade_record biçimi) sütunları kurar; metin parse edilmez."""
+        columns = cls()
+        nan = math.nan
+        for r in records:
+            columns.usernames.append(r.get("username"))
+            columns.term_ids.append(r["term_id"])
+            columns.codes.append(r["code"])
+            columns.names.append(r.get("name", ""))
+            columns.letter_points.append(LETTER_POINTS.get(r.get("letter_grade"), nan))
+            for exam in cls.EXAMS:
+                score, avg = r.get(f"{exam}_score"), r.get(f"{exam}_avg")
+                columns.scores[exam].append(nan if score is None else float(score))
+                columns.averages[exam].append(nan if avg is None else float(avg))
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def above_average(self, exam: str = "midterm") -> List[bool]:
+        """Not sınıf ortalamasının üstündeyse True (notu veya ortalaması olmayan dersler False)."""
+        return [s > a for s, a in zip(self.scores[exam], self.averages[exam])]
+
+    def below_average(self, exam: str = "midterm") -> List[bool]:
+        return [s < a for s, a in zip(self.scores[exam], self.averages[exam])]
+
+    def _mean_points(self, keys: Iterable) -> Dict:
+        totals: Dict = {}
+        for key, points in zip(keys, self.letter_points):
+            if math.isnan(points): continue
+            total = totals.setdefault(key, [0.0, 0])
+            total[0] += points
+            total[1] += 1
+        return {key: total / count for key, (total, count) in totals.items()}
+
+    def term_gpa(self) -> Dict[str, float]:
+        """Dönem başına harf notu ortalaması (OBS kredi bilgisi vermediği için ağırlıksız)."""
+        return self._mean_points(self.term_ids)
+
+    def user_term_gpa(self) -> Dict[Tuple[Optional[str], str], float]:
+        """Çok hesaplı veride (kullanıcı, dönem) başına ortalama."""
+        return self._mean_points(zip(self.usernames, self.term_ids))
+
+    def cumulative_gpa(self) -> Dict[Optional[str], float]:
+        """Kullanıcı başına tüm dönemlerin genel ortalaması (tek hesapta anahtar None)."""
+        return self._mean_points(self.usernames)
+
+@dataclass
+class GradeChange:
+    """İki not anlık görüntüsü arasındaki tek bir fark (watch modunda bildirilir)."""
+    term_id: str           # Dönem ID (20251)
+    course_code: str       # Ders Kodu (BİLM201)
+    course_name: str       # Ders Adı
+    kind: str              # "course" | "score" | "average" | "letter"
+    field: str             # "Vize", "Final", "Büt", "Harf" veya "Ders"
+    old: str               # Eski değer (yeni ders için boş)
+    new: str               # Yeni değer
+
+@dataclass
+class GradeSnapshot:
+    """Not geçmişindeki bir kayıt: dersin o anki hali ve ilk görüldüğü zaman."""
+    grade: CourseGrade
+    fetched_at: float      # Unix zamanı (bu halin ilk çekildiği an)
+    username: str = ""
+
+# Okul bilgisi olmadan kaydedilmiş eski profillerin okulu (bkz. services/schools.json)
+DEFAULT_SCHOOL_ID = "ozal"
+
 @dataclass
 class UserProfile:
     """Kullanıcı profil bilgisi (Şifre burada tutulmaz!)."""
     username: str          # Öğrenci No
-    last_login: str = ""   # Son giriş tarihi (Opsiyonel, şimdilik boş kalsın)
\ No newline at end of file
+    last_login: str = ""   # Son giriş tarihi (Opsiyonel, şimdilik boş kalsın)
+    school: str = DEFAULT_SCHOOL_ID  # Okul id'si (SchoolRegistry)
\ No newline at end of file
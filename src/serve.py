@@ -0,0 +1,71 @@
+import sys
+import os
+import argparse
+
+# main.py ile aynı: nereden çalıştırılırsa çalıştırılsın 'src' modülü bulunsun
+current_dir = os.path.dirname(os.path.abspath(__file__)) # src/
+project_root = os.path.dirname(current_dir)            # OBSGradePuller/
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.services.api_server import GradeService, GradesAPIServer, ProfileConnector
+from src.services.auth_manager import AuthManager
+from src.services.captcha import SolverError, load_solver
+
+def replay_connector(path: str):
+    """--replay: her profil için kayıtlı arşivden oynatan client (OBS'ye ve keyring'e dokunmaz)."""
+    from src.services.obs_client import OBSClient
+    from src.services.transport import TransportConfig
+
+    def connect(username: str) -> OBSClient:
+        client = OBSClient(transport=TransportConfig(replay_path=path))
+        if not client.login(username, "replay", lambda _captcha: ""):
+            client.close()
+            raise Exception(f"{username} için arşivdeki login başarısız: {path}")
+        return client
+    return connect
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Kayıtlı profillerin notlarını yerel, salt-okunur bir HTTP/JSON servisi olarak sunar."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan: sadece bu makine)")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--ttl", type=float, default=60, help="Sonuçların bellekte taze sayılacağı süre (sn)")
+    parser.add_argument("--users", nargs="+", help="Sadece bu hesaplar (varsayılan: kayıtlı tüm hesaplar)")
+    parser.add_argument("--captcha-solver", metavar="MODUL:FONKSIYON",
+                        help="Oturum geçersizse captcha'yı bu fonksiyona çözdür (varsayılan: $OBS_CAPTCHA_SOLVER)")
+    parser.add_argument("--replay", metavar="DOSYA",
+                        help="OBS yerine --record ile kaydedilmiş arşivi oynat (çevrimdışı deneme)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    auth = AuthManager()
+    allowed = set(args.users) if args.users else None
+
+    def users():
+        # Oynatmada keyring'de profil olmayabilir; --users ile verilen adlar yeterli
+        registered = args.users if args.replay and args.users else auth.get_registered_users()
+        return [u for u in registered if allowed is None or u in allowed]
+
+    if args.replay:
+        connect = replay_connector(args.replay)
+    else:
+        try:
+            connect = ProfileConnector(auth, solver=load_solver(args.captcha_solver))
+        except SolverError as e:
+            sys.stderr.write(f"{e}\n")
+            return 2
+    server = GradesAPIServer(GradeService(connect, users, ttl=args.ttl), args.host, args.port)
+    sys.stderr.write(f"Not servisi: {server.origin}/users/<öğrenci no>/grades  (Ctrl+C ile çık)\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from src.services.scheduler import default_scheduler
+
+if TYPE_CHECKING:
+    from src.services.obs_client import OBSClient
+
+# Kullanıcı adı -> oturumu açılmış (notları çekmeye hazır) OBSClient.
+# Servis OBS'ye nasıl bağlanıldığını bilmez; çevrimdışı denemede sahte sunucuya veya
+# --replay arşivine bağlanan bir fabrika verilebilir.
+ClientFactory = Callable[[str], "OBSClient"]
+
+class CaptchaRequired(Exception):
+    """Kayıtlı oturum geçersiz ve captcha insansız çözülemedi (HTTP 503 olarak döner)."""
+
+class SingleFlightCache:
+    """
+    TTL'li bellek önbelleği. Aynı anahtar için aynı anda gelen istekler tek bir yükleme
+    (OBS'ye tek fetch) paylaşır: ilk gelen yükler, diğerleri onun sonucunu bekler.
+    Hatalar önbelleğe alınmaz; bekleyenler aynı hatayı alır, sonraki istek yeniden dener.
+    """
+
+    class _Flight:
+        __slots__ = ("done", "value", "error")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.value = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, object]] = {}   # anahtar -> (bitiş, değer)
+        self._inflight: Dict[Hashable, "SingleFlightCache._Flight"] = {}
+
+    def get(self, key: Hashable, loader: Callable[[], object]) -> Tuple[object, str]:
+        """(değer, kaynak) döner; kaynak "hit", "miss" (bu çağrı yükledi) veya "coalesced"."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > self.clock():
+                return entry[1], "hit"
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = self._Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None: raise flight.error
+            return flight.value, "coalesced"
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                if self.ttl > 0: self._entries[key] = (self.clock() + self.ttl, flight.value)
+            return flight.value, "miss"
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        with self._lock:
+            if key is None: self._entries.clear()
+            else: self._entries.pop(key, None)
+
+class ServiceMetrics:
+    """İstek sayaçları, önbellek isabet oranı ve uç nokta bazında gecikme (son N istek)."""
+    WINDOW = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.counters: Dict[str, int] = {"requests": 0, "hits": 0, "misses": 0, "coalesced": 0,
+                                         "upstream_fetches": 0, "upstream_errors": 0, "errors": 0}
+        self._latency: Dict[str, deque] = {}
+
+    def incr(self, name: str, by: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + by
+
+    def observe(self, route: str, elapsed_ms: float):
+        with self._lock:
+            self.counters["requests"] += 1
+            self._latency.setdefault(route, deque(maxlen=self.WINDOW)).append(elapsed_ms)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+            latency = {route: sorted(samples) for route, samples in self._latency.items()}
+
+        lookups = counters["hits"] + counters["misses"] + counters["coalesced"]
+        def pct(samples: List[float], p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 3)
+
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "counters": counters,
+            # OBS'ye gitmeden cevaplanan oran (bekleyip paylaşılan istekler de OBS'ye gitmez)
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else None,
+            "upstream_saved_rate": round((counters["hits"] + counters["coalesced"]) / lookups, 4) if lookups else None,
+            "latency_ms": {route: {"count": len(s), "p50": pct(s, 0.5), "p95": pct(s, 0.95), "max": round(s[-1], 3)}
+                           for route, s in latency.items() if s}
+        }
+
+class GradeService:
+    """
+    Profil başına tek oturum tutan, sonuçları TTL süresince bellekte saklayan not servisi.
+    Aynı öğrencinin notlarını isteyen birden çok araç OBS'ye tek login ve tek fetch ile cevaplanır.
+    """
+
+    def __init__(self, connect: ClientFactory, users: Callable[[], List[str]], ttl: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        self.connect = connect
+        self.users = users
+        self.cache = SingleFlightCache(ttl, clock)
+        self.metrics = ServiceMetrics()
+        self._clients: Dict[str, "OBSClient"] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _user_lock(self, username: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(username, threading.Lock())
+
+    def _client(self, username: str) -> "OBSClient":
+        client = self._clients.get(username)
+        if client is None:
+            client = self._clients[username] = self.connect(username)
+        return client
+
+    def _drop_client(self, username: str):
+        client = self._clients.pop(username, None)
+        if client: client.close()
+
+    def _upstream(self, username: str, fetch: Callable[["OBSClient"], Dict]) -> Dict:
+        """
+        Aynı kullanıcının farklı istekleri (son dönem / tüm dönemler) aynı oturumda sırayla çalışır.
+        Sadece oturum düşmüşse (SessionExpired) bir kez yeniden bağlanıp tekrar denenir; OBS'ye
+        ulaşılamıyorsa (zamanlayıcı zaten tekrar denedi) hata doğrudan 502 olarak döner.
+        """
+        from src.services.obs_pages import SessionExpired
+
+        with self._user_lock(username):
+            for attempt in range(2):
+                self.metrics.incr("upstream_fetches")
+                try:
+                    return fetch(self._client(username))
+                except SessionExpired:
+                    self.metrics.incr("upstream_errors")
+                    self._drop_client(username)
+                    if attempt: raise
+                except Exception:
+                    self.metrics.incr("upstream_errors")
+                    raise
+
+    def _lookup(self, kind: str, username: str, fetch: Callable[["OBSClient"], Dict]) -> Tuple[Dict, str]:
+        if username not in self.users():
+            raise KeyError(username)
+        payload, source = self.cache.get((kind, username), lambda: self._upstream(username, fetch))
+        self.metrics.incr({"hit": "hits", "miss": "misses", "coalesced": "coalesced"}[source])
+        return payload, source
+
+    def grades(self, username: str) -> Tuple[Dict, str]:
+        """Son dönemin notları: ({"user", "term_id", "fetched_at", "grades"}, kaynak)."""
+        def fetch(client) -> Dict:
+            grades = client.fetch_grades()
+            return {"user": username, "term_id": grades[0].term_id if grades else None,
+                    "fetched_at": time.time(), "grades": [g.to_dict() for g in grades]}
+        return self._lookup("grades", username, fetch)
+
+    def all_terms(self, username: str) -> Tuple[Dict, str]:
+        """Tüm dönemler: ({"user", "fetched_at", "terms": {term_id: notlar}}, kaynak)."""
+        def fetch(client) -> Dict:
+            terms = {term_id: [g.to_dict() for g in grades] for term_id, grades in client.fetch_all_terms()}
+            return {"user": username, "fetched_at": time.time(), "terms": dict(sorted(terms.items()))}
+        return self._lookup("terms", username, fetch)
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+class ProfileConnector:
+    """
+    AuthManager profilleri için varsayılan ClientFactory: keyring'deki oturum cookie'leriyle
+    bağlanır; geçersizse ve çözücü verildiyse captcha'yı ona çözdürüp şifreyle giriş yapar.
+    İnsan sorulamayacağı için ikisi de olmazsa CaptchaRequired fırlatılır.
+    """
+
+    def __init__(self, auth, pool=None, schools=None, solver=None):
+        from src.services.client_pool import OBSClientPool
+        from src.services.schools import SchoolRegistry
+        self.auth = auth
+        self.pool = pool or OBSClientPool()
+        self.schools = schools or SchoolRegistry.load(auth.app_dir)
+        self.solver = solver
+
+    def __call__(self, username: str) -> "OBSClient":
+        from src.services.captcha import try_solver
+        from src.services.stats_index import StatsUrlIndex
+
+        school = self.schools.get(self.auth.get_school(username))
+        client = self.pool.client(school, stats_index=StatsUrlIndex(self.auth.app_dir, username))
+        saved_session = self.auth.get_session(username)
+        if saved_session and client.restore_session(saved_session):
+            return client
+
+        password = self.auth.get_password(username) if self.solver else None
+        if password:
+            captcha = client.prepare_login()
+            code = try_solver(captcha, self.solver) if captcha else ""
+            if code is not None and client.submit_login(username, password, code):
+                self.auth.save_session(username, client.export_session())
+                return client
+
+        client.close()
+        raise CaptchaRequired(f"{username} için oturum geçersiz; bir kez 'python -m src.main' ile giriş yapın")
+
+def make_handler(service: GradeService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self) -> Tuple[str, int, object, Dict[str, str]]:
+            """(uç nokta adı, durum kodu, gövde, ek header'lar)"""
+            parts = [unquote(p) for p in urlparse(self.path).path.strip("/").split("/") if p]
+            if parts == ["health"]:
+                return "health", 200, {"status": "ok"}, {}
+            if parts == ["metrics"]:
+                # OBS'ye giden isteklerin host başına hız/eşzamanlılık durumu (bkz. scheduler.py)
+                return "metrics", 200, dict(service.metrics.snapshot(), scheduler=default_scheduler().snapshot()), {}
+            if parts == ["users"]:
+                return "users", 200, {"users": list(service.users())}, {}
+
+            if len(parts) == 3 and parts[0] == "users" and parts[2] in ("grades", "terms"):
+                route, username = parts[2], parts[1]
+                lookup = service.grades if route == "grades" else service.all_terms
+                try:
+                    payload, source = lookup(username)
+                except KeyError:
+                    return route, 404, {"error": f"Kayıtlı kullanıcı değil: {username}"}, {}
+                except CaptchaRequired as e:
+                    return route, 503, {"error": str(e), "status": "captcha_required"}, {}
+                except Exception as e:
+                    return route, 502, {"error": f"OBS hatası: {e}"}, {}
+                age = max(0, int(time.time() - payload["fetched_at"]))
+                return route, 200, payload, {"X-Cache": source, "Age": str(age)}
+
+            return "unknown", 404, {"error": "Bilinmeyen adres"}, {}
+
+        def do_GET(self):
+            start = time.perf_counter()
+            route, status, payload, headers = self._route()
+            if status >= 500: service.metrics.incr("errors")
+            self._send_json(status, payload, headers)
+            service.metrics.observe(route, (time.perf_counter() - start) * 1000)
+
+        def _read_only(self):
+            self._send_json(405, {"error": "Sadece GET desteklenir"}, {"Allow": "GET"})
+
+        do_POST = do_PUT = do_DELETE = do_PATCH = _read_only
+
+    return Handler
+
+class GradesAPIServer:
+    """GradeService'i yerel bir HTTP/JSON servisi olarak sunar. `with GradesAPIServer(...) as server:`"""
+
+    def __init__(self, service: GradeService, host: str = "127.0.0.1", port: int = 0):
+        self.service = service
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(service))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def origin(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def start(self):
+        """Arka plan thread'inde çalıştırır (testler / benchmark için)."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread: self.httpd.shutdown()
+        self.httpd.server_close()
+        self.service.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
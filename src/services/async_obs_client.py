@@ -0,0 +1,263 @@
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from src.models import CourseGrade
+from src.services.obs_pages import OBSPages, StatsFilter, _GradesPage
+from src.services.scheduler import RequestScheduler, default_scheduler, describe_failure, priority_for
+from src.services.schools import School
+from src.services.transport import TransportConfig
+
+try:
+    import httpx
+except ImportError:  # Opsiyonel bağımlılık: sadece AsyncOBSClient kullanılırsa gerekir
+    httpx = None
+
+# Captcha resminin byte'larını alıp kodu dönen coroutine
+AsyncCaptchaCallback = Callable[[bytes], Awaitable[str]]
+
+def _require_httpx():
+    if httpx is None:
+        raise ImportError("AsyncOBSClient için httpx gerekli: pip install httpx")
+
+def make_shared_transport(config: Optional[TransportConfig] = None,
+                          max_connections: Optional[int] = None) -> "httpx.AsyncHTTPTransport":
+    """
+    Birden çok AsyncOBSClient'ın paylaşacağı bağlantı havuzu.
+    Havuz (TCP/TLS bağlantıları) ortaktır, cookie jar'lar her client'ta ayrı kalır.
+    """
+    _require_httpx()
+    config = config or TransportConfig()
+    limits = httpx.Limits(
+        max_connections=max_connections or config.pool_maxsize,
+        max_keepalive_connections=config.pool_maxsize
+    )
+    # Tekrar denemeler RequestScheduler'da; transport kendisi tekrar denemez
+    return httpx.AsyncHTTPTransport(limits=limits, retries=0)
+
+class AsyncOBSClient(OBSPages):
+    """
+    OBSClient'ın asyncio sürümü: bir hesap = bir AsyncOBSClient (ayrı cookie jar).
+    Çok sayıda hesap aynı event loop'ta, thread açmadan ve istenirse tek bir bağlantı havuzunu
+    (make_shared_transport) paylaşarak çalıştırılabilir. Parse işlemleri OBSPages'ten gelir.
+    """
+    # Hesap başına aynı anda uçuşta olabilecek istek sayısı (OBSClient.DEFAULT_MAX_WORKERS karşılığı)
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, parser_backend: Optional[str] = None,
+                 profiler=None, stats_index=None, transport: Optional[TransportConfig] = None,
+                 shared_transport: Optional["httpx.AsyncHTTPTransport"] = None, school: Optional[School] = None,
+                 scheduler: Optional[RequestScheduler] = None):
+        _require_httpx()
+        super().__init__(parser_backend, profiler, school)
+        self.transport = transport or TransportConfig()
+        if self.transport.record_path or self.transport.replay_path:
+            raise ValueError("Kayıt/oynatma sadece OBSClient'ta destekleniyor")
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.stats_index = stats_index
+        # Paylaşılan havuz kapatılmaz; onu oluşturan (make_shared_transport çağıran) kapatır
+        self._owns_transport = shared_transport is None
+        headers = {
+            "User-Agent": self.transport.user_agent,
+            "Accept-Encoding": self.transport.accept_encoding(),
+            "Referer": self.LOGIN_URL,
+            "Origin": self.STATS_BASE_URL
+        }
+        headers.update(self.transport.extra_headers)
+        self.client = httpx.AsyncClient(
+            transport=shared_transport or make_shared_transport(self.transport),
+            timeout=httpx.Timeout(self.transport.read_timeout, connect=self.transport.connect_timeout),
+            headers=headers,
+            follow_redirects=True
+        )
+        self._slots: Optional[asyncio.Semaphore] = None
+        # OBSClient'larla aynı host zamanlayıcısı: hız/eşzamanlılık sınırı, öncelik ve tekrar denemeler ortak
+        self.scheduler = scheduler or default_scheduler()
+        self._prefetched_grades_page: Optional[bytes] = None
+        self._login_page: Optional[bytes] = None
+
+    async def _request(self, phase: str, method: str, url: str, idempotent: bool = False,
+                       **kwargs) -> "httpx.Response":
+        """
+        Tüm istekler buradan geçer: hesap başına eşzamanlılık sınırı, ardından OBSClient._request ile aynı
+        host zamanlayıcısı (öncelik, hız sınırı, tekrar denemeler) ve profil ölçümü.
+        """
+        if self._slots is None:
+            # Semaphore, kullanılacağı event loop içinde oluşturulur
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def send() -> "httpx.Response":
+            start = self.profiler.now_ms()
+            r = await self.client.request(method, url, **kwargs)
+            self.profiler.record_http(phase, method, url, start, r)
+            return r
+
+        async with self._slots:
+            return await self.scheduler.arequest(url, self.transport, send, priority_for(phase),
+                                                 idempotent=idempotent or method in ("GET", "HEAD"))
+
+    async def aclose(self):
+        if self._owns_transport:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    # --- GİRİŞ ---
+    async def prepare_login(self) -> Optional[bytes]:
+        """OBSClient.prepare_login karşılığı: login sayfası ve captcha byte'ları (yoksa None)."""
+        r_get = await self._request("login.page", "GET", self.LOGIN_URL)
+        soup = self._parse("parse.login", r_get.content, self.LOGIN_PAGE_IDS)
+        self._login_page = r_get.content
+
+        captcha_url = self._captcha_url(soup)
+        if not captcha_url: return None
+        r_captcha = await self._request("login.captcha", "GET", captcha_url)
+        return r_captcha.content if r_captcha.status_code == 200 and r_captcha.content else None
+
+    async def submit_login(self, username: str, password: str, captcha_code: str = "") -> bool:
+        if self._login_page is None:
+            raise Exception("Önce prepare_login çağrılmalı")
+        payload = self._login_payload(self._login_page, username, password, captcha_code)
+        self._login_page = None
+        r_post = await self._request("login.submit", "POST", self.LOGIN_URL, data=payload)
+        return "login.aspx" not in str(r_post.url)
+
+    async def login(self, username: str, password: str, captcha_callback: AsyncCaptchaCallback) -> bool:
+        """OBSClient.login ile aynı akış; callback resmin byte'larını alan bir coroutine'dir."""
+        captcha = await self.prepare_login()
+        captcha_code = await captcha_callback(captcha) if captcha else ""
+        return await self.submit_login(username, password, captcha_code)
+
+    def export_session(self) -> str:
+        """OBSClient.export_session ile aynı biçim; iki client'ın oturumları birbirine aktarılabilir."""
+        cookies = [{
+            "name": c.name,
+            "value": c.value,
+            "domain": c.domain,
+            "path": c.path,
+            "secure": c.secure,
+            "expires": c.expires
+        } for c in self.client.cookies.jar]
+        return json.dumps(cookies)
+
+    async def restore_session(self, session_data: str) -> bool:
+        try:
+            cookies = json.loads(session_data)
+        except ValueError:
+            return False
+
+        for c in cookies:
+            self.client.cookies.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+
+        self.client.headers["Referer"] = self.GRADES_URL
+        r = await self._request("session.probe", "GET", self.GRADES_URL, headers=self.FRESH_HEADERS)
+        if "login.aspx" in str(r.url):
+            self.client.cookies.clear()
+            return False
+
+        self._prefetched_grades_page = r.content
+        return True
+
+    # --- NOTLAR ---
+    async def fetch_grades(self, stats_filter: Optional[StatsFilter] = None) -> AsyncIterator[Tuple[int, CourseGrade]]:
+        """
+        OBSClient.iter_grades'in async karşılığı: önce her ders ortalamaları '?' olarak,
+        sonra her istatistik isteği bittikçe aynı indeksle ortalamalı hali gelir.
+        """
+        term_page = self._parse_grades_page(await self._get_grades_page(), stats_filter)
+        for idx in range(len(term_page.courses)):
+            yield idx, self._build_course(term_page, idx, self._empty_averages())
+
+        tasks = [asyncio.ensure_future(self._indexed_stats(term_page, idx))
+                 for idx, target in enumerate(term_page.targets) if target]
+        try:
+            for job in asyncio.as_completed(tasks):
+                idx, averages = await job
+                yield idx, self._build_course(term_page, idx, averages)
+        finally:
+            # Tüketici erken bırakırsa (aclose) uçuştaki istekler iptal edilir
+            for task in tasks: task.cancel()
+            if self.stats_index: self.stats_index.save()
+
+    async def fetch_all_terms(self, stats_filter: Optional[StatsFilter] = None) -> AsyncIterator[Tuple[str, List[CourseGrade]]]:
+        """Tüm dönemler; her dönem istatistikleri tamamlandığı anda (term_id, notlar) olarak gelir."""
+        first_page = self._parse_grades_page(await self._get_grades_page(), stats_filter)
+
+        async def complete(term_page: _GradesPage) -> Tuple[str, List[CourseGrade]]:
+            results = await asyncio.gather(*(self._indexed_stats(term_page, idx)
+                                             for idx, target in enumerate(term_page.targets) if target))
+            averages = [self._empty_averages() for _ in term_page.targets]
+            for idx, values in results:
+                averages[idx] = values
+            return term_page.term_id, self._build_grades(term_page, averages)
+
+        async def load_term(term: str) -> Tuple[str, List[CourseGrade]]:
+            page = await self._switch_term(term, first_page.hidden_inputs)
+            return await complete(self._parse_term_page(page, term, stats_filter))
+
+        tasks = [asyncio.ensure_future(complete(first_page))]
+        tasks += [asyncio.ensure_future(load_term(term)) for term in first_page.terms if term != first_page.term_id]
+        try:
+            for job in asyncio.as_completed(tasks):
+                yield await job
+        finally:
+            for task in tasks: task.cancel()
+            if self.stats_index: self.stats_index.save()
+
+    async def _get_grades_page(self) -> bytes:
+        self.client.headers["Referer"] = self.GRADES_URL
+        if self._prefetched_grades_page is not None:
+            page, self._prefetched_grades_page = self._prefetched_grades_page, None
+            return page
+        r = await self._request("grades.page", "GET", self.GRADES_URL, headers=self.FRESH_HEADERS)
+        self._check_grades_response(str(r.url))
+        return r.content
+
+    async def _switch_term(self, term_id: str, hidden_inputs: Dict[str, str]) -> bytes:
+        data = self._term_switch_data(term_id, hidden_inputs)
+        r = await self._request("grades.term_switch", "POST", self.GRADES_URL, data=data, idempotent=True)
+        self._check_term_response(term_id, r.status_code, str(r.url))
+        return r.content
+
+    # --- İSTATİSTİKLER ---
+    async def _indexed_stats(self, term_page: _GradesPage, idx: int) -> Tuple[int, Dict[str, str]]:
+        averages = await self._fetch_course_stats(term_page.targets[idx], term_page.term_id,
+                                                  term_page.hidden_inputs, term_page.courses[idx][0])
+        return idx, averages
+
+    async def _fetch_course_stats(self, target: str, donem: str, hidden_inputs: Dict[str, str],
+                                  course_code: str = "") -> Dict[str, str]:
+        """OBSClient._fetch_course_stats ile aynı akış (önce URL indeksi, sonra postback)."""
+        try:
+            if self.stats_index and course_code:
+                known_url = self.stats_index.get(course_code, donem)
+                if known_url:
+                    averages = await self._fetch_stats_page(known_url)
+                    if "error" not in averages: return averages
+                    self.stats_index.forget(course_code, donem)
+
+            r_post = await self._request("stats.postback", "POST", self.GRADES_URL,
+                                         data=self._stats_postback_data(target, donem, hidden_inputs),
+                                         headers=self.STATS_POSTBACK_HEADERS, idempotent=True)
+            if r_post.status_code != 200: return self._failed_averages(f"HTTP {r_post.status_code}")
+            full_url = self._resolve_stats_url(r_post.text)
+            if not full_url: return self._failed_averages("istatistik adresi bulunamadı")
+
+            averages = await self._fetch_stats_page(full_url)
+            if "error" not in averages and self.stats_index and course_code:
+                self.stats_index.learn(course_code, donem, full_url)
+            return averages
+
+        except Exception as e:
+            return self._failed_averages(describe_failure(e))
+
+    async def _fetch_stats_page(self, url: str) -> Dict[str, str]:
+        """İstatistik sayfasının ortalamaları; sayfa beklenen tabloyu içermiyorsa sebebiyle _failed_averages."""
+        r_stats = await self._request("stats.page", "GET", url)
+        if not self._is_stats_page(r_stats.status_code, str(r_stats.url), r_stats.text):
+            return self._failed_averages(self._stats_page_error(r_stats.status_code, str(r_stats.url)))
+        return self._parse_averages_from_html(r_stats.text)
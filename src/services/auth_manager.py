@@ -1,11 +1,18 @@
-import keyring
 import json
 import os
+from dataclasses import asdict
 from typing import List, Optional
-from src.models import UserProfile
+from src.models import DEFAULT_SCHOOL_ID, UserProfile
+
+def _keyring():
+    """keyring ve backend'i ilk gerçek kullanımda yüklenir; profil listesi için gerekmez."""
+    import keyring
+    return keyring
 
 class AuthManager:
     SERVICE_ID = "OBS_Grade_Puller_App"
+    # Oturum cookie'leri de keyring'de, kullanıcı adına bu ek getirilerek saklanır
+    SESSION_SUFFIX = ":session"
     
     # Dosya adı sabit, ama yolu dinamik olacak
     FILENAME = "profiles.json"
@@ -16,54 +23,102 @@ class AuthManager:
         else: # Linux/Mac
             base_path = os.path.join(os.path.expanduser("~"), ".local", "share")
 
-        # Klasör yolunu oluştur
+        # Klasör yolunu oluştur (klasörün kendisi ilk yazmada yaratılır, açılışı yavaşlatmasın)
         self.app_dir = os.path.join(base_path, "OBSGradePuller")
-        
-        # Klasör yoksa yarat (İlk çalışma)
-        if not os.path.exists(self.app_dir):
-            os.makedirs(self.app_dir)
-            
+
         # Tam dosya yolu
         self.profile_path = os.path.join(self.app_dir, self.FILENAME)
         # -----------------------
 
         self._profiles = self._load_profiles()
 
-    def _load_profiles(self) -> List[str]:
-        """Kayıtlı kullanıcı adlarını JSON'dan yükler."""
+    def _load_profiles(self) -> List[UserProfile]:
+        """Kayıtlı profilleri JSON'dan yükler."""
         if not os.path.exists(self.profile_path):
             return []
         try:
             with open(self.profile_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                entries = json.load(f)
         except:
             return []
 
+        profiles = []
+        for entry in entries:
+            # Eski format: sadece kullanıcı adı listesi (okul seçimi yokken, hepsi varsayılan okul)
+            if isinstance(entry, str):
+                profiles.append(UserProfile(username=entry))
+            elif isinstance(entry, dict) and entry.get("username"):
+                profiles.append(UserProfile(
+                    username=entry["username"],
+                    last_login=entry.get("last_login", ""),
+                    school=entry.get("school") or DEFAULT_SCHOOL_ID
+                ))
+        return profiles
+
     def _save_profiles(self):
-        """Kullanıcı listesini JSON'a yazar."""
+        """Profil listesini JSON'a yazar (eski formattaki dosya ilk kayıtta yeni formata geçer)."""
+        os.makedirs(self.app_dir, exist_ok=True) # İlk çalışma
         with open(self.profile_path, "w", encoding="utf-8") as f:
-            json.dump(self._profiles, f)
+            json.dump([asdict(p) for p in self._profiles], f, ensure_ascii=False)
+
+    def _find(self, username: str) -> Optional[UserProfile]:
+        for profile in self._profiles:
+            if profile.username == username: return profile
+        return None
 
-    def save_user(self, username: str, password: str):
-        """Kullanıcıyı listeye ekler, şifreyi Keyring'e kilitler."""
-        keyring.set_password(self.SERVICE_ID, username, password)
+    def save_user(self, username: str, password: str, school: str = DEFAULT_SCHOOL_ID):
+        """Kullanıcıyı (okuluyla birlikte) listeye ekler, şifreyi Keyring'e kilitler."""
+        _keyring().set_password(self.SERVICE_ID, username, password)
         
-        if username not in self._profiles:
-            self._profiles.append(username)
+        profile = self._find(username)
+        if profile is None:
+            self._profiles.append(UserProfile(username=username, school=school))
             self._save_profiles()
+        elif profile.school != school:
+            profile.school = school
+            self._save_profiles()
+
+    def get_school(self, username: str) -> str:
+        """Profilin okul id'si; kayıtlı değilse varsayılan okul."""
+        profile = self._find(username)
+        return profile.school if profile else DEFAULT_SCHOOL_ID
 
     def get_password(self, username: str) -> Optional[str]:
-        return keyring.get_password(self.SERVICE_ID, username)
+        return _keyring().get_password(self.SERVICE_ID, username)
+
+    def save_session(self, username: str, session_data: str):
+        """OBS oturum cookie'lerini (JSON) keyring'e kaydeder."""
+        try:
+            _keyring().set_password(self.SERVICE_ID, username + self.SESSION_SUFFIX, session_data)
+        except:
+            pass # Kaydedilemezse bir sonraki girişte captcha sorulur, o kadar
+
+    def get_session(self, username: str) -> Optional[str]:
+        try:
+            return _keyring().get_password(self.SERVICE_ID, username + self.SESSION_SUFFIX)
+        except:
+            return None
+
+    def clear_session(self, username: str):
+        try:
+            _keyring().delete_password(self.SERVICE_ID, username + self.SESSION_SUFFIX)
+        except:
+            pass
 
     def get_registered_users(self) -> List[str]:
-        return self._profiles
+        return [p.username for p in self._profiles]
+
+    def get_profiles(self) -> List[UserProfile]:
+        return list(self._profiles)
 
     def delete_user(self, username: str):
         try:
-            keyring.delete_password(self.SERVICE_ID, username)
+            _keyring().delete_password(self.SERVICE_ID, username)
         except:
             pass
+        self.clear_session(username)
 
-        if username in self._profiles:
-            self._profiles.remove(username)
+        profile = self._find(username)
+        if profile is not None:
+            self._profiles.remove(profile)
             self._save_profiles()
\ No newline at end of file
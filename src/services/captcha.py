@@ -0,0 +1,48 @@
+import importlib
+import os
+from typing import Callable, Optional
+
+# Captcha resminin byte'larını alıp kodu (bilinmiyorsa None) dönen fonksiyon, ör. yerel bir OCR eklentisi
+CaptchaSolver = Callable[[bytes], Optional[str]]
+
+# "paket.modul:fonksiyon" biçiminde çözücü; --captcha-solver verilmezse buradan okunur
+SOLVER_ENV = "OBS_CAPTCHA_SOLVER"
+
+class SolverError(Exception):
+    """Çözücü tanımı hatalı veya modülü yüklenemedi."""
+
+def load_solver(spec: Optional[str] = None) -> Optional[CaptchaSolver]:
+    """Çözücüyü "modul:fonksiyon" tanımından yükler; tanım yoksa None, yüklenemezse SolverError."""
+    spec = spec or os.getenv(SOLVER_ENV)
+    if not spec: return None
+
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise SolverError(f"Captcha çözücü 'modul:fonksiyon' biçiminde olmalı: {spec}")
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise SolverError(f"Captcha çözücü modülü yüklenemedi: {spec} ({e})") from e
+    solver = getattr(module, attr, None)
+    if not callable(solver):
+        raise SolverError(f"Captcha çözücü bulunamadı: {spec}")
+    return solver
+
+def try_solver(image: bytes, solver: Optional[CaptchaSolver]) -> Optional[str]:
+    """Çözücünün cevabı; çözücü yoksa, boş dönerse veya hata verirse None."""
+    if not solver: return None
+    try:
+        code = solver(image)
+    except Exception:
+        return None # Çözücü hatası girişi engellemesin, insan sorusuna düşülür
+    return code.strip() if code else None
+
+def solve(image: bytes, solver: Optional[CaptchaSolver], ask: Callable[[bytes], str]) -> str:
+    """Önce çözücü denenir; sonuç vermezse kullanıcıya sorulur."""
+    return try_solver(image, solver) or ask(image)
+
+def image_format(image: bytes) -> str:
+    """Dosyaya yazmak gerekirse uzantı için: png, gif veya jpg."""
+    if image.startswith(b"\x89PNG"): return "png"
+    if image.startswith(b"GIF8"): return "gif"
+    return "jpg"
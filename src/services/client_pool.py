@@ -0,0 +1,59 @@
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from requests.adapters import BaseAdapter
+from src.services.obs_client import OBSClient
+from src.services.schools import School
+from src.services.transport import TransportConfig, build_adapter
+
+class OBSClientPool:
+    """
+    Çok hesaplı çalıştırmalar için OBSClient fabrikası.
+    Aynı okuldaki (aynı host'taki) hesaplar tek bir bağlantı havuzunu (adapter) paylaşır;
+    her hesabın OBSClient'ı ve cookie jar'ı yine ayrıdır. Böylece 50 hesap 50 ayrı TLS
+    bağlantı seti açmaz, host başına en fazla max_connections bağlantı tutulur.
+    """
+
+    def __init__(self, transport: Optional[TransportConfig] = None,
+                 max_workers: int = OBSClient.DEFAULT_MAX_WORKERS, max_connections: Optional[int] = None):
+        self.transport = transport or TransportConfig()
+        self.max_workers = max(1, max_workers)
+        # Host başına havuz boyutu; verilmezse tek bir hesabın istatistik worker'ları kadar
+        self.max_connections = max_connections or self.max_workers
+        self._adapters: Dict[str, BaseAdapter] = {}
+        self._lock = threading.Lock()
+
+    def _pool_key(self, school: School) -> str:
+        # Kayıt/oynatmada tek arşiv dosyası var; tüm host'lar aynı adapter'dan geçer
+        if self.transport.record_path or self.transport.replay_path: return ""
+        return urlsplit(school.host).netloc
+
+    def adapter_for(self, school: School) -> BaseAdapter:
+        key = self._pool_key(school)
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                adapter = build_adapter(self.transport, min_pool_size=self.max_connections)
+                self._adapters[key] = adapter
+            return adapter
+
+    def client(self, school: School, **kwargs) -> OBSClient:
+        """Okulun host'unun ortak havuzunu kullanan yeni bir OBSClient (yeni oturum)."""
+        kwargs.setdefault("max_workers", self.max_workers)
+        return OBSClient(transport=self.transport, school=school, adapter=self.adapter_for(school), **kwargs)
+
+    def hosts(self) -> List[str]:
+        with self._lock:
+            return list(self._adapters)
+
+    def close(self):
+        with self._lock:
+            adapters, self._adapters = list(self._adapters.values()), {}
+        for adapter in adapters:
+            adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,100 @@
+import csv
+import json
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, TextIO
+from src.models import CourseGrade
+
+EXPORT_FORMATS = ("json", "csv", "ndjson")
+
+# Düz kayıt sütunları; sınav alanları sayıya çevrilmiş haldedir (girilmemiş / çekilmemişse boş)
+EXAMS = ("midterm", "final", "makeup")
+COLUMNS = ["username", "term_id", "code", "name", "letter_grade"] + [
+    f"{exam}_{kind}" for exam in EXAMS for kind in ("score", "avg")
+]
+
+def grade_record(grade: CourseGrade, username: Optional[str] = None) -> Dict:
+    """Bir dersi Rich'e hiç uğramadan tek seviyeli bir sözlüğe çevirir."""
+    record = {
+        "username": username,
+        "term_id": grade.term_id,
+        "code": grade.code,
+        "name": grade.name,
+        "letter_grade": grade.letter_grade
+    }
+    for exam in EXAMS:
+        stats = getattr(grade, exam)
+        record[f"{exam}_score"] = stats.score_value
+        record[f"{exam}_avg"] = stats.avg_value
+    return record
+
+class GradeExporter(ABC):
+    """
+    Notları geldikçe akışa yazar; hiçbir şey bellekte biriktirilmez.
+    Toplu çalıştırmada birden çok thread aynı exporter'a yazabilir, kayıtlar karışmaz.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, grades: Iterable[CourseGrade], username: Optional[str] = None):
+        with self._lock:
+            for g in grades:
+                self._write_record(grade_record(g, username))
+            self.stream.flush()
+
+    @abstractmethod
+    def _write_record(self, record: Dict):
+        """Tek kaydı formata göre yazar (kilit çağıran tarafından tutulur)."""
+
+    def close(self):
+        with self._lock:
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class NdjsonExporter(GradeExporter):
+    """Her ders bir satır JSON."""
+
+    def _write_record(self, record: Dict):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+class JsonExporter(GradeExporter):
+    """Tek bir JSON dizisi; elemanlar yazıldıkça eklenir, kapanış close()'da yazılır."""
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self._count = 0
+
+    def _write_record(self, record: Dict):
+        self.stream.write(("[\n  " if self._count == 0 else ",\n  ") + json.dumps(record, ensure_ascii=False))
+        self._count += 1
+
+    def close(self):
+        with self._lock:
+            self.stream.write("[]\n" if self._count == 0 else "\n]\n")
+            self.stream.flush()
+
+class CsvExporter(GradeExporter):
+    """Başlık satırı bir kez, sonra her ders bir satır (ondalık ayracı nokta)."""
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self._writer = csv.DictWriter(stream, fieldnames=COLUMNS, lineterminator="\n")
+        self._writer.writeheader()
+
+    def _write_record(self, record: Dict):
+        self._writer.writerow(record)
+
+def make_exporter(fmt: str, stream: Optional[TextIO] = None) -> GradeExporter:
+    """--format değerine göre exporter döner (stream verilmezse stdout)."""
+    exporters = {"json": JsonExporter, "csv": CsvExporter, "ndjson": NdjsonExporter}
+    if fmt not in exporters:
+        raise ValueError(f"Bilinmeyen format: {fmt}")
+    return exporters[fmt](stream or sys.stdout)
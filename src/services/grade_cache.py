@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from src.models import CourseGrade, ExamStats
+
+class GradeCache:
+    """
+    Ders notlarını ve sınıf ortalamalarını diskte (profiles.json'un yanında) saklar.
+    Kayıtlar kullanıcı + dönem bazında tutulur, her veri tipinin kendi TTL'i vardır.
+    """
+    FILENAME = "grade_cache.json"
+
+    # --- TTL SABİTLERİ (saniye) ---
+    GRADES_TTL = 5 * 60          # Kendi notlarımız sınav döneminde sık değişir
+    AVERAGES_TTL = 6 * 60 * 60   # Sınıf ortalamaları nadiren değişir
+
+    EXAMS = ("Vize", "Final", "Büt")
+
+    def __init__(self, app_dir: str, grades_ttl: int = GRADES_TTL, averages_ttl: int = AVERAGES_TTL):
+        self.path = os.path.join(app_dir, self.FILENAME)
+        self.grades_ttl = grades_ttl
+        self.averages_ttl = averages_ttl
+        # fetch_grades istatistikleri paralel çektiği için okuma/yazma kilitli
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except:
+            return {}
+
+    def _save(self):
+        """Yarım yazılmış dosya kalmasın diye önce geçici dosyaya yazar."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _term_entry(self, username: str, term_id: Optional[str]) -> Optional[Dict]:
+        user = self._data.get(username)
+        if not user: return None
+        term_id = term_id or user.get("last_term")
+        return user.get("terms", {}).get(term_id)
+
+    def last_term(self, username: str) -> Optional[str]:
+        """Kullanıcı için en son çekilen dönem."""
+        return self._data.get(username, {}).get("last_term")
+
+    def terms(self, username: str) -> List[str]:
+        """Kullanıcının önbellekte kaydı olan tüm dönemleri (eskiden yeniye)."""
+        with self._lock:
+            return sorted(self._data.get(username, {}).get("terms", {}))
+
+    def get_grades(self, username: str, term_id: Optional[str] = None) -> Optional[List[CourseGrade]]:
+        """Önbellekteki notları (ortalamalarla birlikte) modele döker. Kayıt yoksa None."""
+        with self._lock:
+            entry = self._term_entry(username, term_id)
+            if not entry: return None
+
+            grades = []
+            for c in entry["courses"]:
+                avgs = entry["averages"].get(c["code"], {}).get("values", {})
+                stats = [ExamStats(c["scores"][e], avgs.get(e, "?")) for e in self.EXAMS]
+                grades.append(CourseGrade(
+                    code=c["code"],
+                    name=c["name"],
+                    midterm=stats[0],
+                    final=stats[1],
+                    makeup=stats[2],
+                    letter_grade=c["letter_grade"],
+                    term_id=c["term_id"]
+                ))
+            return grades
+
+    def is_grades_stale(self, username: str, term_id: Optional[str] = None) -> bool:
+        with self._lock:
+            entry = self._term_entry(username, term_id)
+            return not entry or time.time() - entry["fetched_at"] > self.grades_ttl
+
+    def is_average_stale(self, username: str, term_id: str, course_code: str) -> bool:
+        """fetch_grades'in stats_filter'ı olarak kullanılır: True ise ortalama yeniden çekilir."""
+        with self._lock:
+            entry = self._term_entry(username, term_id)
+            if not entry: return True
+            avg = entry["averages"].get(course_code)
+            return not avg or time.time() - avg["fetched_at"] > self.averages_ttl
+
+    def is_stale(self, username: str, term_id: Optional[str] = None) -> bool:
+        """Notlardan veya ortalamalardan herhangi biri eskidiyse True."""
+        if self.is_grades_stale(username, term_id):
+            return True
+        term_id = term_id or self.last_term(username)
+        grades = self.get_grades(username, term_id) or []
+        return any(self.is_average_stale(username, term_id, g.code) for g in grades)
+
+    def store(self, username: str, grades: List[CourseGrade]) -> List[CourseGrade]:
+        """
+        Yeni çekilen notları kaydeder ve ortalamaları önbellekle birleştirilmiş listeyi döner.
+        Ortalaması çekilmeyen ('?') dersler için önbellekteki ortalama kullanılır.
+        Çekilip henüz yayınlanmamış ('?', hatasız) ortalamalar da zamanıyla kaydedilir, yani TTL boyunca
+        tekrar sorulmaz; sadece çekilemeyenler (ExamStats.error) kaydedilmez ve sonraki çalışmada denenir.
+        """
+        if not grades: return grades
+        now = time.time()
+        term_id = grades[0].term_id
+        merged = []
+
+        with self._lock:
+            user = self._data.setdefault(username, {"terms": {}})
+            # Toplu dönem çekiminde dönemler karışık sırada gelir; en yeni dönem "son dönem" sayılır
+            user["last_term"] = max(term_id, user.get("last_term") or "")
+            old_entry = user["terms"].get(term_id, {})
+            averages = old_entry.get("averages", {})
+
+            courses = []
+            for g in grades:
+                exams = (g.midterm, g.final, g.makeup)
+                fetched = {e: s.class_avg for e, s in zip(self.EXAMS, exams)}
+
+                cached = averages.get(g.code)
+                if g.stats_error:
+                    pass # İstek başarısız oldu; kayıt yok sayılır, bir sonraki çalışmada yeniden denenir
+                elif any(v != "?" for v in fetched.values()):
+                    averages[g.code] = {"fetched_at": now, "values": fetched}
+                elif not cached or now - cached["fetched_at"] > self.averages_ttl:
+                    # Çekildi ama OBS henüz ortalama yayınlamamış; bu da bir sonuç, TTL boyunca tekrar sorulmaz.
+                    # (Taze kayıt varsa '?' stats_filter'ın çekmediği anlamına gelir, kayda dokunulmaz)
+                    averages[g.code] = {"fetched_at": now, "values": cached["values"] if cached else fetched}
+
+                cached = averages.get(g.code)
+                if all(v == "?" for v in fetched.values()) and cached and any(v != "?" for v in cached["values"].values()):
+                    values = cached["values"]
+                    g = CourseGrade(
+                        code=g.code,
+                        name=g.name,
+                        midterm=ExamStats(g.midterm.score, values.get("Vize", "?")),
+                        final=ExamStats(g.final.score, values.get("Final", "?")),
+                        makeup=ExamStats(g.makeup.score, values.get("Büt", "?")),
+                        letter_grade=g.letter_grade,
+                        term_id=g.term_id
+                    )
+
+                courses.append({
+                    "code": g.code,
+                    "name": g.name,
+                    "letter_grade": g.letter_grade,
+                    "term_id": g.term_id,
+                    "scores": {e: s.score for e, s in zip(self.EXAMS, exams)}
+                })
+                merged.append(g)
+
+            user["terms"][term_id] = {"fetched_at": now, "courses": courses, "averages": averages}
+            self._save()
+
+        return merged
+
+    def forget(self, username: str):
+        """Kullanıcı silinince önbelleğini de temizler."""
+        with self._lock:
+            if self._data.pop(username, None) is not None:
+                self._save()
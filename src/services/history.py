@@ -0,0 +1,227 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from src.models import CourseGrade, ExamStats, GradeSnapshot
+
+# Sınav -> sütun öneki (CourseGrade alan adları)
+EXAM_COLUMNS = {"Vize": "midterm", "Final": "final", "Büt": "makeup"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    term_id TEXT NOT NULL,
+    course_code TEXT NOT NULL,
+    course_name TEXT NOT NULL,
+    letter_grade TEXT NOT NULL,
+    midterm_score TEXT NOT NULL,
+    midterm_avg TEXT NOT NULL,
+    final_score TEXT NOT NULL,
+    final_avg TEXT NOT NULL,
+    makeup_score TEXT NOT NULL,
+    makeup_avg TEXT NOT NULL,
+    -- Sayı olmayan değerler ("-", "?") NULL; zaman serisi sorguları metin parse etmez
+    midterm_score_value REAL,
+    midterm_avg_value REAL,
+    final_score_value REAL,
+    final_avg_value REAL,
+    makeup_score_value REAL,
+    makeup_avg_value REAL,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_term ON snapshots (username, term_id, course_code, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_course ON snapshots (username, course_code, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots (username, fetched_at);
+
+-- Her dersin son kaydı: yeni çekim değişmemişse snapshots'a hiç dokunulmaz
+CREATE TABLE IF NOT EXISTS latest (
+    username TEXT NOT NULL,
+    term_id TEXT NOT NULL,
+    course_code TEXT NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    PRIMARY KEY (username, term_id, course_code)
+) WITHOUT ROWID;
+"""
+
+_SNAPSHOT_COLUMNS = ("username", "term_id", "course_code", "course_name", "letter_grade",
+                     "midterm_score", "midterm_avg", "final_score", "final_avg", "makeup_score", "makeup_avg")
+
+class HistoryPage(NamedTuple):
+    rows: List[GradeSnapshot]
+    has_more: bool
+
+def _content_hash(g: CourseGrade) -> str:
+    exams = (g.midterm, g.final, g.makeup)
+    content = "\x1f".join([g.name, g.letter_grade] + [v for e in exams for v in (e.score, e.class_avg)])
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+class GradeHistory:
+    """
+    Çekilen notların SQLite'taki (profiles.json'un yanında) salt-eklemeli geçmişi.
+    Her ders için yalnızca içeriği değişen çekimler yeni satır olur; değişmeyen bir kontrol
+    sadece bellekteki özetle karşılaştırılır, veritabanına yazılmaz.
+    """
+    FILENAME = "grade_history.sqlite3"
+
+    def __init__(self, app_dir: str):
+        self.path = os.path.join(app_dir, self.FILENAME)
+        os.makedirs(app_dir, exist_ok=True)
+        # Toplu çalıştırmada birden çok thread aynı bağlantıyı kullanır; erişim kilitli
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # username -> {(term_id, code): (content_hash, son ortalamalar)}; kullanıcı başına ilk kayıtta yüklenir
+        self._latest: Dict[str, Dict[Tuple[str, str], Tuple[str, Tuple[str, str, str]]]] = {}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- YAZMA ---
+    def _latest_for(self, username: str) -> Dict[Tuple[str, str], Tuple[str, Tuple[str, str, str]]]:
+        latest = self._latest.get(username)
+        if latest is None:
+            rows = self._conn.execute(
+                "SELECT l.term_id, l.course_code, l.content_hash, s.midterm_avg, s.final_avg, s.makeup_avg "
+                "FROM latest l JOIN snapshots s ON s.id = l.snapshot_id WHERE l.username = ?", (username,))
+            latest = {(t, c): (h, (m, f, b)) for t, c, h, m, f, b in rows}
+            self._latest[username] = latest
+        return latest
+
+    @staticmethod
+    def _carry_averages(grade: CourseGrade, previous: Tuple[str, str, str]) -> CourseGrade:
+        """Bu çekimde ortalaması gelmeyen ('?') sınavlar için son bilinen ortalama kullanılır."""
+        exams = (grade.midterm, grade.final, grade.makeup)
+        if all(e.class_avg != "?" for e in exams): return grade
+        stats = [ExamStats(e.score, old if e.class_avg == "?" else e.class_avg) for e, old in zip(exams, previous)]
+        return CourseGrade(grade.code, grade.name, stats[0], stats[1], stats[2], grade.letter_grade, grade.term_id)
+
+    def record(self, username: str, grades: List[CourseGrade], fetched_at: Optional[float] = None) -> int:
+        """Notları geçmişe ekler; değişen (veya yeni) ders sayısını döner."""
+        if not grades: return 0
+        now = fetched_at or time.time()
+
+        with self._lock:
+            latest = self._latest_for(username)
+            changed = []
+            for g in grades:
+                known = latest.get((g.term_id, g.code))
+                # Başarısız istatistik isteği ('?') tek başına yeni kayıt sebebi değildir
+                if known: g = self._carry_averages(g, known[1])
+                content_hash = _content_hash(g)
+                if known and known[0] == content_hash: continue
+                changed.append((g, content_hash))
+
+            if not changed: return 0
+            with self._conn:
+                for g, content_hash in changed:
+                    exams = (g.midterm, g.final, g.makeup)
+                    values = [username, g.term_id, g.code, g.name, g.letter_grade]
+                    values += [v for e in exams for v in (e.score, e.class_avg)]
+                    values += [v for e in exams for v in (e.score_value, e.avg_value)]
+                    cur = self._conn.execute(
+                        f"INSERT INTO snapshots ({', '.join(_SNAPSHOT_COLUMNS)}, "
+                        "midterm_score_value, midterm_avg_value, final_score_value, final_avg_value, "
+                        "makeup_score_value, makeup_avg_value, content_hash, fetched_at) "
+                        f"VALUES ({', '.join('?' * (len(_SNAPSHOT_COLUMNS) + 8))})",
+                        values + [content_hash, now])
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO latest (username, term_id, course_code, snapshot_id, content_hash) "
+                        "VALUES (?, ?, ?, ?, ?)", (username, g.term_id, g.code, cur.lastrowid, content_hash))
+                    latest[(g.term_id, g.code)] = (content_hash, tuple(e.class_avg for e in exams))
+            return len(changed)
+
+    def forget(self, username: str):
+        """Kullanıcı silinince geçmişi de silinir."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM snapshots WHERE username = ?", (username,))
+            self._conn.execute("DELETE FROM latest WHERE username = ?", (username,))
+            self._latest.pop(username, None)
+
+    # --- SORGULAR ---
+    @staticmethod
+    def _filters(username: str, term_id: Optional[str], course_code: Optional[str]) -> Tuple[str, List]:
+        where, params = ["username = ?"], [username]
+        if term_id:
+            where.append("term_id = ?")
+            params.append(term_id)
+        if course_code:
+            where.append("course_code = ?")
+            params.append(course_code)
+        return " AND ".join(where), params
+
+    @staticmethod
+    def _to_snapshot(row) -> GradeSnapshot:
+        (username, term_id, code, name, letter, m_s, m_a, f_s, f_a, b_s, b_a, fetched_at) = row
+        grade = CourseGrade(code, name, ExamStats(m_s, m_a), ExamStats(f_s, f_a), ExamStats(b_s, b_a), letter, term_id)
+        return GradeSnapshot(grade=grade, fetched_at=fetched_at, username=username)
+
+    def count(self, username: str, term_id: Optional[str] = None, course_code: Optional[str] = None) -> int:
+        where, params = self._filters(username, term_id, course_code)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM snapshots WHERE {where}", params).fetchone()[0]
+
+    def iter_pages(self, username: str, term_id: Optional[str] = None, course_code: Optional[str] = None,
+                   page_size: int = 20) -> Iterator[HistoryPage]:
+        """
+        Kayıtları yeniden eskiye sayfa sayfa döner. Her sayfa ancak istendiğinde sorgulanır
+        (OFFSET yerine son görülen (fetched_at, id) üzerinden devam edilir, sayfa ne kadar
+        ilerde olursa olsun sorgu maliyeti aynıdır).
+        """
+        where, params = self._filters(username, term_id, course_code)
+        columns = ", ".join(_SNAPSHOT_COLUMNS) + ", fetched_at, id"
+        cursor: Optional[Tuple[float, int]] = None
+        while True:
+            clause, args = where, list(params)
+            if cursor:
+                clause += " AND (fetched_at < ? OR (fetched_at = ? AND id < ?))"
+                args += [cursor[0], cursor[0], cursor[1]]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {columns} FROM snapshots WHERE {clause} ORDER BY fetched_at DESC, id DESC LIMIT ?",
+                    args + [page_size + 1]).fetchall()
+            if not rows: return
+
+            has_more = len(rows) > page_size
+            rows = rows[:page_size]
+            yield HistoryPage([self._to_snapshot(r[:-1]) for r in rows], has_more)
+            if not has_more: return
+            cursor = (rows[-1][-2], rows[-1][-1])
+
+    def first_seen(self, username: str, course_code: str, exam: str = "Final", field: str = "avg",
+                   term_id: Optional[str] = None) -> Optional[Tuple[float, str]]:
+        """
+        Sınavın notu/ortalaması ('score' / 'avg') ilk ne zaman sayı olarak göründü: (zaman, değer).
+        Ör. first_seen(user, "BİLM201", "Final") -> BİLM201 Final ortalamasının açıklandığı an.
+        """
+        column = f"{EXAM_COLUMNS[exam]}_{field}"
+        where, params = self._filters(username, term_id, course_code)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT fetched_at, {column} FROM snapshots WHERE {where} AND {column}_value IS NOT NULL "
+                "ORDER BY fetched_at LIMIT 1", params).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def series(self, username: str, course_code: str, exam: str = "Final", field: str = "avg",
+               term_id: Optional[str] = None) -> List[Tuple[float, float]]:
+        """Sınavın notu/ortalaması zaman içinde nasıl değişti: değerin değiştiği anlar, eskiden yeniye."""
+        column = f"{EXAM_COLUMNS[exam]}_{field}_value"
+        where, params = self._filters(username, term_id, course_code)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT fetched_at, {column} FROM snapshots WHERE {where} AND {column} IS NOT NULL "
+                "ORDER BY fetched_at", params).fetchall()
+
+        points: List[Tuple[float, float]] = []
+        for fetched_at, value in rows:
+            # Başka alanların değişimi de satır üretir; seride sadece bu değerin değiştiği anlar kalır
+            if not points or points[-1][1] != value:
+                points.append((fetched_at, value))
+        return points
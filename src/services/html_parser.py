@@ -0,0 +1,46 @@
+import re
+import importlib.util
+from html import unescape
+from typing import Dict, Iterable, Optional, Union
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml kuruluysa onu kullan (html.parser'dan hızlı), yoksa standart kütüphaneye düş.
+# Sadece kurulu mu diye bakılır; asıl import'u ilk parse sırasında bs4 yapar.
+DEFAULT_BACKEND = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# <input ...> etiketleri ve içlerindeki attribute'lar (tırnaklı veya tırnaksız)
+_INPUT_RE = re.compile(r"<input\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+Markup = Union[str, bytes]
+
+class PageParser:
+    """
+    OBS sayfaları için HTML parse katmanı.
+    ASP.NET sayfalarının büyük kısmı ViewState ve layout tablolarıdır; bize sadece birkaç
+    id'li eleman lazım olduğu için ağaca yalnızca onlar (ve alt ağaçları) alınır.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend or DEFAULT_BACKEND
+
+    def parse(self, markup: Markup, only_ids: Iterable[str] = ()) -> BeautifulSoup:
+        """Sayfayı parse eder. only_ids verilirse sadece bu id'lere sahip elemanlar ağaca girer."""
+        ids = list(only_ids)
+        strainer = SoupStrainer(id=ids) if ids else None
+        return BeautifulSoup(markup, self.backend, parse_only=strainer)
+
+    def hidden_inputs(self, markup: Markup) -> Dict[str, str]:
+        """Gizli inputları (__VIEWSTATE vb.) ağaç kurmadan, doğrudan ham HTML üzerinden toplar."""
+        if isinstance(markup, bytes):
+            markup = markup.decode("utf-8", errors="replace")
+
+        data = {}
+        for tag in _INPUT_RE.finditer(markup):
+            attrs = {}
+            for m in _ATTR_RE.finditer(tag.group(0)):
+                name, double_q, single_q, bare = m.groups()
+                attrs[name.lower()] = next((v for v in (double_q, single_q, bare) if v is not None), "")
+            if attrs.get("type", "").lower() == "hidden" and attrs.get("name"):
+                data[unescape(attrs["name"])] = unescape(attrs.get("value", ""))
+        return data
@@ -1,226 +1,290 @@
 import requests
+from requests.adapters import BaseAdapter
 from bs4 import BeautifulSoup
-import re
-import os
-import shutil
-from typing import List, Callable, Dict, Optional
-from src.models import CourseGrade, ExamStats
-
-class OBSClient:
-    # --- URL SABİTLERİ ---
-    BASE_URL = "https://obs.ozal.edu.tr/oibs/std/"
-    LOGIN_URL = "https://obs.ozal.edu.tr/oibs/std/login.aspx"
-    GRADES_URL = "https://obs.ozal.edu.tr/oibs/std/not_listesi_op.aspx"
-    STATS_BASE_URL = "https://obs.ozal.edu.tr" # İstatistikler genelde /oibs/acd/ altında çıkıyor
-
-    def __init__(self):
-        self.session = requests.Session()
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from typing import List, Callable, Dict, Iterator, Optional, Tuple
+from src.models import CourseGrade
+from src.services.obs_pages import OBSPages, StatsFilter, _GradesPage
+from src.services.scheduler import RequestScheduler, default_scheduler, describe_failure, priority_for
+from src.services.schools import School
+from src.services.transport import TransportConfig, build_session
+
+class OBSClient(OBSPages):
+    # Aynı anda en fazla kaç dersin istatistiği çekilecek (OBS'yi boğmamak için sınırlı)
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, parser_backend: Optional[str] = None,
+                 profiler=None, stats_index=None, transport: Optional[TransportConfig] = None,
+                 school: Optional[School] = None, adapter: Optional[BaseAdapter] = None,
+                 scheduler: Optional[RequestScheduler] = None):
+        super().__init__(parser_backend, profiler, school)
+        self.max_workers = max(1, max_workers)
+        # (ders, dönem) -> istatistik URL'i (StatsUrlIndex); varsa postback adımı atlanır
+        self.stats_index = stats_index
+        # Bağlantı havuzu, zaman aşımı, tekrar deneme ve sıkıştırma ayarları (bkz. transport.py)
+        self.transport = transport or TransportConfig()
+        # adapter verilirse bağlantı havuzu başka client'larla paylaşılır (OBSClientPool); kapatmak onun işi
+        self._owns_adapter = adapter is None
+        self.session = build_session(self.transport, min_pool_size=self.max_workers, adapter=adapter)
+        # Host başına hız/eşzamanlılık sınırı ve tekrar denemeler; verilmezse process genelinde ortak olan
+        self.scheduler = scheduler or default_scheduler()
         self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Referer": self.LOGIN_URL,
-            "Origin": "https://obs.ozal.edu.tr",
-            "Cache-Control": "no-cache"
+            "Origin": self.STATS_BASE_URL
         })
+        # restore_session'daki geçerlilik kontrolünde inen not sayfası (fetch_grades tekrar indirmesin)
+        self._prefetched_grades_page: Optional[bytes] = None
+        # prepare_login'in indirdiği login sayfası (submit_login form alanlarını buradan alır)
+        self._login_page: Optional[bytes] = None
 
-    def _get_hidden_inputs(self, soup: BeautifulSoup) -> Dict[str, str]:
-        """Sayfadaki gizli inputları toplar (__VIEWSTATE vb.)."""
-        data = {}
-        for inp in soup.find_all("input", type="hidden"):
-            if inp.get("name"):
-                data[inp.get("name")] = inp.get("value", "")
-        return data
-
-    def _download_captcha(self, soup: BeautifulSoup) -> Optional[str]:
-        """Captcha resmini indirir ve dosya yolunu döner."""
-        img_tag = soup.find(id="imgCaptchaImg")
-        if not img_tag: return None
-        
-        src = img_tag.get("src")
-        # URL'yi düzelt
-        if not src.startswith("http"):
-            url = self.BASE_URL + src.lstrip("/") if src.startswith("/") else self.BASE_URL + src
-        else:
-            url = src
-
-        r = self.session.get(url, stream=True)
-        if r.status_code == 200:
-            path = "temp_captcha.png"
-            with open(path, "wb") as f:
-                r.raw.decode_content = True
-                shutil.copyfileobj(r.raw, f)
-            return path
-        return None
-
-    def login(self, username: str, password: str, captcha_callback: Callable[[str], str]) -> bool:
+    def _request(self, phase: str, method: str, url: str, idempotent: bool = False, **kwargs) -> requests.Response:
         """
-        Giriş işlemini yönetir.
-        captcha_callback: Resmi gösterip kullanıcıdan kodu alan fonksiyondur.
+        Tüm session istekleri buradan geçer: host'un zamanlayıcısında sıraya girer (stats.* fazları arka
+        plan önceliğinde), faz adıyla birlikte süre ve byte sayısı ölçülür. GET'ler ve idempotent=True
+        verilen postback'ler 5xx/zaman aşımında tekrar denenir; denemeler tükenirse RequestFailed.
         """
-        # 1. Sayfayı Yükle
-        r_get = self.session.get(self.LOGIN_URL)
-        soup = BeautifulSoup(r_get.content, "html.parser")
-        
-        # 2. Captcha İndir ve Kullanıcıya Sor (Callback ile)
-        captcha_path = self._download_captcha(soup)
-        captcha_code = ""
-        if captcha_path:
-            # UI katmanına "Resim burada, bana kodu ver" diyoruz
-            captcha_code = captcha_callback(captcha_path) 
-        
-        # 3. Payload Hazırla
-        payload = self._get_hidden_inputs(soup)
-        payload.update({
-            "txtParamT01": username,
-            "txtParamT02": password,
-            "txtParamT1": password,
-            "txtSecCode": captcha_code,
-            "__EVENTTARGET": "btnLogin",
-            "__EVENTARGUMENT": "",
-            "txt_scrWidth": "1920", 
-            "txt_scrHeight": "1080"
-        })
-        if "btnLogin" in payload: del payload["btnLogin"]
+        kwargs.setdefault("timeout", self.transport.timeout)
+
+        def send() -> requests.Response:
+            start = self.profiler.now_ms()
+            r = self.session.request(method, url, **kwargs)
+            self.profiler.record_http(phase, method, url, start, r, streamed=kwargs.get("stream", False))
+            return r
+
+        return self.scheduler.request(url, self.transport, send, priority_for(phase),
+                                      idempotent=idempotent or method in ("GET", "HEAD"))
 
-        # 4. Giriş Yap
-        r_post = self.session.post(self.LOGIN_URL, data=payload)
-        
-        # Dosyayı temizle
-        if captcha_path and os.path.exists(captcha_path):
-            os.remove(captcha_path)
+    def _download_captcha(self, soup: BeautifulSoup) -> Optional[bytes]:
+        """Captcha resmini indirir ve byte'larını döner (diske yazılmaz, eşzamanlı girişler çakışmaz)."""
+        url = self._captcha_url(soup)
+        if not url: return None
 
+        r = self._request("login.captcha", "GET", url)
+        return r.content if r.status_code == 200 and r.content else None
+
+    def prepare_login(self) -> Optional[bytes]:
+        """
+        Girişin ağ kısmının ilk yarısı: login sayfasını ve captcha'yı indirir.
+        Şifre gerekmez; bu sayede keyring okunurken (veya kullanıcı beklenirken) arka planda çalışabilir.
+        Captcha yoksa None döner.
+        """
+        r_get = self._request("login.page", "GET", self.LOGIN_URL)
+        soup = self._parse("parse.login", r_get.content, self.LOGIN_PAGE_IDS)
+        self._login_page = r_get.content
+        return self._download_captcha(soup)
+
+    def submit_login(self, username: str, password: str, captcha_code: str = "") -> bool:
+        """prepare_login'in indirdiği sayfanın form alanlarıyla giriş yapar."""
+        if self._login_page is None:
+            raise Exception("Önce prepare_login çağrılmalı")
+        payload = self._login_payload(self._login_page, username, password, captcha_code)
+        self._login_page = None # ViewState tek kullanımlık
+
+        r_post = self._request("login.submit", "POST", self.LOGIN_URL, data=payload)
         # Başarılı mı?
         return "login.aspx" not in r_post.url
 
-    def fetch_grades(self) -> List[CourseGrade]:
-        """Tüm notları ve istatistikleri çeker."""
-        self.session.headers.update({"Referer": self.GRADES_URL})
-        r = self.session.get(self.GRADES_URL)
-        soup = BeautifulSoup(r.content, "html.parser")
-        
-        table = soup.find(id="grd_not_listesi")
-        if not table:
-            raise Exception("Not tablosu bulunamadı! URL veya oturum hatalı olabilir.")
-            
-        # Dönem Bilgisi
-        donem_val = "20251" # Default
-        donem_select = soup.find("select", id="cmbDonemler")
-        if donem_select:
-            opt = donem_select.find("option", selected=True)
-            if opt: donem_val = opt.get("value")
-
-        grades_list = []
-        rows = table.find_all("tr")[1:]
-
-        for row in rows:
-            cols = row.find_all("td")
-            if len(cols) < 5: continue
-
-            # Temel Bilgiler
-            course_code = cols[1].get_text(strip=True)
-            course_name = cols[2].get_text(strip=True)
-            letter_grade = cols[6].get_text(strip=True)
-            raw_text = cols[4].get_text(" ", strip=True)
-            
-            # Senin notlarını parse et
-            my_grades = self._parse_my_grades(raw_text)
-            
-            # Sınıf Ortalamalarını Çek (AJAX İşlemleri)
-            class_avgs = {"Vize": "?", "Final": "?", "Büt": "?"}
-            
-            stats_btn = row.find("a", id=re.compile(r"btnIstatistik"))
-            if stats_btn:
-                href = stats_btn.get("href", "")
-                match = re.search(r"__doPostBack\('([^']*)'", href)
-                if match:
-                    target = match.group(1)
-                    # Ortalamaları getir
-                    class_avgs = self._fetch_course_stats(target, donem_val, soup)
-
-            # Veriyi Modele Dök
-            course = CourseGrade(
-                code=course_code,
-                name=course_name,
-                term_id=donem_val,
-                letter_grade=letter_grade,
-                midterm=ExamStats(my_grades["Vize"], class_avgs["Vize"]),
-                final=ExamStats(my_grades["Final"], class_avgs["Final"]),
-                makeup=ExamStats(my_grades["Büt"], class_avgs["Büt"])
+    def login(self, username: str, password: str, captcha_callback: Callable[[bytes], str]) -> bool:
+        """
+        Giriş işlemini yönetir.
+        captcha_callback: Resmin byte'larını alıp kodu dönen fonksiyondur (gösterme/çözme UI katmanında).
+        """
+        captcha = self.prepare_login()
+        captcha_code = captcha_callback(captcha) if captcha else ""
+        return self.submit_login(username, password, captcha_code)
+
+    def close(self):
+        """Bağlantıları kapatır (kayıt modunda arşiv dosyası da burada tamamlanır)."""
+        if self._owns_adapter: self.session.close()
+
+    def export_session(self) -> str:
+        """Session cookie'lerini keyring'de saklanabilecek JSON metnine çevirir."""
+        cookies = [{
+            "name": c.name,
+            "value": c.value,
+            "domain": c.domain,
+            "path": c.path,
+            "secure": c.secure,
+            "expires": c.expires
+        } for c in self.session.cookies]
+        return json.dumps(cookies)
+
+    def restore_session(self, session_data: str) -> bool:
+        """
+        Kayıtlı cookie'leri yükler ve not sayfasına tek bir GET ile oturumun hâlâ geçerli olup
+        olmadığını dener. login.aspx'e yönlendirilirsek False döner (captcha'lı giriş gerekir).
+        """
+        try:
+            cookies = json.loads(session_data)
+        except ValueError:
+            return False
+
+        for c in cookies:
+            self.session.cookies.set(
+                c["name"], c["value"],
+                domain=c.get("domain", ""), path=c.get("path", "/"),
+                secure=c.get("secure", False), expires=c.get("expires")
             )
-            grades_list.append(course)
 
-        return grades_list
+        self.session.headers.update({"Referer": self.GRADES_URL})
+        r = self._request("session.probe", "GET", self.GRADES_URL, headers=self.FRESH_HEADERS)
+        if "login.aspx" in r.url:
+            self.session.cookies.clear()
+            return False
+
+        # Kontrol isteği zaten not sayfasını getirdi, fetch_grades bunu kullanacak
+        self._prefetched_grades_page = r.content
+        return True
 
-    def _fetch_course_stats(self, target: str, donem: str, main_soup: BeautifulSoup) -> Dict[str, str]:
-        """AJAX ile istatistik URL'sini bulur ve ortalamaları parse eder."""
+    def fetch_grades(self, stats_filter: Optional[StatsFilter] = None) -> List[CourseGrade]:
+        """
+        Tüm notları ve istatistikleri çeker.
+        stats_filter: Ortalamaları boş CourseGrade alır; False dönen derslerin ortalaması çekilmez ('?' kalır).
+        """
+        grades: Dict[int, CourseGrade] = {}
+        for idx, course in self.iter_grades(stats_filter):
+            grades[idx] = course # Son gelen sürüm (ortalamalı hali) kalır
+        return [grades[idx] for idx in sorted(grades)]
+
+    def iter_grades(self, stats_filter: Optional[StatsFilter] = None) -> Iterator[Tuple[int, CourseGrade]]:
+        """
+        fetch_grades'in akış hali: (satır indeksi, ders) çiftleri üretir.
+        Önce tablodaki her ders ortalamaları '?' olarak hemen yield edilir; ardından her istatistik
+        isteği bittikçe aynı indeksle ortalamalı hali tekrar gelir (sıra bitiş sırasıdır).
+        """
+        term_page = self._parse_grades_page(self._get_grades_page(), stats_filter)
+        for idx in range(len(term_page.courses)):
+            yield idx, self._build_course(term_page, idx, self._empty_averages())
+
+        # Sınıf Ortalamalarını Çek (AJAX İşlemleri) - paralel
+        pending = [idx for idx, target in enumerate(term_page.targets) if target]
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                jobs = {
+                    pool.submit(self._fetch_course_stats, term_page.targets[idx], term_page.term_id,
+                                term_page.hidden_inputs, term_page.courses[idx][0]): idx
+                    for idx in pending
+                }
+                for job in as_completed(jobs):
+                    idx = jobs[job]
+                    yield idx, self._build_course(term_page, idx, job.result())
+
+        if self.stats_index: self.stats_index.save()
+
+    def fetch_all_terms(self, stats_filter: Optional[StatsFilter] = None) -> Iterator[Tuple[str, List[CourseGrade]]]:
+        """
+        cmbDonemler'deki tüm dönemlerin notlarını çeker.
+        Dönem değiştirme postback'leri ve tüm dönemlerin istatistik istekleri aynı thread havuzundan
+        (dolayısıyla session'ın aynı bağlantı havuzundan) geçer. Her dönem tamamlandığı anda
+        (term_id, notlar) olarak yield edilir; sıra dönem sırası değil, bitiş sırasıdır.
+        """
+        first_page = self._parse_grades_page(self._get_grades_page(), stats_filter)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Diğer dönemlerin sayfaları, ilk sayfanın ViewState'i ile paralel istenir
+            page_jobs = {
+                pool.submit(self._switch_term, term, first_page.hidden_inputs): term
+                for term in first_page.terms if term != first_page.term_id
+            }
+            stats_jobs = {}  # future -> (dönem sayfası, satır indeksi)
+            progress = {}    # id(dönem sayfası) -> [ortalamalar, kalan istek sayısı]
+            finished = []    # İstatistikleri tamamlanmış, yield edilmeyi bekleyen dönemler
+
+            def start_term(term_page: _GradesPage):
+                avgs = [self._empty_averages() for _ in term_page.targets]
+                remaining = 0
+                for idx, target in enumerate(term_page.targets):
+                    if not target: continue
+                    job = pool.submit(self._fetch_course_stats, target, term_page.term_id,
+                                      term_page.hidden_inputs, term_page.courses[idx][0])
+                    stats_jobs[job] = (term_page, idx)
+                    remaining += 1
+                progress[id(term_page)] = [avgs, remaining]
+                if remaining == 0: finished.append(term_page)
+
+            start_term(first_page)
+            while True:
+                for term_page in finished:
+                    avgs, _ = progress.pop(id(term_page))
+                    yield term_page.term_id, self._build_grades(term_page, avgs)
+                finished.clear()
+
+                if not page_jobs and not stats_jobs:
+                    if self.stats_index: self.stats_index.save()
+                    break
+                done, _ = wait(list(page_jobs) + list(stats_jobs), return_when=FIRST_COMPLETED)
+
+                for job in done:
+                    if job in page_jobs:
+                        term = page_jobs.pop(job)
+                        # O dönemde ders yoksa tablo da olmaz; boş dönem olarak geçilir
+                        start_term(self._parse_term_page(job.result(), term, stats_filter))
+                    else:
+                        term_page, idx = stats_jobs.pop(job)
+                        state = progress[id(term_page)]
+                        state[0][idx] = job.result()
+                        state[1] -= 1
+                        if state[1] == 0: finished.append(term_page)
+
+    def _get_grades_page(self) -> bytes:
+        """Not listesi sayfasını getirir (restore_session zaten indirdiyse onu kullanır)."""
+        self.session.headers.update({"Referer": self.GRADES_URL})
+        if self._prefetched_grades_page is not None:
+            page, self._prefetched_grades_page = self._prefetched_grades_page, None
+            return page
+        r = self._request("grades.page", "GET", self.GRADES_URL, headers=self.FRESH_HEADERS)
+        self._check_grades_response(r.url)
+        return r.content
+
+    def _switch_term(self, term_id: str, hidden_inputs: Dict[str, str]) -> bytes:
+        """cmbDonemler postback'i ile başka bir dönemin not sayfasını getirir."""
+        data = self._term_switch_data(term_id, hidden_inputs)
+        # Dönem değiştirme sadece sayfayı yeniden çizer; tekrar gönderilebilir
+        r = self._request("grades.term_switch", "POST", self.GRADES_URL, data=data, idempotent=True)
+        self._check_term_response(term_id, r.status_code, r.url)
+        return r.content
+
+    def _fetch_course_stats(self, target: str, donem: str, hidden_inputs: Dict[str, str],
+                            course_code: str = "") -> Dict[str, str]:
+        """AJAX ile istatistik URL'sini bulur ve ortalamaları parse eder.
+        Birden fazla thread'den aynı anda çağrılabilir; paylaşılan state'e (session header'ları,
+        hidden_inputs) yazmaz. URL indeksinde bu ders için adres varsa postback hiç yapılmaz.
+        Çekilemezse ortalamalar '?' kalır ve sebep _failed_averages ile modele taşınır."""
         try:
-            # 1. AJAX Trigger
-            hidden_data = self._get_hidden_inputs(main_soup)
-            hidden_data.update({
-                "ScriptManager1": f"UpdatePanel1|{target}",
-                "__EVENTTARGET": target,
-                "__EVENTARGUMENT": "",
-                "__ASYNCPOST": "true",
-                "cmbDonemler": donem
-            })
-            
-            self.session.headers.update({"X-MicrosoftAjax": "Delta=true"})
-            r_post = self.session.post(self.GRADES_URL, data=hidden_data)
-            
-            # Header temizliği
-            if "X-MicrosoftAjax" in self.session.headers: 
-                del self.session.headers["X-MicrosoftAjax"]
+            # 0. Daha önce öğrenilmiş URL varsa doğrudan istatistik sayfasına git
+            if self.stats_index and course_code:
+                known_url = self.stats_index.get(course_code, donem)
+                if known_url:
+                    averages = self._fetch_stats_page(known_url)
+                    if "error" not in averages: return averages
+                    self.stats_index.forget(course_code, donem) # Eskimiş, postback ile yeniden öğren
+
+            # 1. AJAX Trigger (ViewState kopyası üzerinde çalışılır)
+            hidden_data = self._stats_postback_data(target, donem, hidden_inputs)
+
+            # Header sadece bu isteğe eklenir, session'a dokunulmaz.
+            # UpdatePanel postback'i sunucuda bir şey değiştirmez; hata alırsa tekrar gönderilebilir
+            r_post = self._request("stats.postback", "POST", self.GRADES_URL, data=hidden_data,
+                                   headers=self.STATS_POSTBACK_HEADERS, idempotent=True)
+            if r_post.status_code != 200: return self._failed_averages(f"HTTP {r_post.status_code}")
 
             # 2. URL Bulma
-            url_match = re.search(r"(Ders_Istatistik\.aspx[^'\"]*)", r_post.text)
-            if not url_match:
-                url_match = re.search(r"prolizPopup\('([^']+)'", r_post.text)
-            
-            if url_match:
-                raw_url = url_match.group(1)
-                full_url = ""
-                if raw_url.startswith("http"): full_url = raw_url
-                elif raw_url.startswith("/"): full_url = "https://obs.ozal.edu.tr" + raw_url
-                else: full_url = "https://obs.ozal.edu.tr/oibs/std/" + raw_url.lstrip("/") # Fallback
-
-                # 3. İstatistik Sayfasını İndir
-                r_stats = self.session.get(full_url)
-                return self._parse_averages_from_html(r_stats.text)
-            
-            return {"Vize": "?", "Final": "?", "Büt": "?"}
-
-        except Exception:
-            return {"Vize": "?", "Final": "?", "Büt": "?"}
-
-    def _parse_my_grades(self, text: str) -> Dict[str, str]:
-        """ 'Vize : 80 Final : --' stringini parse eder."""
-        grades = {"Vize": "-", "Final": "-", "Büt": "-"}
-        vize = re.search(r"Vize\s*:\s*([\d\w-]+)", text)
-        final = re.search(r"Final\s*:\s*([\d\w-]+)", text)
-        but = re.search(r"Bütünleme\s*:\s*([\d\w-]+)", text)
-        
-        if vize: grades["Vize"] = vize.group(1)
-        if final: grades["Final"] = final.group(1)
-        if but: grades["Büt"] = but.group(1)
-        return grades
-
-    def _parse_averages_from_html(self, html: str) -> Dict[str, str]:
-        """State Machine mantığıyla tüm ortalamaları çeker."""
-        averages = {"Vize": "?", "Final": "?", "Büt": "?"}
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table", id="grdIstSnv")
-        if not table: return averages
-
-        context = None
-        for row in table.find_all("tr"):
-            text = row.get_text(strip=True)
-            
-            if "Ara Sınav" in text: context = "Vize"
-            elif "Yarıyıl Sonu" in text or "Final" in text: context = "Final"
-            elif "Bütünleme" in text: context = "Büt"
-            
-            if "not ortalaması" in text and context:
-                cols = row.find_all("td")
-                if len(cols) > 1:
-                    averages[context] = cols[1].get_text(strip=True)
-        
-        return averages
\ No newline at end of file
+            full_url = self._resolve_stats_url(r_post.text)
+            if not full_url: return self._failed_averages("istatistik adresi bulunamadı")
+
+            # 3. İstatistik Sayfasını İndir
+            averages = self._fetch_stats_page(full_url)
+            if "error" not in averages and self.stats_index and course_code:
+                self.stats_index.learn(course_code, donem, full_url)
+            return averages
+
+        except Exception as e:
+            return self._failed_averages(describe_failure(e))
+
+    def _fetch_stats_page(self, url: str) -> Dict[str, str]:
+        """İstatistik sayfasının ortalamaları; sayfa beklenen tabloyu içermiyorsa sebebiyle _failed_averages."""
+        r_stats = self._request("stats.page", "GET", url)
+        if not self._is_stats_page(r_stats.status_code, r_stats.url, r_stats.text):
+            return self._failed_averages(self._stats_page_error(r_stats.status_code, r_stats.url))
+        return self._parse_averages_from_html(r_stats.text)
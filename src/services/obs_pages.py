@@ -0,0 +1,281 @@
+import re
+from bs4 import BeautifulSoup
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from src.models import CourseGrade, ExamStats
+from src.services.html_parser import PageParser, Markup
+from src.services.profiler import NullProfiler
+from src.services.schools import School, default_school
+
+# Ortalamaları henüz boş ('?') ders -> bu dersin istatistiği çekilsin mi?
+StatsFilter = Callable[[CourseGrade], bool]
+
+class SessionExpired(Exception):
+    """Not sayfası yerine login.aspx geldi; yeniden giriş (veya kayıtlı oturumu yükleme) gerekir."""
+
+@dataclass
+class _GradesPage:
+    """Parse edilmiş bir dönem sayfası (istatistikler henüz çekilmemiş)."""
+    term_id: str
+    terms: List[str]                      # cmbDonemler'deki tüm dönemler
+    hidden_inputs: Dict[str, str]         # Bu sayfanın ViewState anlık görüntüsü
+    courses: List[tuple] = field(default_factory=list)          # (code, name, letter, my_grades)
+    targets: List[Optional[str]] = field(default_factory=list)  # İstatistik postback hedefleri
+
+class OBSPages:
+    """
+    OBS sayfalarının ağdan bağımsız kısmı: URL'ler, form payload'ları ve parse işlemleri.
+    Senkron OBSClient ile AsyncOBSClient bunu paylaşır; sadece HTTP katmanları farklıdır.
+    Adresler ve sayfa farklılıkları okula göre School'dan gelir (bkz. schools.py).
+    """
+    # Not hücresindeki sınav etiketleri; okul farklı yazıyorsa School.exam_labels ezer
+    EXAM_LABELS = {"Vize": "Vize", "Final": "Final", "Büt": "Bütünleme"}
+
+    # Her sayfadan sadece bu id'lere sahip elemanlar parse edilir
+    LOGIN_PAGE_IDS = ("imgCaptchaImg",)
+    GRADES_PAGE_IDS = ("grd_not_listesi", "cmbDonemler")
+    STATS_PAGE_IDS = ("grdIstSnv",)
+
+    # Sadece not sayfası isteklerinde: aradaki proxy'ler eski not listesini dönmesin
+    FRESH_HEADERS = {"Cache-Control": "no-cache"}
+
+    # İstatistik postback'i UpdatePanel (AJAX delta) isteği olarak gönderilir
+    STATS_POSTBACK_HEADERS = {"X-MicrosoftAjax": "Delta=true"}
+
+    def __init__(self, parser_backend: Optional[str] = None, profiler=None, school: Optional[School] = None):
+        # Faz bazlı süre/byte ölçümü (--profile); verilmezse hiçbir şey kaydetmeyen sürüm
+        self.profiler = profiler or NullProfiler()
+        # "lxml" veya "html.parser"; verilmezse lxml kuruluysa o seçilir
+        self.parser = PageParser(parser_backend)
+
+        # --- URL'LER (okula göre) ---
+        self.school = school or default_school()
+        self.BASE_URL = self.school.base_url
+        self.LOGIN_URL = self.school.login_url
+        self.GRADES_URL = self.school.grades_url
+        self.STATS_BASE_URL = self.school.stats_base_url
+        self.exam_labels = dict(self.EXAM_LABELS, **self.school.exam_labels)
+        self._exam_patterns = {key: re.compile(re.escape(label) + r"\s*:\s*([\d\w-]+)")
+                               for key, label in self.exam_labels.items()}
+
+    def _parse(self, phase: str, page: Markup, only_ids) -> BeautifulSoup:
+        with self.profiler.measure(phase):
+            return self.parser.parse(page, only_ids)
+
+    def _get_hidden_inputs(self, page: Markup) -> Dict[str, str]:
+        """Sayfadaki gizli inputları toplar (__VIEWSTATE vb.)."""
+        with self.profiler.measure("parse.hidden_inputs"):
+            return self.parser.hidden_inputs(page)
+
+    # --- FORM PAYLOAD'LARI ---
+    def _captcha_url(self, soup: BeautifulSoup) -> Optional[str]:
+        """Login sayfasındaki captcha resminin mutlak adresi."""
+        img_tag = soup.find(id="imgCaptchaImg")
+        if not img_tag: return None
+
+        src = img_tag.get("src")
+        # URL'yi düzelt
+        if not src.startswith("http"):
+            return self.BASE_URL + src.lstrip("/") if src.startswith("/") else self.BASE_URL + src
+        return src
+
+    def _login_payload(self, login_page: Markup, username: str, password: str, captcha_code: str) -> Dict[str, str]:
+        payload = self._get_hidden_inputs(login_page)
+        payload.update({
+            "txtParamT01": username,
+            "txtParamT02": password,
+            "txtParamT1": password,
+            "txtSecCode": captcha_code,
+            "__EVENTTARGET": "btnLogin",
+            "__EVENTARGUMENT": "",
+            "txt_scrWidth": "1920", 
+            "txt_scrHeight": "1080"
+        })
+        if "btnLogin" in payload: del payload["btnLogin"]
+        return payload
+
+    @staticmethod
+    def _term_switch_data(term_id: str, hidden_inputs: Dict[str, str]) -> Dict[str, str]:
+        data = dict(hidden_inputs)
+        data.update({
+            "__EVENTTARGET": "cmbDonemler",
+            "__EVENTARGUMENT": "",
+            "cmbDonemler": term_id
+        })
+        return data
+
+    @staticmethod
+    def _stats_postback_data(target: str, donem: str, hidden_inputs: Dict[str, str]) -> Dict[str, str]:
+        # ViewState kopyası üzerinde çalışılır; paylaşılan anlık görüntü değişmez
+        data = dict(hidden_inputs)
+        data.update({
+            "ScriptManager1": f"UpdatePanel1|{target}",
+            "__EVENTTARGET": target,
+            "__EVENTARGUMENT": "",
+            "__ASYNCPOST": "true",
+            "cmbDonemler": donem
+        })
+        return data
+
+    # --- PARSE ---
+    def _parse_grades_page(self, page: bytes, stats_filter: Optional[StatsFilter] = None,
+                           default_term: Optional[str] = None, allow_empty: bool = False) -> "_GradesPage":
+        """Not sayfasını bir kez parse eder; dersleri, dönemleri ve ViewState'i çıkarır."""
+        soup = self._parse("parse.grades", page, self.GRADES_PAGE_IDS)
+        school = self.school
+        
+        # Dönem Bilgisi
+        donem_val = default_term or school.default_term
+        terms = []
+        donem_select = soup.find("select", id="cmbDonemler")
+        if donem_select:
+            terms = [o.get("value") for o in donem_select.find_all("option") if o.get("value")]
+            opt = donem_select.find("option", selected=True)
+            if opt: donem_val = opt.get("value")
+
+        # ViewState bir kez okunur; her ders isteği bu anlık görüntünün kopyasını kullanır
+        term_page = _GradesPage(term_id=donem_val, terms=terms, hidden_inputs=self._get_hidden_inputs(page))
+
+        table = soup.find(id="grd_not_listesi")
+        if not table:
+            if allow_empty: return term_page
+            raise Exception("Not tablosu bulunamadı! URL veya oturum hatalı olabilir.")
+
+        rows = table.find_all("tr")[1:]
+        min_cols = max(school.code_column, school.name_column, school.grades_column, school.letter_column) + 1
+
+        for row in rows:
+            cols = row.find_all("td")
+            if len(cols) < min_cols: continue
+
+            # Temel Bilgiler (sütun sıraları okula göre)
+            course_code = cols[school.code_column].get_text(strip=True)
+            course_name = cols[school.name_column].get_text(strip=True)
+            letter_grade = cols[school.letter_column].get_text(strip=True)
+            raw_text = cols[school.grades_column].get_text(" ", strip=True)
+
+            # Senin notlarını parse et
+            my_grades = self._parse_my_grades(raw_text)
+
+            target = None
+            wants_stats = stats_filter is None or stats_filter(CourseGrade(
+                code=course_code,
+                name=course_name,
+                term_id=donem_val,
+                letter_grade=letter_grade,
+                midterm=ExamStats(my_grades["Vize"]),
+                final=ExamStats(my_grades["Final"]),
+                makeup=ExamStats(my_grades["Büt"])
+            ))
+            stats_btn = row.find("a", id=re.compile(r"btnIstatistik"))
+            if stats_btn and wants_stats:
+                href = stats_btn.get("href", "")
+                match = re.search(r"__doPostBack\('([^']*)'", href)
+                if match: target = match.group(1)
+
+            term_page.courses.append((course_code, course_name, letter_grade, my_grades))
+            term_page.targets.append(target)
+
+        return term_page
+
+    def _check_grades_response(self, url: str):
+        """Oturum düşünce OBS not sayfası yerine login'e yönlendirir; tablo aramadan SessionExpired."""
+        if "login.aspx" in url: raise SessionExpired("OBS oturumu düşmüş, yeniden giriş gerekli")
+
+    def _check_term_response(self, term_id: str, status_code: int, url: str):
+        """
+        Dönem değiştirme cevabı gerçekten not sayfası mı; hata sayfası, 500 veya login'e yönlenme ise Exception.
+        Tablosuz bir sayfa ancak bu kontrolden geçtiyse "o dönemde ders yok" sayılır.
+        """
+        if "login.aspx" in url: raise SessionExpired(f"{term_id} dönemi alınamadı: oturum düşmüş")
+        if status_code != 200: raise Exception(f"{term_id} dönemi alınamadı: HTTP {status_code}")
+        if urlsplit(url).path != urlsplit(self.GRADES_URL).path:
+            raise Exception(f"{term_id} dönemi alınamadı: beklenmeyen sayfa ({url})")
+
+    def _parse_term_page(self, page: bytes, term_id: str, stats_filter: Optional[StatsFilter] = None) -> "_GradesPage":
+        """_check_term_response'tan geçmiş dönem sayfası; OBS dönemi değiştirmediyse Exception."""
+        term_page = self._parse_grades_page(page, stats_filter, default_term=term_id, allow_empty=True)
+        if term_page.term_id != term_id:
+            raise Exception(f"{term_id} dönemi alınamadı: OBS {term_page.term_id} dönemini döndü")
+        return term_page
+
+    def _build_grades(self, term_page: "_GradesPage", all_avgs: List[Dict[str, str]]) -> List[CourseGrade]:
+        """Parse edilmiş satırları ve ortalamaları modele döker."""
+        return [self._build_course(term_page, idx, class_avgs) for idx, class_avgs in enumerate(all_avgs)]
+
+    def _build_course(self, term_page: "_GradesPage", idx: int, class_avgs: Dict[str, str]) -> CourseGrade:
+        course_code, course_name, letter_grade, my_grades = term_page.courses[idx]
+        error = class_avgs.get("error")
+        return CourseGrade(
+            code=course_code,
+            name=course_name,
+            term_id=term_page.term_id,
+            letter_grade=letter_grade,
+            midterm=ExamStats(my_grades["Vize"], class_avgs["Vize"], error),
+            final=ExamStats(my_grades["Final"], class_avgs["Final"], error),
+            makeup=ExamStats(my_grades["Büt"], class_avgs["Büt"], error)
+        )
+
+    @staticmethod
+    def _empty_averages() -> Dict[str, str]:
+        return {"Vize": "?", "Final": "?", "Büt": "?"}
+
+    @staticmethod
+    def _failed_averages(reason: str) -> Dict[str, str]:
+        """Çekilemeyen istatistik: ortalamalar '?' kalır, sebep modele (ExamStats.error) taşınır."""
+        return {"Vize": "?", "Final": "?", "Büt": "?", "error": reason}
+
+    def _resolve_stats_url(self, delta_text: str) -> Optional[str]:
+        """UpdatePanel cevabındaki popup adresini mutlak URL'e çevirir."""
+        url_match = re.search(r"(Ders_Istatistik\.aspx[^'\"]*)", delta_text)
+        if not url_match:
+            url_match = re.search(r"prolizPopup\('([^']+)'", delta_text)
+        if not url_match: return None
+
+        raw_url = url_match.group(1)
+        if raw_url.startswith("http"): return raw_url
+        if raw_url.startswith("/"): return self.STATS_BASE_URL + raw_url
+        return self.BASE_URL + raw_url.lstrip("/") # Fallback
+
+    @staticmethod
+    def _is_stats_page(status_code: int, url: str, text: str) -> bool:
+        """Cevap gerçekten istatistik sayfası mı (oturum düşünce login'e yönlenir)."""
+        return status_code == 200 and "login.aspx" not in url and "grdIstSnv" in text
+
+    @staticmethod
+    def _stats_page_error(status_code: int, url: str) -> str:
+        """_is_stats_page'in reddettiği cevabın kısa sebebi."""
+        if "login.aspx" in url: return "oturum düşmüş"
+        if status_code != 200: return f"HTTP {status_code}"
+        return "istatistik tablosu yok"
+
+    def _parse_my_grades(self, text: str) -> Dict[str, str]:
+        """ 'Vize : 80 Final : --' stringini parse eder."""
+        grades = {"Vize": "-", "Final": "-", "Büt": "-"}
+        for key, pattern in self._exam_patterns.items():
+            match = pattern.search(text)
+            if match: grades[key] = match.group(1)
+        return grades
+
+    def _parse_averages_from_html(self, html: str) -> Dict[str, str]:
+        """State Machine mantığıyla tüm ortalamaları çeker."""
+        averages = {"Vize": "?", "Final": "?", "Büt": "?"}
+        soup = self._parse("parse.stats", html, self.STATS_PAGE_IDS)
+        table = soup.find("table", id="grdIstSnv")
+        if not table: return averages
+
+        context = None
+        for row in table.find_all("tr"):
+            text = row.get_text(strip=True)
+            
+            if "Ara Sınav" in text: context = "Vize"
+            elif "Yarıyıl Sonu" in text or "Final" in text: context = "Final"
+            elif "Bütünleme" in text: context = "Büt"
+            
+            if "not ortalaması" in text and context:
+                cols = row.find_all("td")
+                if len(cols) > 1:
+                    averages[context] = cols[1].get_text(strip=True)
+        
+        return averages
\ No newline at end of file
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+@dataclass
+class PhaseRecord:
+    """Tek bir ölçüm: bir HTTP isteği ya da bir parse adımı."""
+    phase: str             # Örn: login.page, stats.postback, parse.grades
+    kind: str              # "http" | "parse"
+    start_ms: float        # Profiler başlangıcına göre (ms)
+    duration_ms: float
+    bytes_in: int = 0      # İndirilen gövde (açılmış hali)
+    bytes_out: int = 0     # Gönderilen gövde (POST payload'ı, ViewState dahil)
+    status: Optional[int] = None
+    method: str = ""
+    url: str = ""
+    thread: str = ""
+
+class Profiler:
+    """
+    OBSClient'ın HTTP isteklerini ve parse adımlarını faz bazında ölçer.
+    Paralel istatistik istekleri farklı thread'lerden kayıt düştüğü için kayıt listesi kilitlidir.
+    """
+    enabled = True
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.records: List[PhaseRecord] = []
+
+    def _add(self, record: PhaseRecord):
+        with self._lock:
+            self.records.append(record)
+
+    def now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def measure(self, phase: str, kind: str = "parse"):
+        """with profiler.measure("parse.grades"): ... bloğunun süresini kaydeder."""
+        start = self.now_ms()
+        try:
+            yield
+        finally:
+            self._add(PhaseRecord(phase, kind, start, self.now_ms() - start,
+                                  thread=threading.current_thread().name))
+
+    def record_http(self, phase: str, method: str, url: str, start_ms: float, response, streamed: bool = False):
+        """Tamamlanmış bir requests (veya httpx) Response'unu kaydeder."""
+        request = response.request
+        # requests gövdeyi request.body'de, httpx request.content'te tutar
+        body = (getattr(request, "body", None) or getattr(request, "content", None)) if request is not None else None
+        if streamed:
+            # stream=True isteklerde gövde henüz okunmadı, Content-Length ile yetiniyoruz
+            bytes_in = int(response.headers.get("Content-Length", 0) or 0)
+        else:
+            bytes_in = len(response.content or b"")
+        self._add(PhaseRecord(
+            phase=phase,
+            kind="http",
+            start_ms=start_ms,
+            duration_ms=self.now_ms() - start_ms,
+            bytes_in=bytes_in,
+            bytes_out=len(body) if body else 0,
+            status=response.status_code,
+            method=method,
+            url=url,
+            thread=threading.current_thread().name
+        ))
+
+    def elapsed_ms(self) -> float:
+        return self.now_ms()
+
+    def summary(self) -> List[Dict]:
+        """Faz başına toplam/ortalama/en kötü süre ve byte sayıları (ilk görülme sırasıyla)."""
+        with self._lock:
+            records = list(self.records)
+
+        groups: Dict[str, List[PhaseRecord]] = {}
+        for r in records:
+            groups.setdefault(r.phase, []).append(r)
+
+        rows = []
+        for phase, items in groups.items():
+            durations = sorted(r.duration_ms for r in items)
+            rows.append({
+                "phase": phase,
+                "kind": items[0].kind,
+                "count": len(items),
+                "total_ms": sum(durations),
+                "mean_ms": sum(durations) / len(durations),
+                "p95_ms": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                "max_ms": durations[-1],
+                "bytes_in": sum(r.bytes_in for r in items),
+                "bytes_out": sum(r.bytes_out for r in items),
+            })
+        return rows
+
+    def export_json(self, path: str, **metadata):
+        """Tüm kayıtları ve özeti, koşular arasında karşılaştırmak için JSON trace olarak yazar."""
+        with self._lock:
+            records = [asdict(r) for r in self.records]
+        trace = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_ms": self.elapsed_ms(),
+            "metadata": metadata,
+            "summary": self.summary(),
+            "records": records
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False, indent=2)
+
+class NullProfiler:
+    """Profil kapalıyken kullanılan, hiçbir şey kaydetmeyen sürüm."""
+    enabled = False
+
+    @contextmanager
+    def measure(self, phase: str, kind: str = "parse"):
+        yield
+
+    def record_http(self, phase: str, method: str, url: str, start_ms: float, response, streamed: bool = False):
+        pass
+
+    def now_ms(self) -> float:
+        return 0.0
@@ -0,0 +1,151 @@
+import json
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.models import CourseGrade, GradeColumns
+
+# Mutlak harf notu tablosu (alt sınırlar); hiçbirine yetmeyen toplam FF'dir
+DEFAULT_LETTER_THRESHOLDS: Tuple[Tuple[str, float], ...] = (
+    ("AA", 90), ("BA", 85), ("BB", 80), ("CB", 75),
+    ("CC", 70), ("DC", 65), ("DD", 60), ("FD", 50)
+)
+FAILING_LETTERS = ("FD", "FF")
+
+@dataclass(frozen=True)
+class Weights:
+    """Bir dersin başarı notu ağırlıkları (OBS varsayılanı: vize %40, final %60)."""
+    midterm: float = 0.4
+    final: float = 0.6          # Büt, finalin yerine aynı ağırlıkla geçer
+    min_final: float = 0.0      # Final/büt barajı; altında kalan toplamdan bağımsız FF olur
+
+    def total(self, midterm: float, final: float) -> float:
+        return self.midterm * midterm + self.final * final
+
+def _ratio(value) -> float:
+    """Ağırlık yüzde olarak yazılmışsa (40) orana (0.4) çevirir; 1'e kadar olanlar zaten orandır."""
+    value = float(value)
+    return value / 100 if value > 1 else value
+
+def _weights_from_dict(data: Dict, base: Weights, name: str = "default") -> Weights:
+    # Her anahtar tek başına çevrilir; ders bazında sadece {"midterm": 30} yazılırsa final varsayılandan gelir
+    midterm = _ratio(data["midterm"]) if "midterm" in data else base.midterm
+    final = _ratio(data["final"]) if "final" in data else base.final
+    if final <= 0: raise ValueError(f"{name}: final ağırlığı 0'dan büyük olmalı (final notu hesaplanamaz)")
+    return Weights(midterm, final, float(data.get("min_final", base.min_final)))
+
+def load_weights(path: str) -> Tuple[Weights, Dict[str, Weights]]:
+    """
+    Ağırlık dosyasını okur (yüzde veya oran olarak):
+    {"default": {"midterm": 40, "final": 60, "min_final": 50}, "courses": {"BİLM201": {"midterm": 30, "final": 70}}}
+    Dosya okunamaz, JSON bozuk veya final ağırlığı 0 ise ValueError/OSError.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    default = _weights_from_dict(data.get("default", {}), Weights())
+    courses = {code: _weights_from_dict(w, default, code) for code, w in data.get("courses", {}).items()}
+    return default, courses
+
+@dataclass
+class Projection:
+    """Bir dersin mevcut durumu ve hedef harfler için gereken final/büt notları."""
+    term_id: str
+    code: str
+    name: str
+    exam: Optional[str]                      # Gereken sınav: "Final", "Büt" veya None (ders kesinleşti)
+    total: Optional[float]                   # Final/büt girildiyse başarı notu
+    letter: Optional[str]                    # Başarı notuna göre harf
+    required: Dict[str, Optional[float]] = field(default_factory=dict)  # Harf -> gereken not (None: ulaşılamaz)
+
+class ProjectionEngine:
+    """
+    Vize notundan hedef harfler için gereken final/büt notunu hesaplar.
+    Her ağırlık seti için 0-100 arası tam sayı vize notlarının cevapları bir kez tabloya yazılır;
+    toplu hesaplamada her satır sadece bir tablo okumasıdır.
+    """
+
+    def __init__(self, default_weights: Optional[Weights] = None,
+                 course_weights: Optional[Dict[str, Weights]] = None,
+                 thresholds: Tuple[Tuple[str, float], ...] = DEFAULT_LETTER_THRESHOLDS):
+        self.default_weights = default_weights or Weights()
+        self.course_weights = course_weights or {}
+        self.thresholds = thresholds
+        self.letters = tuple(letter for letter, _ in thresholds)
+        self._tables: Dict[Weights, Dict[str, array]] = {}
+        for weights in {self.default_weights, *self.course_weights.values()}:
+            self._table(weights)
+
+    # --- LOOKUP TABLOLARI ---
+    def _table(self, weights: Weights) -> Dict[str, array]:
+        """Harf -> array('d')[vize] = gereken final (NaN: 100 ile bile ulaşılamaz)."""
+        table = self._tables.get(weights)
+        if table is None:
+            table = {letter: array("d", (self._solve(weights, threshold, m) for m in range(101)))
+                     for letter, threshold in self.thresholds}
+            self._tables[weights] = table
+        return table
+
+    @staticmethod
+    def _solve(weights: Weights, threshold: float, midterm: float) -> float:
+        need = (threshold - weights.midterm * midterm) / weights.final
+        need = max(math.ceil(need - 1e-9), weights.min_final, 0)
+        return float(need) if need <= 100 else math.nan
+
+    def weights_for(self, course_code: str) -> Weights:
+        return self.course_weights.get(course_code, self.default_weights)
+
+    def required_scores(self, weights: Weights, midterm: float) -> Dict[str, Optional[float]]:
+        if midterm == int(midterm) and 0 <= midterm <= 100:
+            idx = int(midterm)
+            needs = ((letter, column[idx]) for letter, column in self._table(weights).items())
+        else:
+            needs = ((letter, self._solve(weights, t, midterm)) for letter, t in self.thresholds)
+        return {letter: None if math.isnan(need) else need for letter, need in needs}
+
+    def letter_for(self, weights: Weights, total: float, final: float) -> str:
+        if final < weights.min_final: return "FF"
+        for letter, threshold in self.thresholds:
+            if total >= threshold: return letter
+        return "FF"
+
+    # --- HESAPLAMA ---
+    def _project_row(self, code: str, midterm: Optional[float], final: Optional[float],
+                     makeup: Optional[float]) -> Tuple[Optional[str], Optional[float], Optional[str], Dict]:
+        """(gereken sınav, başarı notu, harf, gereken notlar) döner."""
+        if midterm is None: return None, None, None, {}
+        weights = self.weights_for(code)
+
+        # Büt girildiyse finalin yerine geçer
+        exam_score = makeup if makeup is not None else final
+        if exam_score is None:
+            return "Final", None, None, self.required_scores(weights, midterm)
+
+        total = weights.total(midterm, exam_score)
+        letter = self.letter_for(weights, total, exam_score)
+        if letter in FAILING_LETTERS and makeup is None:
+            return "Büt", total, letter, self.required_scores(weights, midterm)
+        return None, total, letter, {}
+
+    def project(self, grade: CourseGrade) -> Projection:
+        exam, total, letter, required = self._project_row(
+            grade.code, grade.midterm.score_value, grade.final.score_value, grade.makeup.score_value
+        )
+        return Projection(grade.term_id, grade.code, grade.name, exam, total, letter, required)
+
+    def project_all(self, grades: Iterable[CourseGrade]) -> List[Projection]:
+        return [self.project(g) for g in grades]
+
+    def project_columns(self, columns: GradeColumns) -> List[Projection]:
+        """Toplu export / çok hesaplı veri için: sayılar zaten sütunlarda, metin parse edilmez."""
+        def value(x: float) -> Optional[float]:
+            return None if math.isnan(x) else x
+
+        results = []
+        for i, (midterm, final, makeup) in enumerate(zip(columns.scores["midterm"], columns.scores["final"],
+                                                         columns.scores["makeup"])):
+            exam, total, letter, required = self._project_row(
+                columns.codes[i], value(midterm), value(final), value(makeup)
+            )
+            results.append(Projection(columns.term_ids[i], columns.codes[i], columns.names[i],
+                                      exam, total, letter, required))
+        return results
@@ -0,0 +1,176 @@
+import base64
+import gzip
+import io
+import json
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+# Postback'leri birbirinden ayıran form alanları. Sadece bunlar kaydedilir;
+# şifre, captcha ve ViewState gibi alanlar arşive hiç yazılmaz.
+KEY_FIELDS = ("__EVENTTARGET", "ScriptManager1", "cmbDonemler", "__ASYNCPOST")
+
+# Cevap gövdelerinde değeri boşaltılan gizli alanlar. Oynatmada istek anahtarına girmedikleri için
+# boş değerle de aynı cevaplar bulunur; arşivde yine de not sayfalarının kendisi (kişisel veri) durur.
+SCRUBBED_FIELDS = (b"__VIEWSTATE", b"__EVENTVALIDATION")
+_SCRUBBED_NAMES = b"|".join(SCRUBBED_FIELDS)
+_INPUT_RE = re.compile(rb"<input\b[^>]*>", re.I)
+_SCRUBBED_INPUT_RE = re.compile(rb'\bname="(?:' + _SCRUBBED_NAMES + rb')"', re.I)
+_VALUE_RE = re.compile(rb'\bvalue="[^"]*"', re.I)
+# UpdatePanel cevabında: uzunluk|hiddenField|__VIEWSTATE|içerik|
+_DELTA_FIELD_RE = re.compile(rb"(\d+)\|hiddenField\|(" + _SCRUBBED_NAMES + rb")\|")
+
+# Gövde zaten açılmış halde saklandığı için bu header'lar oynatmada yanlış olur; cookie'ler de saklanmaz
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+def _key_fields(body) -> Dict[str, str]:
+    """Form gövdesinden sadece KEY_FIELDS'i çıkarır."""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    if not isinstance(body, str): return {}
+    return {k: v for k, v in parse_qsl(body, keep_blank_values=True) if k in KEY_FIELDS}
+
+def _scrub_input(match) -> bytes:
+    tag = match.group(0)
+    return _VALUE_RE.sub(b'value=""', tag) if _SCRUBBED_INPUT_RE.search(tag) else tag
+
+def _scrub_body(body: bytes) -> bytes:
+    """SCRUBBED_FIELDS'in değerlerini HTML input'larından ve UpdatePanel cevaplarından siler."""
+    if not any(name in body for name in SCRUBBED_FIELDS): return body
+    body = _INPUT_RE.sub(_scrub_input, body)
+
+    parts, pos = [], 0
+    for m in _DELTA_FIELD_RE.finditer(body):
+        if m.start() < pos: continue
+        parts += [body[pos:m.start()], b"0|hiddenField|" + m.group(2) + b"|"]
+        pos = m.end() + int(m.group(1))  # Uzunluk alanı da 0'lanır, cevabın geri kalanı kaymaz
+    parts.append(body[pos:])
+    return b"".join(parts)
+
+def _request_key(method: str, url: str, fields: Dict[str, str]) -> Tuple[str, str, Tuple]:
+    """(metot, path?query, ayırt edici form alanları). Host dahil edilmez; kayıt başka sunucuda oynatılabilir."""
+    parts = urlsplit(url)
+    target = parts.path + ("?" + parts.query if parts.query else "")
+    return method.upper(), target, tuple(sorted(fields.items()))
+
+def _raw_response(status: int, headers, body: bytes, reason: str = "", original_response=None) -> HTTPResponse:
+    return HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, reason=reason,
+                        preload_content=False, decode_content=False, original_response=original_response)
+
+def read_archive(path: str) -> Iterator[Dict]:
+    """
+    Arşivdeki kayıtları sırayla döner. Kayıt sırasında çöken bir çalıştırmanın arşivi de okunur:
+    her kayıttan sonra sıkıştırma akışı flush edildiği için kesik sonu görmezden gelmek yeterli.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"): return  # Yarım kalmış son satır
+                if line.strip(): yield json.loads(line)
+        except (EOFError, zlib.error):
+            return
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Asıl adapter'ı sarar; her istek/cevap çiftini gzip'li JSON satırı olarak arşive ekler.
+    Cevap gövdesi okunup kaydedildikten sonra çağırana yeniden okunabilir halde verilir.
+    """
+
+    def __init__(self, inner: BaseAdapter, archive: "SessionArchive"):
+        super().__init__()
+        self.inner = inner
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        body = response.content
+        # stream=True ile isteyenler raw'dan okuyabilsin; cookie'ler hâlâ asıl cevaptan okunur
+        response.raw = _raw_response(response.status_code, response.headers, body, response.reason or "",
+                                     getattr(response.raw, "_original_response", None))
+        self.archive.write(request, response, body)
+        return response
+
+    def close(self):
+        self.inner.close()
+        self.archive.close()
+
+class SessionArchive:
+    """
+    Kayıt dosyası; birden çok thread'in (istatistik worker'ları) yazdığı satırlar karışmaz.
+    Cevaplar ViewState'leri silinmiş olarak ama tam içerikleriyle (not sayfaları dahil) yazılır.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, request, response, body: bytes):
+        record = {
+            "method": request.method,
+            "url": request.url,
+            "key_fields": _key_fields(request.body),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": [(k, v) for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS],
+            "elapsed_ms": response.elapsed.total_seconds() * 1000,
+            "time": time.time(),
+            "body": base64.b64encode(_scrub_body(body)).decode("ascii")
+        }
+        with self._lock:
+            if self._file is None: return
+            record["seq"] = self._seq
+            self._seq += 1
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Ağa hiç çıkmadan, kayıtlı cevapları geri verir.
+    Aynı istek birden çok kez kaydedildiyse sırayla, bitince sonuncusu tekrar verilir.
+    Kayıtta olmayan istekler 599 döner (OBSClient bunu diğer sunucu hataları gibi ele alır).
+    """
+    NOT_RECORDED_STATUS = 599
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._responses: Dict[Tuple, List[Dict]] = defaultdict(list)
+        self._served: Dict[Tuple, int] = defaultdict(int)
+        for record in read_archive(path):
+            self._responses[_request_key(record["method"], record["url"], record["key_fields"])].append(record)
+
+    def recorded_count(self) -> int:
+        return sum(len(v) for v in self._responses.values())
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = _request_key(request.method, request.url, _key_fields(request.body))
+        with self._lock:
+            records = self._responses.get(key)
+            if records:
+                idx = min(self._served[key], len(records) - 1)
+                self._served[key] += 1
+                record = records[idx]
+            else:
+                record = None
+
+        if record is None:
+            raw = _raw_response(self.NOT_RECORDED_STATUS, {}, b"", "Not Recorded")
+        else:
+            raw = _raw_response(record["status"], record["headers"], base64.b64decode(record["body"]),
+                                record.get("reason") or "")
+        return self.build_response(request, raw)
@@ -0,0 +1,306 @@
+import asyncio
+import sys
+import threading
+import time
+from enum import IntEnum
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from urllib3.exceptions import NewConnectionError
+from src.services.transport import TransportConfig
+
+class Priority(IntEnum):
+    """İstek öncelikleri; küçük değer önce geçer."""
+    INTERACTIVE = 0   # Login, not tablosu, dönem değiştirme: kullanıcı ekranda bekliyor
+    BACKGROUND = 1    # İstatistik istekleri: tablo '?' ile gösterilir, ortalamalar sonra dolar
+
+def priority_for(phase: str) -> Priority:
+    """Profiler faz adından öncelik (stats.* arka plan, gerisi etkileşimli)."""
+    return Priority.BACKGROUND if phase.startswith("stats.") else Priority.INTERACTIVE
+
+class RequestFailed(requests.RequestException):
+    """Tüm denemeler tükendi. reason kullanıcıya gösterilecek kısa sebeptir (Örn: 'HTTP 503, 3 deneme')."""
+
+    def __init__(self, reason: str, response: Optional[requests.Response] = None):
+        super().__init__(reason, response=response)
+        self.reason = reason
+
+# requests'in ve (AsyncOBSClient kullanılıyorsa) httpx'in hata sınıfları. httpx sadece zaten
+# yüklüyse bakılır; senkron kullanımda import edilmez.
+def _timeout_errors() -> Tuple[type, ...]:
+    httpx = sys.modules.get("httpx")
+    return (requests.Timeout,) + ((httpx.TimeoutException,) if httpx else ())
+
+def _connection_errors() -> Tuple[type, ...]:
+    httpx = sys.modules.get("httpx")
+    return (requests.ConnectionError,) + ((httpx.NetworkError,) if httpx else ())
+
+def _not_sent(error: Exception) -> bool:
+    """Bağlantı hiç kurulamadı mı (istek sunucuya ulaşmadı; POST dahil tekrarı güvenli)."""
+    if isinstance(error, requests.ConnectTimeout): return True
+    httpx = sys.modules.get("httpx")
+    if httpx and isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)): return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+def describe_failure(error: Exception) -> str:
+    if isinstance(error, RequestFailed): return error.reason
+    if isinstance(error, _timeout_errors()): return "zaman aşımı"
+    if isinstance(error, _connection_errors()): return "bağlantı hatası"
+    return str(error) or type(error).__name__
+
+def _wake(future: asyncio.Future):
+    if not future.done(): future.set_result(None)
+
+class HostLimiter:
+    """
+    Tek bir host'a giden isteklerin kapısı.
+    - Token bucket: saniyede en fazla `rate` istek, anlık en fazla `burst` istek.
+    - Eşzamanlılık sınırı: aynı anda en fazla `limit` istek (0: sınırsız).
+    - Öncelik: bekleyen INTERACTIVE istek varken BACKGROUND istekler geçmez.
+    - Adaptif yavaşlama (AIMD): 5xx, zaman aşımı veya ortalama gecikme slow_latency'yi aşınca hız ve
+      eşzamanlılık yarıya iner; sorunsuz istekler bunları yavaş yavaş yapılandırılan değere geri çıkarır.
+    rate veya max_in_flight 0 ise o sınır uygulanmaz.
+    """
+    DECREASE = 0.5        # Yavaşlamada çarpan
+    RECOVERY = 0.05       # Her başarılı istekte hıza eklenen pay (max_rate'in oranı)
+    MIN_RATE = 0.5        # istek/sn; yavaşlama bunun altına inmez
+    EWMA_ALPHA = 0.2      # Gecikme ortalamasında son isteğin ağırlığı
+
+    def __init__(self, host: str, rate: float = 0, burst: int = 1, max_in_flight: int = 0,
+                 slow_latency: float = 0, clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_in_flight = max_in_flight
+        self.limit = float(max_in_flight)
+        self.slow_latency = slow_latency
+        self.latency: Optional[float] = None  # Gecikmenin üstel ortalaması (sn)
+        self.counters = {"requests": 0, "retries": 0, "failures": 0, "slowdowns": 0, "waits": 0}
+        self.wait_time = 0.0
+
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._refilled = clock()
+        self._in_flight = 0
+        self._waiting = [0] * len(Priority)
+        self._last_slowdown = float("-inf")
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def _wait_time(self, priority: Priority, now: float) -> Optional[float]:
+        """0: hemen geçebilir; > 0: token için beklenecek süre; None: slot veya üst öncelik bekleniyor."""
+        if any(self._waiting[p] for p in range(priority)): return None
+        if self.max_in_flight and self._in_flight >= int(self.limit): return None
+        if not self.max_rate: return 0.0
+
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def _take(self, start: float, blocked: bool):
+        """Slotu ve token'ı alır (kilit tutulurken çağrılır)."""
+        if self.max_rate: self._tokens -= 1
+        self._in_flight += 1
+        self.counters["requests"] += 1
+        if blocked:
+            self.counters["waits"] += 1
+            self.wait_time += self._clock() - start
+
+    def _notify(self):
+        """Bekleyen thread'leri ve (AsyncOBSClient) coroutine'leri uyandırır; kilit tutulurken çağrılır."""
+        self._cond.notify_all()
+        for loop, future in self._async_waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        self._async_waiters.clear()
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE):
+        with self._cond:
+            start, blocked = self._clock(), False
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    delay = self._wait_time(priority, self._clock())
+                    if delay == 0: break
+                    blocked = True
+                    self._cond.wait(delay)
+            finally:
+                self._waiting[priority] -= 1
+            self._take(start, blocked)
+            # Bu öncelikte bekleyen kalmadıysa alt öncelikler tekrar bakabilir
+            self._notify()
+
+    async def acquire_async(self, priority: Priority = Priority.INTERACTIVE):
+        """
+        acquire'ın asyncio karşılığı (AsyncOBSClient). Thread kullanmaz: slot boşalınca release bekleyen
+        future'ı uyandırır, token için süre kadar beklenir. Sınırlar ve öncelik senkron client'larla ortaktır;
+        iptal edilen bekleme slot almamış olur.
+        """
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            start, blocked = self._clock(), False
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._cond:
+                    delay = self._wait_time(priority, self._clock())
+                    if delay == 0:
+                        self._take(start, blocked)
+                        break
+                    future = loop.create_future()
+                    self._async_waiters.append((loop, future))
+                blocked = True
+                try:
+                    await asyncio.wait({future}, timeout=delay)
+                finally:
+                    with self._cond:
+                        if (loop, future) in self._async_waiters: self._async_waiters.remove((loop, future))
+        finally:
+            with self._cond:
+                self._waiting[priority] -= 1
+                self._notify()
+
+    def release(self, elapsed: float, failed: bool = False):
+        with self._cond:
+            self._in_flight -= 1
+            self.latency = elapsed if self.latency is None else self.latency + self.EWMA_ALPHA * (elapsed - self.latency)
+            if failed: self.counters["failures"] += 1
+
+            if failed or (self.slow_latency and self.latency > self.slow_latency):
+                # Aynı anda dönen hatalar tek yavaşlama sayılır: son yavaşlamadan beri bir istek süresi geçmeli
+                now = self._clock()
+                if now - self._last_slowdown >= self.latency:
+                    self._last_slowdown = now
+                    self.counters["slowdowns"] += 1
+                    if self.max_rate: self.rate = max(min(self.MIN_RATE, self.max_rate), self.rate * self.DECREASE)
+                    if self.max_in_flight: self.limit = max(1.0, self.limit * self.DECREASE)
+            else:
+                if self.max_rate: self.rate = min(self.max_rate, self.rate + self.max_rate * self.RECOVERY)
+                if self.max_in_flight: self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+            self._notify()
+
+    def count_retry(self):
+        with self._cond:
+            self.counters["retries"] += 1
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            return {
+                "host": self.host,
+                "rate": round(self.rate, 2),
+                "max_rate": self.max_rate,
+                "in_flight": self._in_flight,
+                "limit": int(self.limit),
+                "max_in_flight": self.max_in_flight,
+                "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+                "wait_ms": round(self.wait_time * 1000, 1),
+                **self.counters
+            }
+
+class RequestScheduler:
+    """
+    Process genelinde host başına tek bir HostLimiter tutar; aynı host'a giden tüm OBSClient'lar
+    (paralel dersler, dönemler, hesaplar) aynı hız ve eşzamanlılık sınırını paylaşır.
+    Tekrar denemeler de buradan geçer: her deneme token harcar ve adaptif yavaşlamayı besler.
+    Host'un sınırları, o host için ilk istek atan client'ın TransportConfig'inden alınır.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, url: str, config: TransportConfig) -> HostLimiter:
+        # Oynatmada ağ yok; arşivdeki cevaplar beklemeden döner
+        key = "" if config.replay_path else urlsplit(url).netloc
+        with self._lock:
+            limiter = self._hosts.get(key)
+            if limiter is None:
+                if config.replay_path:
+                    limiter = HostLimiter(key, clock=self._clock)
+                else:
+                    limiter = HostLimiter(key, config.rate_limit, config.burst, config.max_in_flight,
+                                          config.slow_latency, self._clock)
+                self._hosts[key] = limiter
+            return limiter
+
+    def request(self, url: str, config: TransportConfig, send: Callable[[], requests.Response],
+                priority: Priority = Priority.INTERACTIVE, idempotent: bool = False) -> requests.Response:
+        """
+        send()'i host'un sırasına sokarak çalıştırır.
+        Zaman aşımı, bağlantı hatası ve config.retry_statuses cevapları idempotent isteklerde,
+        bağlantının hiç kurulamadığı durumlar her istekte config.retries kez, üstel beklemeyle
+        (Retry-After varsa ona uyarak) tekrar denenir. Bu tek tekrar katmanıdır (adapter tekrar denemez).
+        Denemeler tükenirse RequestFailed; diğer cevaplar (4xx dahil) olduğu gibi döner.
+        """
+        limiter = self.limiter(url, config)
+        errors = _timeout_errors() + _connection_errors()
+        attempt = 0
+        while True:
+            attempt += 1
+            limiter.acquire(priority)
+            start = self._clock()
+            response, error = None, None
+            try:
+                response = send()
+            except errors as e:
+                error = e
+            finally:
+                limiter.release(self._clock() - start, response is None or response.status_code >= 500)
+
+            if self._done(config, response, error, idempotent, attempt): return response
+            limiter.count_retry()
+            if not config.replay_path: self._sleep(self._backoff(config, attempt, response))
+
+    async def arequest(self, url: str, config: TransportConfig, send: Callable[[], Awaitable],
+                       priority: Priority = Priority.INTERACTIVE, idempotent: bool = False):
+        """request'in asyncio karşılığı (httpx); aynı HostLimiter, aynı tekrar kuralları."""
+        limiter = self.limiter(url, config)
+        errors = _timeout_errors() + _connection_errors()
+        attempt = 0
+        while True:
+            attempt += 1
+            await limiter.acquire_async(priority)
+            start = self._clock()
+            response, error = None, None
+            try:
+                response = await send()
+            except errors as e:
+                error = e
+            finally:
+                limiter.release(self._clock() - start, response is None or response.status_code >= 500)
+
+            if self._done(config, response, error, idempotent, attempt): return response
+            limiter.count_retry()
+            if not config.replay_path: await asyncio.sleep(self._backoff(config, attempt, response))
+
+    @staticmethod
+    def _done(config: TransportConfig, response, error: Optional[Exception], idempotent: bool, attempt: int) -> bool:
+        """True: cevap döndürülebilir; False: tekrar denenecek; denemeler tükendiyse RequestFailed."""
+        if error is None and response.status_code not in config.retry_statuses: return True
+        reason = describe_failure(error) if error else f"HTTP {response.status_code}"
+        retryable = idempotent or (error is not None and _not_sent(error))
+        if not retryable or attempt > config.retries:
+            if attempt > 1: reason += f", {attempt} deneme"
+            raise RequestFailed(reason, response) from error
+        return False
+
+    @staticmethod
+    def _backoff(config: TransportConfig, attempt: int, response) -> float:
+        delay = config.backoff_factor * (2 ** (attempt - 1))  # 0.5, 1, 2 ... sn
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit(): delay = max(delay, min(float(retry_after), config.read_timeout))
+        return delay
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            limiters = list(self._hosts.values())
+        return [limiter.snapshot() for limiter in limiters]
+
+@lru_cache(maxsize=None)
+def default_scheduler() -> RequestScheduler:
+    """Process'teki tüm OBSClient'ların paylaştığı zamanlayıcı."""
+    return RequestScheduler()
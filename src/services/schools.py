@@ -0,0 +1,119 @@
+import json
+import os
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+from src.models import DEFAULT_SCHOOL_ID
+
+# Uygulamayla gelen okul listesi (isteğe bağlı; yoksa sadece BUILTIN_SCHOOLS kullanılır).
+# Kullanıcı app_dir/schools.json ile ekleme/değiştirme yapabilir
+BUILTIN_REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schools.json")
+REGISTRY_FILENAME = "schools.json"
+
+@dataclass(frozen=True)
+class School:
+    """Aynı firmanın OBS'ini kullanan bir okulun adresleri ve sayfa farklılıkları."""
+    id: str
+    name: str
+    host: str                               # https://obs.ozal.edu.tr (sonunda / yok)
+    std_path: str = "/oibs/std/"            # Öğrenci sayfalarının bulunduğu klasör
+    login_page: str = "login.aspx"
+    grades_page: str = "not_listesi_op.aspx"
+
+    # --- Parser farklılıkları ---
+    # grd_not_listesi'nde sütun sıraları (bazı okullarda fazladan şube/kredi sütunu var)
+    code_column: int = 1
+    name_column: int = 2
+    grades_column: int = 4
+    letter_column: int = 6
+    # cmbDonemler okunamazsa kullanılacak dönem
+    default_term: str = "20251"
+    # Not hücresindeki sınav etiketleri (ör. {"Büt": "Bütünleme"}); verilmeyenler varsayılanı kullanır
+    exam_labels: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def base_url(self) -> str:
+        return self.host + self.std_path
+
+    @property
+    def login_url(self) -> str:
+        return self.base_url + self.login_page
+
+    @property
+    def grades_url(self) -> str:
+        return self.base_url + self.grades_page
+
+    @property
+    def stats_base_url(self) -> str:
+        # İstatistik sayfaları genelde /oibs/acd/ altında, mutlak path olarak gelir
+        return self.host
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "School":
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        values["host"] = values.get("host", "").rstrip("/")
+        if not values.get("id") or not values["host"]:
+            raise Exception(f"Okul kaydında 'id' ve 'host' zorunlu: {data}")
+        values.setdefault("name", values["id"])
+        return cls(**values)
+
+# Varsayılan okul kodda tanımlı: schools.json paketlenmemiş olsa da (Örn: tek dosyalık exe) uygulama açılır
+BUILTIN_SCHOOLS = (
+    School(id=DEFAULT_SCHOOL_ID, name="Malatya Turgut Özal Üniversitesi", host="https://obs.ozal.edu.tr"),
+)
+
+class SchoolRegistry:
+    """Okul id'si -> School. Sıra dosyadaki sıradır (seçim menüsü için)."""
+
+    def __init__(self, schools: Optional[List[School]] = None):
+        self._schools: Dict[str, School] = {}
+        for school in schools or []:
+            self._schools[school.id] = school
+
+    @classmethod
+    def load(cls, app_dir: Optional[str] = None) -> "SchoolRegistry":
+        """Uygulamanın okul listesini, varsa kullanıcının app_dir/schools.json'ı ile birleştirir (aynı id ezilir)."""
+        registry = cls(list(BUILTIN_SCHOOLS))
+        if os.path.exists(BUILTIN_REGISTRY): registry.load_file(BUILTIN_REGISTRY)
+        if app_dir:
+            user_file = os.path.join(app_dir, REGISTRY_FILENAME)
+            if os.path.exists(user_file): registry.load_file(user_file)
+        return registry
+
+    def load_file(self, path: str):
+        """Dosyadaki okulları ekler; dosya bozuksa hangi dosya olduğunu söyleyen Exception."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("schools", [])
+            schools = [School.from_dict(entry) for entry in entries]
+        except Exception as e:
+            raise Exception(f"Okul listesi okunamadı ({path}): {e}") from e
+        for school in schools:
+            self._schools[school.id] = school
+
+    def get(self, school_id: Optional[str] = None) -> School:
+        school_id = school_id or DEFAULT_SCHOOL_ID
+        if school_id not in self._schools:
+            raise Exception(f"Bilinmeyen okul: {school_id} (okullar: {', '.join(self._schools)})")
+        return self._schools[school_id]
+
+    def by_name(self, name: str) -> School:
+        """Seçim menüsünde gösterilen addan okula."""
+        for school in self:
+            if school.name == name: return school
+        raise Exception(f"Bilinmeyen okul: {name}")
+
+    def names(self) -> List[str]:
+        return [school.name for school in self]
+
+    def __iter__(self) -> Iterator[School]:
+        return iter(self._schools.values())
+
+    def __len__(self) -> int:
+        return len(self._schools)
+
+@lru_cache(maxsize=1)
+def default_school() -> School:
+    """Okul verilmeden oluşturulan client'lar için (dosya her seferinde okunmasın)."""
+    return SchoolRegistry.load().get(DEFAULT_SCHOOL_ID)
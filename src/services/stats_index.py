@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+class StatsUrlIndex:
+    """
+    (ders kodu, dönem) -> Ders_Istatistik.aspx URL'i eşlemesi.
+    URL'ler AJAX postback cevaplarından öğrenilir ve kullanıcı başına bir dosyada saklanır;
+    sonraki çalıştırmalarda istatistik sayfası postback yapılmadan doğrudan istenir.
+    """
+    DIRNAME = "stats_index"
+
+    def __init__(self, app_dir: str, username: str):
+        # Her kullanıcının ayrı dosyası var; toplu çalıştırmada hesaplar aynı dosyaya yazmaz
+        self.path = os.path.join(app_dir, self.DIRNAME, f"{username}.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._urls: Dict[str, str] = self._load()
+
+    @staticmethod
+    def _key(course_code: str, term_id: str) -> str:
+        return f"{term_id}|{course_code}"
+
+    def _load(self) -> Dict[str, str]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except:
+            return {}
+
+    def get(self, course_code: str, term_id: str) -> Optional[str]:
+        with self._lock:
+            return self._urls.get(self._key(course_code, term_id))
+
+    def learn(self, course_code: str, term_id: str, url: str):
+        """Postback ile bulunan URL'i kaydeder (diske save() ile yazılır)."""
+        with self._lock:
+            key = self._key(course_code, term_id)
+            if self._urls.get(key) != url:
+                self._urls[key] = url
+                self._dirty = True
+
+    def forget(self, course_code: str, term_id: str):
+        """Artık çalışmayan URL'i siler; bir sonraki istekte postback'e düşülür."""
+        with self._lock:
+            if self._urls.pop(self._key(course_code, term_id), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty: return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._urls, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,100 @@
+import importlib.util
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# urllib3 br içeriği ancak brotli (veya brotlicffi) kuruluysa açabilir; yoksa hiç istenmez
+BROTLI_AVAILABLE = any(importlib.util.find_spec(m) for m in ("brotli", "brotlicffi"))
+
+@dataclass
+class TransportConfig:
+    """OBSClient'ın HTTP katmanı ayarları (bağlantı havuzu, zaman aşımı, tekrar deneme, sıkıştırma)."""
+    # Bağlantı havuzu: host başına açık tutulan (keep-alive) bağlantı sayısı.
+    # pool_maxsize, istatistik worker sayısından küçükse build_session onu büyütür.
+    pool_connections: int = 2
+    pool_maxsize: int = 8
+    pool_block: bool = False
+
+    # Zaman aşımları (sn). Verilmezse takılan bir OBS isteği sonsuza kadar bekletir.
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+
+    # Tekrar deneme tek katmanda, RequestScheduler'da (adapter tekrar denemez): bağlantı kurulamazsa her
+    # metotta, zaman aşımı ve retry_statuses cevaplarında sadece tekrarı güvenli isteklerde (GET ve salt-okunur postback'ler)
+    retries: int = 2
+    backoff_factor: float = 0.5            # 0.5, 1, 2 ... sn
+    retry_statuses: Tuple[int, ...] = (502, 503, 504)
+
+    # Host başına istek zamanlayıcısı (bkz. scheduler.py); aynı host'a giden tüm client'lar paylaşır.
+    # 0 verilen sınır uygulanmaz. Hata ve yavaşlıkta hız/eşzamanlılık otomatik düşer, sonra geri çıkar.
+    rate_limit: float = 10.0               # istek/sn
+    burst: int = 10                        # Token bucket kapasitesi (anlık en fazla istek)
+    max_in_flight: int = 8                 # Aynı anda en fazla istek
+    slow_latency: float = 5.0              # Ortalama gecikme bunu aşarsa (sn) yavaşla
+
+    # Sıkıştırma: gzip her zaman, br sadece brotli kuruluysa
+    compression: bool = True
+
+    user_agent: str = DEFAULT_USER_AGENT
+    extra_headers: Dict[str, str] = field(default_factory=dict)
+
+    # Hata ayıklama: tüm istek/cevapları gzip'li arşive yaz ya da ağ yerine arşivden oynat (bkz. recorder.py)
+    record_path: Optional[str] = None
+    replay_path: Optional[str] = None
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def accept_encoding(self) -> str:
+        if not self.compression: return "identity"
+        return "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+    def retry_policy(self) -> Retry:
+        # Adapter içinde tekrar yok: her deneme zamanlayıcının token'ından geçsin ve deneme sayısı doğru raporlansın
+        return Retry(0, read=False)
+
+def build_adapter(config: Optional[TransportConfig] = None, min_pool_size: int = 0) -> BaseAdapter:
+    """
+    Ayarlara göre adapter (bağlantı havuzu). Birden çok session'a mount edilebilir:
+    havuz ortak olur, cookie'ler session'da kaldığı için hesaplar birbirine karışmaz.
+    """
+    config = config or TransportConfig()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=max(config.pool_maxsize, min_pool_size),
+        pool_block=config.pool_block,
+        max_retries=config.retry_policy()
+    )
+
+    if config.replay_path:
+        from src.services.recorder import ReplayAdapter
+        adapter = ReplayAdapter(config.replay_path)
+    elif config.record_path:
+        from src.services.recorder import RecordingAdapter, SessionArchive
+        adapter = RecordingAdapter(adapter, SessionArchive(config.record_path))
+    return adapter
+
+def build_session(config: Optional[TransportConfig] = None, min_pool_size: int = 0,
+                  adapter: Optional[BaseAdapter] = None) -> requests.Session:
+    """
+    Ayarlara göre adapter'ı ve varsayılan header'ları kurulmuş bir requests.Session döner.
+    adapter verilirse (ör. OBSClientPool'un host başına paylaştığı) yenisi kurulmaz.
+    """
+    config = config or TransportConfig()
+    adapter = adapter or build_adapter(config, min_pool_size)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": config.user_agent,
+        "Accept-Encoding": config.accept_encoding(),
+        "Connection": "keep-alive"
+    })
+    session.headers.update(config.extra_headers)
+    return session
@@ -0,0 +1,211 @@
+import sys
+import json
+import time
+import random
+import platform
+import subprocess
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from src.models import CourseGrade, ExamStats, GradeChange, ScoreStatus
+from src.services.obs_pages import SessionExpired
+
+# Bildirimciler değişiklik listesini alan herhangi bir callable olabilir
+Notifier = Callable[[List[GradeChange]], None]
+
+EXAM_FIELDS = (("Vize", "midterm"), ("Final", "final"), ("Büt", "makeup"))
+
+def diff_grades(old: List[CourseGrade], new: List[CourseGrade]) -> List[GradeChange]:
+    """İki anlık görüntü arasındaki yapısal farkları (not, ortalama, harf, yeni ders) çıkarır."""
+    old_by_key: Dict[Tuple[str, str], CourseGrade] = {(g.term_id, g.code): g for g in old}
+    changes = []
+
+    for g in new:
+        prev = old_by_key.get((g.term_id, g.code))
+        if prev is None:
+            changes.append(GradeChange(g.term_id, g.code, g.name, "course", "Ders", "", g.name))
+            continue
+
+        for label, attr in EXAM_FIELDS:
+            before, after = getattr(prev, attr), getattr(g, attr)
+            if before.score != after.score:
+                changes.append(GradeChange(g.term_id, g.code, g.name, "score", label, before.score, after.score))
+            if before.class_avg != after.class_avg and after.class_avg != "?":
+                changes.append(GradeChange(g.term_id, g.code, g.name, "average", label, before.class_avg, after.class_avg))
+
+        if prev.letter_grade != g.letter_grade:
+            changes.append(GradeChange(g.term_id, g.code, g.name, "letter", "Harf", prev.letter_grade, g.letter_grade))
+
+    return changes
+
+def _scores(g: CourseGrade) -> Tuple[str, ...]:
+    return (g.midterm.score, g.final.score, g.makeup.score, g.letter_grade)
+
+def _has_pending(g: CourseGrade) -> bool:
+    """OBS'nin henüz yayınlamadığı ('?') bir ortalama var mı."""
+    return any(e.avg_status is ScoreStatus.PENDING for e in (g.midterm, g.final, g.makeup))
+
+def _describe(c: GradeChange) -> str:
+    if c.kind == "course":
+        return f"{c.course_code} {c.course_name}: yeni ders"
+    suffix = " ortalaması" if c.kind == "average" else ""
+    return f"{c.course_code} {c.course_name}: {c.field}{suffix} {c.old or '-'} → {c.new}"
+
+# --- BİLDİRİMCİLER ---
+
+class StdoutNotifier:
+    """Değişiklikleri düz metin olarak yazar."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def __call__(self, changes: List[GradeChange]):
+        stamp = time.strftime("%H:%M:%S")
+        for c in changes:
+            self.stream.write(f"[{stamp}] {_describe(c)}\n")
+        self.stream.flush()
+
+class WebhookNotifier:
+    """Değişiklikleri JSON olarak bir webhook'a POST eder (Slack/Discord vb. için uyarlanabilir)."""
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, changes: List[GradeChange]):
+        import requests
+        from dataclasses import asdict
+        payload = {"text": "\n".join(_describe(c) for c in changes), "changes": [asdict(c) for c in changes]}
+        try:
+            requests.post(self.url, data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                          headers={"Content-Type": "application/json"}, timeout=self.timeout)
+        except Exception:
+            pass # Bildirim gitmezse izlemeyi durdurmaya değmez
+
+class DesktopNotifier:
+    """İşletim sisteminin bildirim balonunu kullanır; desteklenmiyorsa stdout'a düşer."""
+
+    def __init__(self, fallback: Optional[Notifier] = None):
+        self.fallback = fallback or StdoutNotifier()
+
+    def __call__(self, changes: List[GradeChange]):
+        title = "OBS Grade Puller"
+        body = "\n".join(_describe(c) for c in changes)
+        try:
+            if platform.system() == "Linux":
+                subprocess.run(["notify-send", title, body], check=True)
+            elif platform.system() == "Darwin":
+                script = f'display notification {json.dumps(body)} with title {json.dumps(title)}'
+                subprocess.run(["osascript", "-e", script], check=True)
+            else:
+                self.fallback(changes)
+        except (OSError, subprocess.CalledProcessError):
+            self.fallback(changes)
+
+def make_notifier(kind: str, webhook_url: Optional[str] = None) -> Notifier:
+    """Komut satırındaki --notify değerinden bildirimci üretir."""
+    if kind == "webhook":
+        if not webhook_url: raise ValueError("webhook bildirimi için --webhook-url gerekli")
+        return WebhookNotifier(webhook_url)
+    if kind == "desktop":
+        return DesktopNotifier()
+    return StdoutNotifier()
+
+class GradeWatcher:
+    """
+    fetch_grades'i belirli aralıklarla tekrarlar ve değişiklikleri bildirir.
+    Her turda sadece not tablosu indirilir; istatistik sayfası yalnızca kendi notu (veya harfi)
+    değişen dersler için yeniden çekilir, diğerlerinin ortalaması önceki görüntüden taşınır.
+    Böylece bir turun maliyeti ders sayısıyla değil, değişiklik sayısıyla artar.
+    Ortalaması çekilemeyen dersler her turda, OBS'nin henüz yayınlamadığı ortalamalar ise
+    pending_every turda bir yeniden istenir. Oturum düşerse reconnect ile tekrar giriş yapılır.
+    """
+
+    def __init__(self, client, notifier: Notifier, interval: float = 600, jitter: float = 0.2,
+                 max_backoff: float = 3600, on_snapshot: Optional[Callable[[List[CourseGrade]], List[CourseGrade]]] = None,
+                 on_error: Optional[Callable[[Exception, float], None]] = None,
+                 reconnect: Optional[Callable[[], bool]] = None, pending_every: int = 6):
+        self.client = client
+        self.notifier = notifier
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.on_snapshot = on_snapshot   # Örn: önbelleğe yazmak için
+        self.on_error = on_error         # (hata, bir sonraki denemeye kalan saniye)
+        self.reconnect = reconnect       # Oturum düşünce yeniden giriş; başarılıysa True
+        self.pending_every = max(1, pending_every)
+        self.snapshot: List[CourseGrade] = []
+        self._failures = 0
+        self._polls = 0
+        # Son turda ortalaması çekilemeyen dersler; on_snapshot (önbellek) eski ortalamayla doldurabildiği
+        # için hata snapshot'ta görünmeyebilir, bu yüzden ayrıca tutulur
+        self._failed_stats: Set[Tuple[str, str]] = set()
+
+    def poll(self) -> List[GradeChange]:
+        """Tek bir tur: yeni görüntüyü çeker, farkları bildirir ve döner."""
+        previous = {(g.term_id, g.code): g for g in self.snapshot}
+        self._polls += 1
+        retry_pending = self._polls % self.pending_every == 0
+        failed = self._failed_stats
+
+        def needs_stats(course: CourseGrade) -> bool:
+            prev = previous.get((course.term_id, course.code))
+            if prev is None or _scores(prev) != _scores(course) or prev.stats_error: return True
+            if (course.term_id, course.code) in failed: return True
+            return retry_pending and _has_pending(prev)
+
+        try:
+            fresh = self.client.fetch_grades(stats_filter=needs_stats)
+        except SessionExpired:
+            # Oturum düştü: yeniden giriş yapılıp tur bir kez tekrarlanır, olmazsa geri çekilmeye düşülür
+            if not self.reconnect or not self.reconnect(): raise
+            fresh = self.client.fetch_grades(stats_filter=needs_stats)
+
+        # İstatistiği çekilmeyen derslerde önceki ortalamaları koru
+        merged = []
+        for g in fresh:
+            prev = previous.get((g.term_id, g.code))
+            if prev is not None and not needs_stats(g):
+                g = CourseGrade(
+                    code=g.code,
+                    name=g.name,
+                    midterm=ExamStats(g.midterm.score, prev.midterm.class_avg),
+                    final=ExamStats(g.final.score, prev.final.class_avg),
+                    makeup=ExamStats(g.makeup.score, prev.makeup.class_avg),
+                    letter_grade=g.letter_grade,
+                    term_id=g.term_id
+                )
+            merged.append(g)
+        self._failed_stats = {(g.term_id, g.code) for g in fresh if g.stats_error}
+
+        if self.on_snapshot:
+            merged = self.on_snapshot(merged)
+
+        changes = diff_grades(self.snapshot, merged) if self.snapshot else []
+        self.snapshot = merged
+        if changes:
+            self.notifier(changes)
+        return changes
+
+    def next_delay(self) -> float:
+        """Bir sonraki tura kadar beklenecek süre: hatalarda üstel geri çekilme, her zaman jitter'lı."""
+        base = min(self.interval * 2 ** self._failures, self.max_backoff)
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run(self, initial: Optional[List[CourseGrade]] = None, max_polls: Optional[int] = None):
+        """Ctrl+C'ye (veya max_polls'a) kadar izler."""
+        if initial:
+            self.snapshot = list(initial)
+
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            delay = None
+            try:
+                self.poll()
+                self._failures = 0
+            except Exception as e:
+                self._failures += 1
+                delay = self.next_delay()
+                if self.on_error:
+                    self.on_error(e, delay)
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(delay if delay is not None else self.next_delay())
@@ -1,10 +1,17 @@
+import time
+from contextlib import contextmanager
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
+from rich.markup import escape
 from rich import box
-from typing import List, Optional
-from src.models import CourseGrade, ExamStats
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from src.models import CourseGrade, ExamStats, GradeChange, ScoreStatus
+
+if TYPE_CHECKING:
+    from src.services.history import HistoryPage
+    from src.services.projection import Projection
 
 class DisplayManager:
     def __init__(self):
@@ -36,12 +43,39 @@ class DisplayManager:
                 return choices[int(selection) - 1]
             self.console.print("[red]Geçersiz seçim, tekrar deneyin.[/red]")
 
-    def _format_score(self, my_score: str, class_avg: str) -> str:
-        """Notu renklendirir ve ortalamaya göre ok işareti ekler."""
-        if not my_score.replace(',', '').isdigit(): 
-            return my_score # Girmediyse veya tire ise olduğu gibi dön
+    def render_captcha(self, image: bytes, max_width: int = 80) -> bool:
+        """
+        Captcha'yı terminale yarım blok karakterlerle (▀: üst piksel yazı, alt piksel arka plan rengi)
+        çizer; masaüstü görüntüleyici gerekmez, SSH/headless ortamda da çalışır.
+        Pillow kurulu değilse, resim açılamazsa veya terminal renk desteklemiyorsa False döner.
+        """
+        if not self.console.color_system: return False
+        try:
+            import io
+            from PIL import Image
+            img = Image.open(io.BytesIO(image)).convert("RGB")
+        except Exception:
+            return False
+
+        width = min(img.width, max_width, self.console.width)
+        height = max(2, round(img.height * width / img.width))
+        img = img.resize((width, height + height % 2))
+        pixels = img.load()
 
-        score_val = float(my_score.replace(',', '.'))
+        text = Text()
+        for y in range(0, img.height, 2):
+            for x in range(width):
+                top, bottom = pixels[x, y], pixels[x, y + 1]
+                text.append("▀", style=f"rgb({top[0]},{top[1]},{top[2]}) on rgb({bottom[0]},{bottom[1]},{bottom[2]})")
+            text.append("\n")
+        self.console.print(text, end="")
+        return True
+
+    def _format_score(self, exam: ExamStats) -> str:
+        """Notu renklendirir ve ortalamaya göre ok işareti ekler."""
+        if exam.score_status is not ScoreStatus.VALUE:
+            return exam.score # Girmediyse veya tire ise olduğu gibi dön
+        score_val = exam.score_value
         
         # Renklendirme
         color = "white"
@@ -51,20 +85,63 @@ class DisplayManager:
         
         # Ortalama Kıyaslaması
         icon = ""
-        if class_avg.replace(',', '').replace('.', '').isdigit():
-            avg_val = float(class_avg.replace(',', '.'))
+        if exam.avg_status is ScoreStatus.VALUE:
+            avg_val = exam.avg_value
             if score_val > avg_val: icon = "[bold green]↑[/bold green]"
             elif score_val < avg_val: icon = "[bold red]↓[/bold red]"
         
-        return f"[{color}]{my_score}[/{color}] {icon}"
+        return f"[{color}]{exam.score}[/{color}] {icon}"
+
+    @staticmethod
+    def _format_avg(exam: ExamStats) -> str:
+        if exam.avg_status is ScoreStatus.FAILED: return "[red]?[/red]"
+        return exam.class_avg
 
     def render_grades(self, grades: List[CourseGrade], term_name: str):
         if not grades:
             self.console.print("[yellow]Gösterilecek not bulunamadı.[/yellow]")
             return
 
+        self.console.print(self._grades_table(grades, term_name))
+
+    @contextmanager
+    def live_grades(self, term_name: Optional[str] = None):
+        """
+        Dersler geldikçe dolan canlı not tablosu. Verilen update(idx, grade) fonksiyonu satırı
+        ekler veya (ortalamalar gelince) aynı indeksteki satırı yeniler.
+        Dönem verilmezse ilk gelen dersin dönemi başlıkta kullanılır.
+        """
+        from rich.live import Live
+
+        rows: Dict[int, CourseGrade] = {}
+
+        def build(caption: Optional[str]) -> Table:
+            grades = [rows[idx] for idx in sorted(rows)]
+            title = term_name or (grades[0].term_id if grades else "...")
+            return self._grades_table(grades, title, caption)
+
+        with Live(build("Dersler yükleniyor..."), console=self.console, refresh_per_second=12) as live:
+            def update(idx: int, grade: CourseGrade):
+                rows[idx] = grade
+                live.update(build("Ortalamalar yükleniyor..."))
+
+            yield update
+            # Son hali: yükleniyor yazısı olmadan bırak
+            live.update(build(None), refresh=True)
+
+        if not rows:
+            self.console.print("[yellow]Gösterilecek not bulunamadı.[/yellow]")
+
+    def _grades_table(self, grades: List[CourseGrade], term_name: str, caption: Optional[str] = None) -> Table:
+        # Ortalaması çekilemeyen dersler '?' yerine kırmızı '?' ile gösterilir, sebepleri altta yazılır
+        failures = [escape(f"{g.name}: {g.stats_error}") for g in grades if g.stats_error]
+        if failures:
+            note = "[red]Ortalama alınamadı[/red] - " + "; ".join(failures)
+            caption = f"{caption}\n{note}" if caption else note
+
         table = Table(
             title=f"Not Durumu ({term_name})", 
+            caption=f"[dim]{caption}[/dim]" if caption else None,
             box=box.ROUNDED, 
             header_style="bold magenta",
             show_lines=True
@@ -89,9 +166,9 @@ class DisplayManager:
 
         for g in grades:
             # Notları formatla
-            v_str = self._format_score(g.midterm.score, g.midterm.class_avg)
-            f_str = self._format_score(g.final.score, g.final.class_avg)
-            b_str = self._format_score(g.makeup.score, g.makeup.class_avg)
+            v_str = self._format_score(g.midterm)
+            f_str = self._format_score(g.final)
+            b_str = self._format_score(g.makeup)
 
             # Harf notu renklendirmesi (FF ise kırmızı)
             letter = g.letter_grade
@@ -102,10 +179,139 @@ class DisplayManager:
 
             table.add_row(
                 g.name,
-                v_str, g.midterm.class_avg,
-                f_str, g.final.class_avg,
-                b_str, g.makeup.class_avg,
+                v_str, self._format_avg(g.midterm),
+                f_str, self._format_avg(g.final),
+                b_str, self._format_avg(g.makeup),
                 letter
             )
 
-        self.console.print(table)
\ No newline at end of file
+        return table
+
+    def render_projection(self, projections: List["Projection"], term_gpa: Dict[str, float],
+                          cumulative_gpa: Optional[float], letters: Tuple[str, ...] = ()):
+        """Sonucu kesinleşmemiş dersler için hedef harf başına gereken final/büt notu ve GNO özeti."""
+        open_courses = [p for p in projections if p.exam]
+        if open_courses:
+            letters = letters or tuple(open_courses[0].required)
+            table = Table(
+                title="Hedef Harf İçin Gereken Not",
+                box=box.ROUNDED,
+                header_style="bold magenta"
+            )
+            table.add_column("Ders", style="cyan", no_wrap=True)
+            table.add_column("Sınav", justify="center")
+            for letter in letters:
+                table.add_column(letter, justify="center", no_wrap=True)
+
+            for p in open_courses:
+                cells = []
+                for letter in letters:
+                    need = p.required.get(letter)
+                    if need is None: cells.append("[dim]—[/dim]")  # 100 ile bile ulaşılamaz
+                    elif need <= 0: cells.append("[green]✓[/green]")
+                    else: cells.append(f"{need:.0f}")
+                table.add_row(f"{p.name} ({p.term_id})", p.exam, *cells)
+
+            self.console.print(table)
+        else:
+            self.console.print("[yellow]Sonucu beklenen ders yok.[/yellow]")
+
+        if term_gpa:
+            gpa_table = Table(title="Dönem Ortalamaları (ağırlıksız)", box=box.ROUNDED, header_style="bold magenta")
+            gpa_table.add_column("Dönem", style="cyan")
+            gpa_table.add_column("Ortalama", justify="right", no_wrap=True)
+            for term_id in sorted(term_gpa):
+                gpa_table.add_row(term_id, f"{term_gpa[term_id]:.2f}")
+            if cumulative_gpa is not None:
+                gpa_table.add_row("[bold]Genel[/bold]", f"[bold]{cumulative_gpa:.2f}[/bold]")
+            self.console.print(gpa_table)
+
+    def render_changes(self, changes: List[GradeChange]):
+        """Watch modunda tespit edilen değişiklikleri tablo olarak basar."""
+        if not changes: return
+
+        table = Table(
+            title=f"Yeni Değişiklikler ({time.strftime('%H:%M:%S')})",
+            box=box.ROUNDED,
+            header_style="bold magenta"
+        )
+        table.add_column("Ders", style="cyan", no_wrap=True)
+        table.add_column("Alan", justify="center")
+        table.add_column("Eski", justify="center", style="dim")
+        table.add_column("Yeni", justify="center", style="bold green")
+
+        labels = {"average": " Ort.", "course": "", "score": "", "letter": ""}
+        for c in changes:
+            field = "Yeni ders" if c.kind == "course" else c.field + labels[c.kind]
+            table.add_row(c.course_name, field, c.old or "-", c.new)
+
+        self.console.print(table)
+
+    def render_history(self, pages: Iterator["HistoryPage"], title: str, first_seen: Optional[Dict[str, float]] = None):
+        """
+        Not geçmişini sayfa sayfa basar; sonraki sayfa ancak kullanıcı isterse sorgulanır.
+        first_seen: sınav -> ortalamanın ilk göründüğü an (tek ders gösterilirken özet satırı için).
+        """
+        if first_seen:
+            summary = ", ".join(f"{exam}: {time.strftime('%d.%m.%Y %H:%M', time.localtime(t))}"
+                                for exam, t in first_seen.items())
+            self.console.print(f"[cyan]Ortalamaların ilk açıklandığı an[/cyan] {summary}")
+
+        shown = 0
+        for page in pages:
+            table = Table(title=title, box=box.ROUNDED, header_style="bold magenta")
+            table.add_column("Zaman", style="dim", no_wrap=True)
+            table.add_column("Dönem", no_wrap=True)
+            table.add_column("Ders", style="cyan")
+            table.add_column("Vize (Ort)", justify="center")
+            table.add_column("Final (Ort)", justify="center")
+            table.add_column("Büt (Ort)", justify="center")
+            table.add_column("Harf", justify="center", style="bold")
+
+            for snap in page.rows:
+                g = snap.grade
+                table.add_row(
+                    time.strftime("%d.%m.%Y %H:%M", time.localtime(snap.fetched_at)), g.term_id,
+                    f"{g.code} {g.name}",
+                    *(f"{e.score} ({e.class_avg})" for e in (g.midterm, g.final, g.makeup)),
+                    g.letter_grade
+                )
+            self.console.print(table)
+            shown += len(page.rows)
+
+            if not page.has_more: break
+            if self.console.input("[dim]Enter: daha eski kayıtlar, q: çık [/dim]").strip().lower() == "q": break
+
+        if not shown:
+            self.console.print("[yellow]Geçmişte kayıt bulunamadı.[/yellow]")
+
+    def render_profile(self, rows: List[Dict], wall_ms: float):
+        """--profile özetini faz bazında tablo olarak basar."""
+        def fmt_bytes(n: int) -> str:
+            if not n: return "-"
+            return f"{n / 1024:.1f} KiB" if n >= 1024 else f"{n} B"
+
+        table = Table(
+            title=f"Profil (toplam süre: {wall_ms / 1000:.2f} sn)",
+            box=box.ROUNDED,
+            header_style="bold magenta"
+        )
+        table.add_column("Faz", style="cyan", no_wrap=True)
+        table.add_column("Adet", justify="right", no_wrap=True)
+        table.add_column("Toplam", justify="right", no_wrap=True)
+        table.add_column("Ort.", justify="right", style="dim", no_wrap=True)
+        table.add_column("p95", justify="right", style="dim", no_wrap=True)
+        table.add_column("En Kötü", justify="right", no_wrap=True)
+        table.add_column("İnen", justify="right", no_wrap=True)
+        table.add_column("Giden", justify="right", no_wrap=True)
+
+        for r in rows:
+            table.add_row(
+                r["phase"], str(r["count"]),
+                f"{r['total_ms']:.0f} ms", f"{r['mean_ms']:.1f} ms",
+                f"{r['p95_ms']:.1f} ms", f"{r['max_ms']:.1f} ms",
+                fmt_bytes(r["bytes_in"]), fmt_bytes(r["bytes_out"])
+            )
+
+        self.console.print(table)
+        self.console.print("[dim]Not: İstatistik istekleri paralel çalıştığı için faz toplamları duvar saatini aşabilir.[/dim]")
\ No newline at end of file